@@ -1,4 +1,5 @@
 from pathlib import Path
+import re
 import sqlite3
 
 import pandas as pd
@@ -30,7 +31,7 @@ def get_seasons(conference_key: str):
         df = pd.read_sql_query(
             """
             SELECT DISTINCT season_end_year
-            FROM player_season_stats
+            FROM team_season_rollup
             WHERE conference_key = ?
             ORDER BY season_end_year DESC
             """,
@@ -44,8 +45,8 @@ def get_teams(conference_key: str, season_end_year: int):
     with get_connection() as conn:
         df = pd.read_sql_query(
             """
-            SELECT DISTINCT team_slug
-            FROM player_season_stats
+            SELECT team_slug
+            FROM team_season_rollup
             WHERE conference_key = ? AND season_end_year = ?
             ORDER BY team_slug
             """,
@@ -55,44 +56,59 @@ def get_teams(conference_key: str, season_end_year: int):
     return df["team_slug"].tolist()
 
 
+def name_match_query(text: str) -> str | None:
+    """
+    FTS5 query for the name search box: every word typed must start a word of
+    the name ("jal smi" finds "Jalen Smith"). Words are quoted, so FTS syntax
+    in the input is taken literally.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
 def get_player_profiles(conference_key, season_end_year, team_slug, name_filter):
+    # player_season_profile is the stats / players / roster join, materialized
+    # per conference-season by scripts/rollups.py
     query = """
         SELECT
-            p.player_name,
-            s.team_slug,
-            s.conference_key,
-            s.season_end_year,
-            s.g,
-            s.mp,
-            s.pts,
-            s.reb,
-            s.ast,
-            r.class_year,
-            r.pos,
-            r.height_cm,
-            r.weight_kg
-        FROM player_season_stats s
-        JOIN players p
-            ON p.player_id = s.player_id
-        LEFT JOIN player_roster_attrs r
-            ON r.player_id = s.player_id
-           AND r.team_slug = s.team_slug
-           AND r.season_end_year = s.season_end_year
-        WHERE s.conference_key = ?
-          AND s.season_end_year = ?
+            player_name,
+            team_slug,
+            conference_key,
+            season_end_year,
+            g,
+            mp,
+            pts,
+            reb,
+            ast,
+            class_year,
+            pos,
+            height_cm,
+            weight_kg
+        FROM player_season_profile
+        WHERE conference_key = ?
+          AND season_end_year = ?
     """
 
     params = [conference_key, season_end_year]
 
     if team_slug and team_slug != "__ALL__":
-        query += " AND s.team_slug = ?"
+        query += " AND team_slug = ?"
         params.append(team_slug)
 
-    if name_filter:
-        query += " AND p.player_name LIKE ?"
-        params.append(f"%{name_filter}%")
+    # player_name_search is the full-text index over players (schema
+    # migration 5); accents are folded, so "jose" finds "José"
+    name_query = name_match_query(name_filter) if name_filter else None
+    if name_query:
+        query += """
+          AND player_id IN (
+              SELECT rowid FROM player_name_search
+              WHERE player_name_search MATCH ?)
+        """
+        params.append(name_query)
 
-    query += " ORDER BY s.team_slug, p.player_name"
+    query += " ORDER BY team_slug, player_name"
 
     with get_connection() as conn:
         df = pd.read_sql_query(query, conn, params=params)
@@ -142,7 +158,9 @@ team_choice = st.sidebar.selectbox("Team", options=team_options, index=0)
 team_slug = None if team_choice == "All teams" else team_choice
 
 name_filter = st.sidebar.text_input(
-    "Player name contains", value="").strip() or None
+    "Player name", value="",
+    help="Matches the start of each word, e.g. \"jal smi\" for Jalen Smith.",
+).strip() or None
 
 # Query data
 df_players = get_player_profiles(
@@ -0,0 +1,178 @@
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench_similarity import synthetic_profiles
+from bench_similarity_incremental import as_profiles, scratch_pool_db
+from feature_store import build_matrix, open_scope, open_store, read_meta, refresh_scopes, \
+    save_matrix, set_store_features, stale_feature_scopes
+from similarity import FEATURES, standardize
+
+CONFERENCES = 32
+
+
+def scratch_store_db(rows: int) -> sqlite3.Connection:
+    """Profiles spread over CONFERENCES conferences, with rollup fingerprints."""
+    profiles = as_profiles(synthetic_profiles(rows))
+    profiles["conference_key"] = "conf-" + (profiles["player_id"] % 360 % CONFERENCES) \
+        .astype(str)
+    conn = scratch_pool_db(profiles)
+    conn.execute(
+        "INSERT INTO rollup_freshness (conference_key, season_end_year, "
+        "source_fingerprint, profile_rows) "
+        "SELECT conference_key, season_end_year, 'v1', COUNT(*) "
+        "FROM player_season_profile GROUP BY conference_key, season_end_year")
+    return conn
+
+
+def from_sqlite(conn, scope) -> tuple[pd.DataFrame, np.ndarray]:
+    """What each consumer does today: query, fill and standardize."""
+    df = pd.read_sql_query(
+        f"SELECT player_id, team_slug, {', '.join(FEATURES)} FROM player_season_profile "
+        "WHERE conference_key = ? AND season_end_year = ? ORDER BY player_id, team_slug",
+        conn, params=scope)
+    Z, _, _ = standardize(df[FEATURES].to_numpy())
+    return df, Z
+
+
+def timed(fn, scopes) -> tuple[float, list]:
+    started = time.perf_counter()
+    out = [fn(scope) for scope in scopes]
+    return time.perf_counter() - started, out
+
+
+def traced_peak(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def keep_opening(scope, root: Path, stop, counts) -> None:
+    """Reader process: open the conference-season until told to stop."""
+    while not stop.is_set():
+        try:
+            open_scope(scope, root).z.sum()
+        except OSError:
+            counts[1] += 1
+        counts[0] += 1
+
+
+def concurrent_opens(conn, scope, root: Path, rebuilds: int) -> tuple[int, int]:
+    """
+    Rebuild one conference-season over and over while another process keeps
+    opening it. Returns (opens, failed opens).
+    """
+    arrays, meta = build_matrix(conn, scope)
+    meta["source_fingerprint"] = read_meta(scope, root)["source_fingerprint"]
+    stop = multiprocessing.Event()
+    counts = multiprocessing.Array("l", 2)
+    reader = multiprocessing.Process(target=keep_opening, args=(scope, root, stop, counts))
+    reader.start()
+    time.sleep(0.5)  # let the reader get going
+    for _ in range(rebuilds):
+        save_matrix(scope, arrays, meta, root)
+    stop.set()
+    reader.join()
+    return counts[0], counts[1]
+
+
+def check_store(conn, scopes: list, root: Path) -> list[str]:
+    """Build the store under `root`, time it against SQLite and check it."""
+    started = time.perf_counter()
+    n_rows = sum(refresh_scopes(conn, scopes, root=root).values())
+    t_build = time.perf_counter() - started
+    print(f"{n_rows:,} player-seasons in {len(scopes)} conference-seasons; "
+          f"store built in {t_build:.2f}s\n")
+
+    t_sql, sql_out = timed(lambda scope: from_sqlite(conn, scope), scopes)
+    t_store, store_out = timed(lambda scope: open_scope(scope, root), scopes)
+    # Touch every page, as a consumer computing on it would
+    t_touch, _ = timed(lambda m: float(np.asarray(m.z).sum()), store_out)
+    per = 1000 / len(scopes)
+    print(f"{'per conference-season':24}{'total':>10}{'each':>10}")
+    print(f"{'SQLite + standardize':24}{t_sql:9.2f}s{t_sql * per:8.2f}ms")
+    print(f"{'store, open (mmap)':24}{t_store:9.2f}s{t_store * per:8.2f}ms"
+          f"   {t_sql / t_store:.0f}x")
+    print(f"{'store, open + read':24}{t_store + t_touch:9.2f}s"
+          f"{(t_store + t_touch) * per:8.2f}ms   {t_sql / (t_store + t_touch):.0f}x\n")
+
+    # Python-heap allocations while opening every conference-season; mapped
+    # pages live in the page cache, shared by every process reading them
+    sql_peak = traced_peak(lambda: [from_sqlite(conn, scope) for scope in scopes])
+    store_peak = traced_peak(lambda: open_store(root=root))
+    print(f"{'heap, all scopes':24}{'SQLite':>10}{'store':>10}")
+    print(f"{'':24}{sql_peak / 2**20:8.1f}MiB{store_peak / 2**20:8.1f}MiB\n")
+
+    # Small, so rebuilds come fast and the swap is hit often
+    smallest, = conn.execute(
+        "SELECT conference_key, season_end_year FROM rollup_freshness "
+        "ORDER BY profile_rows LIMIT 1").fetchall()
+    opens, failed = concurrent_opens(conn, tuple(smallest), root, rebuilds=2000)
+    print(f"{opens:,} opens during 2,000 rebuilds of one conference-season: "
+          f"{failed} failed\n")
+
+    problems = [f"{failed} opens failed during rebuilds"] if failed else []
+    for scope, (df, Z), matrix in zip(scopes, sql_out, store_out):
+        if not (np.array_equal(df["player_id"].to_numpy(), matrix.player_id)
+                and np.array_equal(df["team_slug"].to_numpy().astype(str), matrix.team_slug)):
+            problems.append(f"{scope}: row keys differ")
+        elif not np.allclose(Z, matrix.z, rtol=1e-6, atol=1e-5):
+            problems.append(f"{scope}: z-scores differ")
+    row = store_out[0].row_of(int(store_out[0].player_id[3]), str(store_out[0].team_slug[3]))
+    if row != 3:
+        problems.append(f"row_of found row {row}, not 3")
+
+    # A rollup refresh moves a fingerprint on; only that scope is stale
+    conn.execute("UPDATE rollup_freshness SET source_fingerprint = 'v2' "
+                 "WHERE conference_key = ? AND season_end_year = ?", scopes[5])
+    if stale_feature_scopes(conn, root=root) != [scopes[5]]:
+        problems.append("stale_feature_scopes did not flag exactly the refreshed scope")
+
+    # A store switched to other features keeps them through the refreshes
+    # that follow loads
+    custom = FEATURES[:3]
+    set_store_features(custom, root)
+    refresh_scopes(conn, stale_feature_scopes(conn, root=root), root=root)
+    refresh_scopes(conn, [scopes[0]], root=root)
+    if read_meta(scopes[0], root)["features"] != custom \
+            or stale_feature_scopes(conn, root=root):
+        problems.append("a refresh did not keep the store's feature list")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark opening conference-season feature matrices from "
+                    "the memory-mapped store against re-querying SQLite."
+    )
+    parser.add_argument("--rows", type=int, default=130_000,
+                        help="Player-seasons (default: 130,000).")
+    args = parser.parse_args()
+
+    conn = scratch_store_db(args.rows)
+    scopes = [tuple(row) for row in conn.execute(
+        "SELECT conference_key, season_end_year FROM rollup_freshness ORDER BY 1, 2")]
+    with tempfile.TemporaryDirectory(prefix="feature_store_") as tmp:
+        problems = check_store(conn, scopes, Path(tmp) / "features")
+    conn.close()
+
+    if problems:
+        for problem in problems:
+            print(f"!! {problem}")
+        sys.exit(1)
+    print("Store matches SQLite + standardize for every conference-season; "
+          "staleness follows the rollup fingerprints and the store's features.")
+
+
+if __name__ == "__main__":
+    main()
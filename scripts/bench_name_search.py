@@ -0,0 +1,118 @@
+import argparse
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+import unicodedata
+
+from schema_migrations import migrate
+
+FIRST = ["Jalen", "Jaylen", "Marcus", "Chris", "Tyler", "Jordan", "José",
+         "Isaiah", "Malik", "André", "Nikola", "Cam", "Trey", "Darius"]
+LAST = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Davis", "Miller",
+        "García", "Martínez", "Robinson", "Clark", "Dončić", "O'Neal"]
+SYLLABLES = ["ka", "ro", "vic", "mar", "den", "li", "son", "ba", "tre", "mo",
+             "well", "an", "to", "ler", "ji", "nez", "ko", "ra", "ford", "el"]
+
+# What a user types into the name box, one keystroke at a time
+TYPED = ["j", "ja", "jal", "jal s", "jal sm", "jal smi", "jose", "jose gar",
+         "doncic", "o'ne", "marcus rob"]
+
+
+def synthetic_names(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+
+    def made_up(n_syllables: int) -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(n_syllables)).title()
+
+    suffix = ["", "", "", "", " Jr.", " II"]
+    return [f"{rng.choice(FIRST) if rng.random() < 0.3 else made_up(2)} "
+            f"{rng.choice(LAST) if rng.random() < 0.1 else made_up(3)}"
+            f"{rng.choice(suffix)}"
+            for _ in range(n)]
+
+
+def match_query(text: str) -> str | None:
+    """Same query the app builds (app.name_match_query)."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def folded_words(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"\w+", text.lower())
+
+
+def expected_ids(names: dict[int, str], typed: str) -> set[int]:
+    """Players whose name has a word starting with each word typed."""
+    wanted = folded_words(typed)
+    return {player_id for player_id, name in names.items()
+            if all(any(word.startswith(w) for word in folded_words(name))
+                   for w in wanted)}
+
+
+def timed(conn, sql: str, params, reps: int) -> tuple[float, set[int]]:
+    times = []
+    for _ in range(reps):
+        started = time.perf_counter()
+        ids = {row[0] for row in conn.execute(sql, params)}
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark LIKE '%%...%%' against the FTS5 player name "
+                    "index for the app's name search."
+    )
+    parser.add_argument("--players", type=int, default=200_000,
+                        help="Players in the table (default: 200,000).")
+    parser.add_argument("--reps", type=int, default=7,
+                        help="Runs per query; the median is reported (default: 7).")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("BEGIN")
+    migrate(conn)
+    names = synthetic_names(args.players)
+    started = time.perf_counter()
+    conn.executemany("INSERT INTO players (player_name) VALUES (?)",
+                     ((name,) for name in names))
+    t_insert = time.perf_counter() - started
+    conn.execute("COMMIT")
+    print(f"{args.players:,} players inserted in {t_insert:.2f}s "
+          f"(name index kept in step by triggers)\n")
+
+    by_id = dict(conn.execute("SELECT player_id, player_name FROM players"))
+    like_sql = "SELECT player_id FROM players WHERE player_name LIKE ?"
+    fts_sql = ("SELECT rowid FROM player_name_search "
+               "WHERE player_name_search MATCH ?")
+
+    print(f"{'typed':14}{'LIKE':>10}{'FTS5':>10}{'':>8}{'rows':>8}")
+    wrong = []
+    like_total = fts_total = 0.0
+    for typed in TYPED:
+        t_like, _ = timed(conn, like_sql, (f"%{typed}%",), args.reps)
+        t_fts, ids = timed(conn, fts_sql, (match_query(typed),), args.reps)
+        like_total += t_like
+        fts_total += t_fts
+        print(f"{typed!r:14}{t_like * 1000:8.2f}ms{t_fts * 1000:8.2f}ms"
+              f"{t_like / t_fts:7.1f}x{len(ids):8,}")
+        if ids != expected_ids(by_id, typed):
+            wrong.append(typed)
+    print(f"{'total':14}{like_total * 1000:8.2f}ms{fts_total * 1000:8.2f}ms"
+          f"{like_total / fts_total:7.1f}x")
+    conn.close()
+
+    if wrong:
+        print(f"\n!! FTS results differ from word-prefix matching for: "
+              f"{', '.join(map(repr, wrong))}")
+        sys.exit(1)
+    print("\nFTS results match accent-folded word-prefix matching.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pandas as pd
+
+from load_conference_season_sqlite import ROSTER_FIELDS, STATS_FIELDS, \
+    write_conference_season
+from player_identity import SeasonRecord, normalize_name, resolve_database, \
+    resolve_identities
+from rollups import refresh_rollups, source_fingerprints, stale_scopes
+from schema_migrations import migrate
+
+FIRST = ["Jalen", "Jaylen", "Marcus", "Chris", "Tyler", "Jordan", "Josh",
+         "Isaiah", "Malik", "Andre", "José", "Nikola", "Cam", "Trey", "Darius"]
+LAST = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Davis", "Miller",
+        "Wilson", "Moore", "Taylor", "Thomas", "Jackson", "White", "Harris",
+        "Martin", "Thompson", "García", "Martínez", "Robinson", "Clark"]
+SYLLABLES = ["ka", "ro", "vic", "mar", "den", "li", "son", "ba", "tre", "mo",
+             "well", "an", "to", "ler", "ji", "nez", "ko", "ra", "ford", "el"]
+CLASSES = ["FR", "SO", "JR", "SR", "GR"]
+
+
+def made_up_name(rng: random.Random, n_syllables: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(n_syllables)).title()
+
+
+def synthetic_careers(n_players: int, n_teams: int, seed: int = 0):
+    """
+    Player-season records with the true player index of each. A third of
+    the players get a common first name and a tenth a common last name, so
+    full names repeat across players; some players sometimes drop their
+    accents or add a "Jr.", and some transfer.
+    """
+    rng = random.Random(seed)
+    teams = [f"team-{i}" for i in range(n_teams)]
+    records: list[SeasonRecord] = []
+    truth: list[int] = []
+    for p in range(n_players):
+        first = rng.choice(FIRST) if rng.random() < 0.3 else made_up_name(rng, 2)
+        last = rng.choice(LAST) if rng.random() < 0.1 else made_up_name(rng, 3)
+        suffix = rng.choice(["", "", "", "", " Jr.", " II"])
+        start = rng.randrange(2000, 2025)
+        n_seasons = rng.choice([1, 2, 3, 4, 4, 5])
+        team = rng.choice(teams)
+        height = rng.gauss(198, 8)
+        rank = 0
+        for s in range(n_seasons):
+            if rng.random() < 0.12:
+                team = rng.choice(teams)  # transfer
+            name = f"{first} {last}"
+            if rng.random() < 0.2:
+                name = normalize_name(name).title()  # accents dropped
+            if rng.random() < 0.5:
+                name += suffix
+            records.append(SeasonRecord(
+                player_name=name,
+                team_slug=team,
+                season_end_year=start + s,
+                height_cm=round(height + rng.uniform(-1.5, 1.5)),
+                class_year=CLASSES[min(rank, 4)],
+                listed_in_stats=True,
+                listed_in_roster=True,
+            ))
+            truth.append(p)
+            # Redshirt years keep the class
+            rank += 0 if rng.random() < 0.1 else 1
+    return records, truth
+
+
+def pair_count(sizes) -> int:
+    return sum(n * (n - 1) // 2 for n in sizes)
+
+
+def pairwise_scores(labels: list, truth: list[int]) -> tuple[float, float]:
+    """Pairwise precision / recall of a clustering against the truth."""
+    both = pair_count(Counter(zip(labels, truth)).values())
+    predicted = pair_count(Counter(labels).values())
+    actual = pair_count(Counter(truth).values())
+    return both / max(predicted, 1), both / max(actual, 1)
+
+
+# ---------------------------------------------------------
+# Database round trip
+#
+# Synthetic conference-seasons go through the loader, then a full
+# resolution runs twice. No player-season row may be lost, the second run
+# must change nothing, and a --delta reload afterwards must write nothing.
+# ---------------------------------------------------------
+
+CONFERENCE = SimpleNamespace(key="synthetic", name="Synthetic")
+
+# Same team-season, same normalised name: two players with a stat line each
+# (must stay apart), and one player listed differently on the stats page and
+# the roster (must become one)
+TWINS = [("Elijah Williams II", True, True), ("Elijah Williams III", True, True),
+         ("Jalen Smith", True, False), ("Jalen Smith Jr.", False, True)]
+
+
+def season_frames(records: list[SeasonRecord], seed: int = 1):
+    """Per season, the (stats_df, roster_df) a load of it would write."""
+    rng = random.Random(seed)
+    rows = [{"player_name": r.player_name, "team_slug": r.team_slug,
+             "season_end_year": r.season_end_year, "height_cm": r.height_cm,
+             "class_year": r.class_year, "in_stats": r.listed_in_stats,
+             "in_roster": r.listed_in_roster} for r in records]
+    season = records[0].season_end_year
+    rows += [{"player_name": name, "team_slug": "team-0", "season_end_year": season,
+              "height_cm": 196.0, "class_year": "JR", "in_stats": in_stats,
+              "in_roster": in_roster} for name, in_stats, in_roster in TWINS]
+    df = pd.DataFrame(rows).drop_duplicates(["player_name", "team_slug",
+                                             "season_end_year"])
+    df["conference_key"] = CONFERENCE.key
+    for col in ("g", "mp", "pts", "reb", "ast"):
+        df[col] = [round(rng.uniform(1, 30), 1) for _ in range(len(df))]
+    df["pos"], df["weight_kg"] = "G", 90.0
+    for year, part in df.groupby("season_end_year"):
+        yield year, (part[part["in_stats"]][["player_name"] + STATS_FIELDS],
+                     part[part["in_roster"]][["player_name"] + ROSTER_FIELDS])
+
+
+def load_all(conn, frames, delta: bool = False) -> int:
+    """Load every season; returns the rows written."""
+    written = 0
+    conn.execute("BEGIN")
+    for year, (stats_df, roster_df) in frames:
+        stats, roster = write_conference_season(conn, CONFERENCE, year, stats_df,
+                                                roster_df, delta=delta)
+        written += stats.written + roster.written
+    conn.execute("COMMIT")
+    return written
+
+
+def row_counts(conn) -> tuple[int, int]:
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                 for table in ("player_season_stats", "player_roster_attrs"))
+
+
+def profile_rows(conn) -> list[tuple]:
+    return conn.execute("SELECT * FROM player_season_profile "
+                        "ORDER BY conference_key, season_end_year, team_slug, player_id"
+                        ).fetchall()
+
+
+def twin_ids(conn) -> dict[str, int]:
+    season = conn.execute("SELECT MIN(season_end_year) FROM player_identity").fetchone()[0]
+    return dict(conn.execute(
+        "SELECT player_name, player_id FROM player_identity "
+        "WHERE team_slug = 'team-0' AND season_end_year = ?", (season,)))
+
+
+def round_trip(n_players: int, n_teams: int) -> list[str]:
+    records, _ = synthetic_careers(n_players, n_teams, seed=7)
+    records.sort(key=lambda r: r.season_end_year)
+    frames = list(season_frames(records))
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("BEGIN")
+    migrate(conn)
+    conn.execute("COMMIT")
+    load_all(conn, frames)
+    before = row_counts(conn)
+    conn.execute("BEGIN")
+    refresh_rollups(conn, source_fingerprints(conn))
+    conn.execute("COMMIT")
+
+    runs = []
+    for _ in range(2):
+        conn.execute("BEGIN")
+        runs.append(resolve_database(conn))
+        refresh_rollups(conn, runs[-1][5])
+        conn.execute("COMMIT")
+    after = row_counts(conn)
+    # Refreshing the scopes the runs returned must leave the profiles a
+    # full rebuild would
+    profiles = profile_rows(conn)
+    conn.execute("BEGIN")
+    refresh_rollups(conn, source_fingerprints(conn))
+    conn.execute("COMMIT")
+    rebuilt = profile_rows(conn)
+    ids = twin_ids(conn)
+    reloaded = load_all(conn, frames, delta=True)
+    # A roster edit that keeps the first character (SO -> SX)
+    edited = conn.execute(
+        "SELECT conference_key, season_end_year, rowid FROM player_roster_attrs "
+        "WHERE class_year IS NOT NULL LIMIT 1").fetchone()
+    conn.execute("UPDATE player_roster_attrs SET class_year = substr(class_year, 1, 1) "
+                 "|| 'X' WHERE rowid = ?", edited[2:])
+    stale = stale_scopes(conn)
+    conn.close()
+
+    (n_records, _, n_found, moved, created, scopes), second = runs
+    print(f"\nDatabase round trip: {n_records:,} records -> {n_found:,} players, "
+          f"{moved:,} re-pointed, {created:,} created, {len(scopes)} "
+          f"conference-seasons refreshed; rows {before} -> {after}")
+    problems = []
+    if after != before:
+        problems.append(f"rows lost re-pointing ids: {before} -> {after}")
+    if second[3] or second[4]:
+        problems.append(f"second run re-pointed {second[3]} records and created "
+                        f"{second[4]} players")
+    if profiles != rebuilt:
+        problems.append("profiles of the refreshed scopes differ from a full rebuild")
+    if stale != [tuple(edited[:2])]:
+        problems.append(f"a class_year edit left stale scopes {stale}")
+    if ids["Elijah Williams II"] == ids["Elijah Williams III"]:
+        problems.append("two players with a stat line each were merged")
+    if ids["Jalen Smith"] != ids["Jalen Smith Jr."]:
+        problems.append("stats-page and roster listings of one player were not merged")
+    if reloaded:
+        problems.append(f"--delta reload after resolution wrote {reloaded} rows")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark blocked player identity resolution on synthetic "
+                    "player-season records."
+    )
+    parser.add_argument("--players", type=int, default=32_000,
+                        help="Synthetic players (default: 32,000, ~100k records).")
+    parser.add_argument("--teams", type=int, default=360,
+                        help="Teams (default: 360, about D1).")
+    parser.add_argument("--db-players", type=int, default=3_000,
+                        help="Players in the database round trip (default: 3,000).")
+    args = parser.parse_args()
+
+    records, truth = synthetic_careers(args.players, args.teams)
+    print(f"{len(records):,} player-season records, {args.players:,} players, "
+          f"{len({r.player_name for r in records}):,} distinct listed names\n")
+
+    started = time.perf_counter()
+    by_name = [r.player_name for r in records]
+    t_name = time.perf_counter() - started
+
+    started = time.perf_counter()
+    labels = resolve_identities(records)
+    t_blocked = time.perf_counter() - started
+
+    print(f"{'':24}{'time':>10}{'players':>10}{'precision':>11}{'recall':>8}")
+    for label, t, clusters in (("one player per name", t_name, by_name),
+                               ("blocked resolution", t_blocked, labels)):
+        precision, recall = pairwise_scores(clusters, truth)
+        print(f"{label:24}{t * 1000:8.0f}ms{len(set(clusters)):10,}"
+              f"{precision:11.3f}{recall:8.3f}")
+
+    problems = round_trip(args.db_players, args.teams)
+    if problems:
+        for problem in problems:
+            print(f"!! {problem}")
+        sys.exit(1)
+    print("No rows lost, a second resolution changes nothing, the refreshed "
+          "profiles match a full rebuild, and a --delta reload writes nothing.")
+
+
+if __name__ == "__main__":
+    main()
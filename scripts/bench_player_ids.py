@@ -0,0 +1,107 @@
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from schema_migrations import DDL
+from load_conference_season_sqlite import get_or_create_player_ids
+
+
+def get_or_create_player_ids_per_name(conn, names: list[str]) -> dict[str, int]:
+    """The previous implementation: one SELECT (+ INSERT) per distinct name."""
+    cur = conn.cursor()
+    ids: dict[str, int] = {}
+
+    for name in names:
+        if name in ids:
+            continue
+        cur.execute(
+            "SELECT player_id FROM players WHERE player_name = ?", (name,))
+        row = cur.fetchone()
+        if row:
+            ids[name] = row[0]
+        else:
+            cur.execute(
+                "INSERT INTO players (player_name) VALUES (?)", (name,))
+            ids[name] = cur.lastrowid
+
+    return ids
+
+
+def synthetic_names(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    first = [f"First{i}" for i in range(400)]
+    last = [f"Last{i}" for i in range(400)]
+    suffix = ["", "", "", " Jr.", " II", " III"]
+    return [f"{rng.choice(first)} {rng.choice(last)}{rng.choice(suffix)}"
+            for _ in range(n)]
+
+
+def fresh_db(path: str, existing: list[str]) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(DDL)
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO players (player_name) VALUES (?)",
+                         ((name,) for name in existing))
+    return conn
+
+
+def run(fn, path: str, existing: list[str], names: list[str]) -> tuple[float, dict[str, int]]:
+    if path != ":memory:":
+        Path(path).unlink(missing_ok=True)
+    conn = fresh_db(path, existing)
+    if path != ":memory:":
+        # Start from a cold page cache, as a fresh loader run would
+        conn.close()
+        conn = sqlite3.connect(path)
+    started = time.perf_counter()
+    with conn:
+        ids = fn(conn, names)
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed, ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-name vs set-based player id resolution."
+    )
+    parser.add_argument("--names", type=int, default=60_000,
+                        help="Names to resolve, with repeats (default: 60,000).")
+    parser.add_argument("--existing", type=float, default=0.5,
+                        help="Share of names already in players (default: 0.5).")
+    parser.add_argument("--background", type=int, default=200_000,
+                        help="Other players already in the table (default: 200,000).")
+    parser.add_argument("--on-disk", action="store_true",
+                        help="Use a database file instead of :memory:.")
+    args = parser.parse_args()
+
+    names = synthetic_names(args.names)
+    distinct = list(dict.fromkeys(names))
+    existing = distinct[: int(len(distinct) * args.existing)]
+    existing += [f"Other Player {i}" for i in range(args.background)]
+    random.Random(1).shuffle(existing)
+    print(f"{len(names):,} names, {len(distinct):,} distinct, "
+          f"{len(existing):,} players already in the table\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db") if args.on_disk else ":memory:"
+        t_old, old = run(get_or_create_player_ids_per_name, path, existing, names)
+        t_new, new = run(get_or_create_player_ids, path, existing, names)
+
+    print(f"{'per-name SELECT/INSERT':26}{t_old * 1000:10.1f} ms")
+    print(f"{'set-based (temp table)':26}{t_new * 1000:10.1f} ms"
+          f"   {t_old / t_new:.1f}x")
+
+    if old != new:
+        diff = sum(1 for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+        print(f"\n!! {diff} names map to different ids")
+        sys.exit(1)
+    print("\nSame name -> id map.")
+
+
+if __name__ == "__main__":
+    main()
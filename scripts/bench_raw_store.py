@@ -0,0 +1,109 @@
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from page_cache import CacheEntry, save_entry
+from parse_sportsref_conference_rosters import parse_roster_file
+from parse_sportsref_conference_stats import extract_team_per_game
+from raw_store import RawStore, iter_pages
+from sportsref_fixtures import render_team_page
+
+
+def dir_footprint(paths: list[Path]) -> tuple[int, int]:
+    """(apparent bytes, allocated bytes on disk) for a set of files."""
+    apparent = allocated = 0
+    for p in paths:
+        st = p.stat()
+        apparent += st.st_size
+        allocated += getattr(st, "st_blocks", 0) * 512 or st.st_size
+    return apparent, allocated
+
+
+def time_parse(pages, season_end_year: int) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page in pages:
+            extract_team_per_game(page, season_end_year)
+            parse_roster_file(page)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare disk footprint and parse time: plain .html vs compressed raw store."
+    )
+    parser.add_argument("--pages", type=int, default=100,
+                        help="Synthetic team pages to generate (default: 100).")
+    parser.add_argument("--raw-dir", type=Path,
+                        help="Use real <slug>_<year>.html pages from this dir instead.")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--level", type=int, default=6,
+                        help="gzip compression level (default: 6).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        plain_dir = tmp / "plain"
+        meta_dir = tmp / "store_pages"
+        plain_dir.mkdir()
+        meta_dir.mkdir()
+        store = RawStore(tmp / "_objects", level=args.level)
+
+        if args.raw_dir:
+            sources = {p.stem: p.read_text(encoding="utf-8")
+                       for p in sorted(args.raw_dir.glob("*.html"))}
+            season = int(next(iter(sources)).rsplit("_", 1)[1]) if sources else args.season
+        else:
+            season = args.season
+            sources = {f"team-{i:04d}_{season}": render_team_page(f"team-{i:04d}", season)
+                       for i in range(args.pages)}
+
+        started = time.perf_counter()
+        for stem, text in sources.items():
+            (plain_dir / f"{stem}.html").write_text(text, encoding="utf-8")
+        plain_write = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for stem, text in sources.items():
+            sha256 = store.put(text)
+            save_entry(meta_dir / f"{stem}.html", CacheEntry(url="", sha256=sha256))
+        store_write = time.perf_counter() - started
+
+        plain_files = list(plain_dir.glob("*.html"))
+        store_files = list(store.root.rglob("*.gz")) + \
+            list(meta_dir.glob("*.meta.json"))
+        plain_apparent, plain_alloc = dir_footprint(plain_files)
+        store_apparent, store_alloc = dir_footprint(store_files)
+
+        plain_pages = iter_pages(plain_dir, store=store)
+        store_pages = iter_pages(meta_dir, store=store)
+        assert all(p.compressed for p in store_pages)
+
+        plain_parse = time_parse(plain_pages, season)
+        store_parse = time_parse(store_pages, season)
+
+        started = time.perf_counter()
+        for page in store_pages:
+            with page.open() as fh:
+                fh.read()
+        decompress = time.perf_counter() - started
+
+    n = len(sources)
+    mb = 1024 * 1024
+    print(f"Pages: {n} ({'real' if args.raw_dir else 'synthetic'}), gzip level {args.level}")
+    print(f"{'':22}{'plain .html':>14}{'store':>14}{'ratio':>8}")
+    print(f"{'apparent size (MB)':22}{plain_apparent / mb:14.2f}{store_apparent / mb:14.2f}"
+          f"{plain_apparent / max(store_apparent, 1):8.1f}x")
+    print(f"{'allocated (MB)':22}{plain_alloc / mb:14.2f}{store_alloc / mb:14.2f}"
+          f"{plain_alloc / max(store_alloc, 1):8.1f}x")
+    print(f"{'write (ms/page)':22}{plain_write / n * 1e3:14.2f}{store_write / n * 1e3:14.2f}")
+    print(f"{'parse (ms/page)':22}{plain_parse / n * 1e3:14.2f}{store_parse / n * 1e3:14.2f}"
+          f"{store_parse / plain_parse:8.2f}x")
+    print(f"decompress only: {decompress / n * 1e3:.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from parse_sportsref_conference_rosters import (
+    CLASS_YEAR_CODES,
+    heights_to_cm,
+    parse_height_to_cm,
+    parse_weight_to_kg,
+    weights_to_kg,
+    normalize_codes,
+)
+
+
+# Messy cell values seen (or plausible) in roster tables
+HEIGHT_NOISE = ["", " ", "6'5\"", "6-", "-5", "six-five", "6-5-1", None, np.nan]
+WEIGHT_NOISE = ["", " ", "205 lbs", "2o5", "1.5", "+", None, np.nan]
+CLASS_VALUES = ["FR", "Fr.", "so", "JR", "Sr.", "Senior", "Graduate", "GR", "", None]
+
+
+def synthetic_roster(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Roster-shaped frame of raw cell text: ~90% clean values, the rest noise."""
+    rng = np.random.default_rng(seed)
+    inches = rng.integers(66, 88, n_rows)
+    heights = pd.Series([f"{i // 12}-{i % 12}" for i in inches], dtype=object)
+    weights = pd.Series(rng.integers(150, 290, n_rows).astype(str), dtype=object)
+
+    noisy = rng.random(n_rows) < 0.1
+    heights[noisy] = rng.choice(np.array(HEIGHT_NOISE, dtype=object), noisy.sum())
+    noisy = rng.random(n_rows) < 0.1
+    weights[noisy] = rng.choice(np.array(WEIGHT_NOISE, dtype=object), noisy.sum())
+    # Pad some clean values with whitespace, as copied cells sometimes are
+    padded = rng.random(n_rows) < 0.05
+    weights[padded] = " " + weights[padded].astype(str) + " "
+
+    return pd.DataFrame({
+        "height_raw": heights,
+        "weight_lbs": weights,
+        "class_year": rng.choice(np.array(CLASS_VALUES, dtype=object), n_rows),
+    })
+
+
+def best_of(fn, repeat: int) -> tuple[float, pd.Series]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def count_mismatches(scalar: pd.Series, vectorized: pd.Series) -> int:
+    """Scalar None must line up with <NA>, everything else must be equal."""
+    expected = pd.Series(scalar.tolist(), dtype="Int64")
+    got = vectorized.reset_index(drop=True)
+    same = (expected.isna() & got.isna()) | (expected == got).fillna(False)
+    return int((~same).sum())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark and parity-check the vectorized roster conversions "
+                    "against the scalar .apply versions."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000,
+                        help="Synthetic roster rows (default: 1,000,000).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Best-of-N timing (default: 3).")
+    args = parser.parse_args()
+
+    df = synthetic_roster(args.rows)
+    print(f"Synthetic roster: {len(df):,} rows\n")
+
+    cases = [
+        ("height_cm", "height_raw", parse_height_to_cm, heights_to_cm),
+        ("weight_kg", "weight_lbs", parse_weight_to_kg, weights_to_kg),
+    ]
+
+    print(f"{'conversion':12}{'apply ms':>12}{'vector ms':>12}{'speedup':>9}  mismatches")
+    failed = 0
+    for name, col, scalar_fn, vector_fn in cases:
+        t_old, old = best_of(lambda: df[col].apply(scalar_fn), args.repeat)
+        t_new, new = best_of(lambda: vector_fn(df[col]), args.repeat)
+        bad = count_mismatches(old, new)
+        failed += bad
+        print(f"{name:12}{t_old * 1000:12.1f}{t_new * 1000:12.1f}"
+              f"{t_old / t_new:8.1f}x  {bad}")
+
+    t_cls, classes = best_of(
+        lambda: normalize_codes(df["class_year"], CLASS_YEAR_CODES), args.repeat)
+    print(f"{'class_year':12}{'':12}{t_cls * 1000:12.1f}")
+    print(f"\nclass_year values: {dict(classes.value_counts(dropna=False))}")
+
+    if failed:
+        print(f"\n!! {failed} mismatches between scalar and vectorized conversions")
+        sys.exit(1)
+    print("\nParity OK.")
+
+
+if __name__ == "__main__":
+    main()
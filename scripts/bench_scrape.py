@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import scrape_conference_season as scraper
+from http_fetcher import AsyncFetcher
+from raw_store import RawStore
+from sportsref_standin import StandinServer, add_fault_args, faults_from_args
+
+
+def report(label: str, fetcher: AsyncFetcher, ok: int, errors: int, wall: float) -> None:
+    times = np.array(fetcher.fetch_times or [0.0]) * 1000
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    print(
+        f"{label:30} {ok:5d} ok {errors:3d} err  {wall:7.2f}s  "
+        f"{ok / wall:7.1f} pages/s  {fetcher.requests_sent:5d} req "
+        f"{fetcher.retries:4d} retries  p50 {p50:6.1f}  p95 {p95:6.1f}  "
+        f"p99 {p99:6.1f}  max {times.max():6.1f} ms"
+    )
+
+
+def make_fetcher(args: argparse.Namespace) -> AsyncFetcher:
+    return AsyncFetcher(
+        rate=args.rate,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        headers=scraper.HEADERS,
+        backoff_base=args.backoff_base,
+    )
+
+
+def bench_single_page(args, slugs: list[str]) -> None:
+    fetcher = make_fetcher(args)
+    ok = errors = 0
+    started = time.perf_counter()
+    for slug in slugs:
+        try:
+            scraper.fetch_team_html(slug, args.season, fetcher)
+            ok += 1
+        except Exception:
+            errors += 1
+    wall = time.perf_counter() - started
+    fetcher.close()
+    report("fetch_team_html (serial)", fetcher, ok, errors, wall)
+
+
+def bench_scrape_loop(args, slugs: list[str], tmp: Path, policy: str) -> None:
+    fetcher = make_fetcher(args)
+    raw_dir = tmp / "raw"
+    raw_dir.mkdir(exist_ok=True)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = asyncio.run(
+            scraper.scrape_team_pages(
+                fetcher, slugs, args.season, raw_dir, tmp, policy,
+                RawStore(tmp / "_objects"))
+        )
+    wall = time.perf_counter() - started
+    fetcher.close()
+    done = stats.hit + stats.revalidated + stats.fetched
+    report(f"scrape_team_pages ({policy})", fetcher, done, stats.errors, wall)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the scrape path against the local Sports-Reference stand-in."
+    )
+    parser.add_argument("--pages", type=int, default=50,
+                        help="Team pages per phase (default: 50).")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--rate", type=float, default=50.0,
+                        help="Fetcher req/s per host (default: 50).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--backoff-base", type=float, default=0.05,
+                        help="Back-off base seconds when no Retry-After (default: 0.05).")
+    add_fault_args(parser)
+    args = parser.parse_args()
+
+    slugs = [f"team-{i:04d}" for i in range(args.pages)]
+    faults = faults_from_args(args)
+
+    with StandinServer(faults=faults) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        scraper.BASE_URL = server.base_url
+        print(f"Stand-in: {server.base_url}")
+        print(f"Faults: {faults}\n")
+
+        bench_single_page(args, slugs)
+        bench_scrape_loop(args, slugs, Path(tmp), "refetch")
+        bench_scrape_loop(args, slugs, Path(tmp), "revalidate")
+
+        print(f"\nServer responses: {dict(server.status_counts)}")
+
+
+if __name__ == "__main__":
+    main()
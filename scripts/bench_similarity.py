@@ -0,0 +1,101 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from similarity import FEATURES, nearest_neighbors, standardize
+
+
+def synthetic_profiles(n: int, seed: int = 0) -> pd.DataFrame:
+    """Player-seasons with loosely correlated minutes / scoring / size."""
+    rng = np.random.default_rng(seed)
+    mp = rng.uniform(2, 36, n)
+    height = rng.normal(198, 8, n)
+    return pd.DataFrame({
+        "player_id": np.arange(n),
+        "season": rng.integers(2000, 2026, n),
+        "mp": mp,
+        "pts": np.clip(mp * rng.uniform(0.1, 0.6, n), 0, None),
+        "reb": np.clip(mp * (height - 170) / 250 * rng.uniform(0.3, 1.2, n), 0, None),
+        "ast": np.clip(mp * rng.gamma(2, 0.04, n), 0, None),
+        "height_cm": np.where(rng.random(n) < 0.1, np.nan, height),
+        "weight_kg": np.where(rng.random(n) < 0.1, np.nan, rng.normal(95, 10, n)),
+    })
+
+
+def per_row_loop(df: pd.DataFrame, X_norm: np.ndarray, rows, k: int) -> list[list[int]]:
+    """
+    The previous compute_sunbelt_2024_25_similarity loop: a full distance
+    vector, full argsort and a df.loc lookup per comp, for each row.
+    """
+    comps = []
+    for i in rows:
+        diffs = X_norm - X_norm[i]
+        dists = np.sqrt((diffs ** 2).sum(axis=1))
+        dists[i] = np.inf  # ignore self
+        nn_idx = np.argsort(dists)[:k]
+        comps.append([int(df.loc[j, "player_id"]) for j in nn_idx])
+    return comps
+
+
+def engine_peak(Z: np.ndarray, k: int) -> tuple[float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    nearest_neighbors(Z, k=k)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the blocked k-NN similarity engine against the "
+                    "per-player loop it replaces."
+    )
+    parser.add_argument("--rows", type=int, default=30_000,
+                        help="Player-seasons (default: 30,000, about five D1 seasons).")
+    parser.add_argument("--k", type=int, default=5,
+                        help="Comps per player-season (default: 5).")
+    parser.add_argument("--loop-sample", type=int, default=1_000,
+                        help="Rows timed with the old loop, extrapolated to all "
+                             "rows (default: 1,000).")
+    args = parser.parse_args()
+
+    df = synthetic_profiles(args.rows)
+    Z, _, _ = standardize(df[FEATURES].to_numpy())
+    print(f"{args.rows:,} player-seasons, {len(FEATURES)} features, k={args.k}\n")
+
+    sample = np.random.default_rng(1).choice(args.rows, args.loop_sample, replace=False)
+    started = time.perf_counter()
+    old = per_row_loop(df, Z, sample, args.k)
+    t_loop = (time.perf_counter() - started) * args.rows / len(sample)
+
+    started = time.perf_counter()
+    neighbors = nearest_neighbors(Z, k=args.k)
+    t_blocked = time.perf_counter() - started
+
+    print(f"{'per-row loop (extrapolated)':30}{t_loop:9.2f}s")
+    print(f"{'blocked engine':30}{t_blocked:9.2f}s   {t_loop / t_blocked:.0f}x\n")
+
+    # Beyond the inputs and the result (O(rows)), memory is a few blocks
+    print(f"{'rows':>10}{'time':>10}{'peak MiB':>10}")
+    for n in (args.rows // 4, args.rows // 2, args.rows, args.rows * 4):
+        Zn = Z if n <= len(Z) else standardize(
+            synthetic_profiles(n, seed=2)[FEATURES].to_numpy())[0]
+        elapsed, peak = engine_peak(Zn[:n], args.k)
+        print(f"{n:10,}{elapsed:9.2f}s{peak / 2**20:10.1f}")
+
+    new = df["player_id"].to_numpy()[neighbors.index[sample]].tolist()
+    mismatched = sum(a != b for a, b in zip(old, new))
+    if mismatched:
+        print(f"\n!! {mismatched} of {len(sample)} sampled rows have different comps")
+        sys.exit(1)
+    print(f"\nSame comps, in the same order, for all {len(sample)} sampled rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_similarity import synthetic_profiles
+from schema_migrations import migrate
+from similarity import FEATURES, SEASON_KEY, PoolState, apply_scale, load_profiles, \
+    nearest_neighbors, read_pool, refresh_pool
+from sqlite_bulk import insert_chunked
+
+PROFILE_COLUMNS = ["conference_key", "season_end_year", "team_slug", "player_id",
+                   "player_name", *FEATURES]
+
+
+def scratch_pool_db(profiles: pd.DataFrame) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("BEGIN")
+    migrate(conn)
+    insert_chunked(
+        conn,
+        f"INSERT INTO player_season_profile ({', '.join(PROFILE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(PROFILE_COLUMNS))})",
+        profiles, PROFILE_COLUMNS)
+    conn.execute("COMMIT")
+    return conn
+
+
+def as_profiles(df: pd.DataFrame) -> pd.DataFrame:
+    """Synthetic rows shaped like player_season_profile (~14 players a team)."""
+    return df.assign(
+        conference_key="d1",
+        season_end_year=df["season"],
+        team_slug="team-" + (df["player_id"] % 360).astype(str),
+        player_name="Player " + df["player_id"].astype(str),
+    )
+
+
+def nightly_changes(conn, season: int, n_changed: int, n_new: int, n_gone: int,
+                    seed: int = 3) -> None:
+    """One night in season: box-score updates, call-ups and removed rows."""
+    rng = np.random.default_rng(seed)
+    ids = [row[0] for row in conn.execute(
+        "SELECT player_id FROM player_season_profile WHERE season_end_year = ?",
+        (season,))]
+    picked = rng.choice(ids, n_changed + n_gone, replace=False).tolist()
+    conn.executemany(
+        "UPDATE player_season_profile SET pts = pts * ?, mp = mp + ? "
+        "WHERE player_id = ? AND season_end_year = ?",
+        [(rng.uniform(0.9, 1.1), rng.uniform(-1, 1), pid, season)
+         for pid in picked[:n_changed]])
+    conn.executemany(
+        "DELETE FROM player_season_profile WHERE player_id = ? AND season_end_year = ?",
+        [(pid, season) for pid in picked[n_changed:]])
+    new = as_profiles(synthetic_profiles(n_new, seed=seed).assign(
+        player_id=lambda d: d["player_id"] + 10_000_000, season=season))
+    insert_chunked(
+        conn,
+        f"INSERT INTO player_season_profile ({', '.join(PROFILE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(PROFILE_COLUMNS))})",
+        new, PROFILE_COLUMNS)
+
+
+def timed_refresh(conn, wanted: PoolState, incremental: bool) -> tuple[float, str]:
+    started = time.perf_counter()
+    conn.execute("BEGIN")
+    profiles = load_profiles(conn, wanted.features)
+    summary = refresh_pool(conn, "bench", profiles, wanted, incremental)
+    conn.execute("COMMIT")
+    return time.perf_counter() - started, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark an incremental similarity refresh after one "
+                    "night of in-season changes against a full rebuild."
+    )
+    parser.add_argument("--rows", type=int, default=130_000,
+                        help="Player-seasons in the pool (default: 130,000).")
+    parser.add_argument("--changed", type=int, default=2_000,
+                        help="Player-seasons updated overnight (default: 2,000).")
+    parser.add_argument("--new", type=int, default=50,
+                        help="New player-seasons (default: 50).")
+    parser.add_argument("--gone", type=int, default=10,
+                        help="Removed player-seasons (default: 10).")
+    args = parser.parse_args()
+
+    profiles = as_profiles(synthetic_profiles(args.rows))
+    season = int(profiles["season_end_year"].max())
+    conn = scratch_pool_db(profiles)
+
+    def wanted() -> PoolState:
+        return PoolState(FEATURES, 5, None, None, 0, np.empty(0), np.empty(0))
+
+    t_full, summary = timed_refresh(conn, wanted(), incremental=False)
+    print(f"{args.rows:,} player-seasons\n{'first run':12}{t_full:8.2f}s  {summary}")
+
+    conn.execute("BEGIN")
+    nightly_changes(conn, season, args.changed, args.new, args.gone)
+    conn.execute("COMMIT")
+    t_inc, summary = timed_refresh(conn, wanted(), incremental=True)
+    print(f"{'incremental':12}{t_inc:8.2f}s  {summary}")
+
+    # The incremental result must equal a from-scratch k-NN under the same
+    # (stored) normalization
+    state = read_pool(conn, "bench")
+    now = load_profiles(conn, FEATURES)
+    exact = nearest_neighbors(apply_scale(now[FEATURES].to_numpy(), state.means,
+                                          state.stds), k=state.k)
+    stored = pd.read_sql_query(
+        "SELECT player_id, team_slug, season_end_year, rank, comp_player_id "
+        "FROM player_similarity WHERE pool = 'bench' "
+        "ORDER BY player_id, team_slug, season_end_year, rank", conn)
+    expected = now["player_id"].to_numpy()[exact.index].ravel()
+    keys_match = stored[SEASON_KEY].drop_duplicates().reset_index(drop=True) \
+        .equals(now[SEASON_KEY].reset_index(drop=True))
+    comps_match = keys_match and np.array_equal(stored["comp_player_id"].to_numpy(),
+                                                expected)
+
+    t_full, summary = timed_refresh(conn, wanted(), incremental=False)
+    print(f"{'full rebuild':12}{t_full:8.2f}s  {summary}")
+    print(f"\nincremental is {t_full / t_inc:.1f}x faster")
+
+    if not comps_match:
+        print("\n!! incremental comps differ from a full recomputation")
+        sys.exit(1)
+    print("Incremental comps match a full recomputation.")
+
+
+if __name__ == "__main__":
+    main()
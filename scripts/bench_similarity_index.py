@@ -0,0 +1,130 @@
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from bench_similarity import synthetic_profiles
+from similarity import FEATURES, nearest_neighbors, standardize
+from similarity_index import build_index, load_index, save_index, search
+
+PROBES = [1, 2, 4, 8, 16, 32]
+
+
+def recall(found: np.ndarray, exact: np.ndarray) -> float:
+    """Share of the exact k nearest that the index returned."""
+    hits = sum(len(set(a) & set(b)) for a, b in zip(found.tolist(), exact.tolist()))
+    return hits / exact.size
+
+
+def keep_loading(path: Path, stop, counts) -> None:
+    """Reader process: load the index until told to stop."""
+    while not stop.is_set():
+        try:
+            index = load_index(path)
+            # Arrays of two different builds never line up
+            if not len(index.points) == len(index.row_ids) == len(index.keys["player_id"]):
+                counts[1] += 1
+        except (OSError, ValueError):  # missing file, or one of another size
+            counts[1] += 1
+        counts[0] += 1
+
+
+def concurrent_loads(indexes: list, path: Path, rebuilds: int) -> tuple[int, int]:
+    """
+    Save these indexes in turn, over and over, while another process keeps
+    loading them. Returns (loads, failed or mixed loads).
+    """
+    save_index(indexes[0], path)
+    stop = multiprocessing.Event()
+    counts = multiprocessing.Array("l", 2)
+    reader = multiprocessing.Process(target=keep_loading, args=(path, stop, counts))
+    reader.start()
+    time.sleep(0.5)  # let the reader get going
+    for i in range(rebuilds):
+        save_index(indexes[i % len(indexes)], path)
+    stop.set()
+    reader.join()
+    return counts[0], counts[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recall / speed of the IVF comps index against exact k-NN."
+    )
+    parser.add_argument("--rows", type=int, default=130_000,
+                        help="Player-seasons (default: 130,000, about 22 D1 seasons).")
+    parser.add_argument("--queries", type=int, default=2_000,
+                        help="Sampled query rows (default: 2,000).")
+    parser.add_argument("--k", type=int, default=5,
+                        help="Comps per query (default: 5).")
+    parser.add_argument("--lists", type=int, default=None,
+                        help="Coarse cells (default: 2 * sqrt(rows)).")
+    args = parser.parse_args()
+
+    df = synthetic_profiles(args.rows)
+    Z, means, stds = standardize(df[FEATURES].to_numpy())
+    keys = {"player_id": df["player_id"].to_numpy()}
+    sample = np.random.default_rng(1).choice(args.rows, args.queries, replace=False)
+
+    started = time.perf_counter()
+    index = build_index(Z, means, stds, FEATURES, keys, n_lists=args.lists)
+    t_build = time.perf_counter() - started
+    started = time.perf_counter()
+    exact = nearest_neighbors(Z, k=args.k, rows=sample).index
+    t_exact = time.perf_counter() - started
+    started = time.perf_counter()
+    for row in sample[:100]:
+        d = ((Z - Z[row]) ** 2).sum(axis=1)
+        d[row] = np.inf
+        np.argpartition(d, args.k)[:args.k]
+    t_scan = (time.perf_counter() - started) / 100
+    print(f"{args.rows:,} player-seasons, {index.n_lists} cells, built in {t_build:.2f}s")
+    print(f"exact: {t_exact:.2f}s for {args.queries:,} queries (blocked engine), "
+          f"{t_scan * 1000:.2f}ms per single query (full scan)\n")
+
+    print(f"{'probes':>7}{'recall':>9}{'batch':>10}{'per query':>12}")
+    for n_probe in PROBES + [index.n_lists]:
+        started = time.perf_counter()
+        found = search(index, Z[sample], args.k, n_probe, exclude=sample)
+        t_batch = time.perf_counter() - started
+        started = time.perf_counter()
+        for row in sample[:100]:
+            search(index, Z[row], args.k, n_probe, exclude=np.array([row]))
+        t_one = (time.perf_counter() - started) / 100
+        r = recall(found.index, exact)
+        print(f"{n_probe:7}{r:9.3f}{t_batch:9.2f}s{t_one * 1000:10.2f}ms")
+    exhaustive = r
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index"
+        save_index(index, path)
+        loaded = load_index(path)
+        same = np.array_equal(
+            search(loaded, Z[sample], args.k, exclude=sample).index,
+            search(index, Z[sample], args.k, exclude=sample).index)
+
+        # Small, so rebuilds come fast and the swap is hit often
+        small = [build_index(Z[:n], means, stds, FEATURES,
+                             {"player_id": keys["player_id"][:n]}, n_lists=8)
+                 for n in (1_000, 1_500)]
+        loads, failed = concurrent_loads(small, Path(tmp) / "small", rebuilds=2000)
+    print(f"\n{loads:,} loads during 2,000 rebuilds of a small index: {failed} failed")
+
+    problems = [f"{failed} loads failed or mixed two builds"] if failed else []
+    if exhaustive != 1.0:
+        problems.append(f"probing every cell gives recall {exhaustive:.3f}, not 1")
+    if not same:
+        problems.append("the index read back from disk answers differently")
+    if problems:
+        for problem in problems:
+            print(f"\n!! {problem}")
+        sys.exit(1)
+    print("\nProbing every cell matches exact k-NN; the saved index answers the same.")
+
+
+if __name__ == "__main__":
+    main()
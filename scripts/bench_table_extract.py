@@ -0,0 +1,74 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from raw_store import iter_pages
+from sportsref_fixtures import render_team_page
+from team_page import extract_team_tables
+
+
+def time_engine(page, engine: str, tables: list[str], repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = extract_team_tables(page, tables, engine=engine)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def report(pages, tables: list[str], repeat: int) -> None:
+    print(f"{'page':32}{'read_html ms':>14}{'lxml ms':>10}{'speedup':>9}  parity")
+    total_old = total_new = 0.0
+    mismatches = 0
+    for page in pages:
+        t_old, old = time_engine(page, "read_html", tables, repeat)
+        t_new, new = time_engine(page, "lxml", tables, repeat)
+        total_old += t_old
+        total_new += t_new
+
+        same = True
+        for name in tables:
+            try:
+                pd.testing.assert_frame_equal(old[name], new[name])
+            except AssertionError:
+                same = False
+        mismatches += not same
+        print(f"{page.stem:32}{t_old * 1e3:14.1f}{t_new * 1e3:10.1f}"
+              f"{t_old / t_new:8.1f}x  {'ok' if same else 'DIFF'}")
+
+    print(f"\nTotal: read_html {total_old:.2f}s, lxml {total_new:.2f}s "
+          f"({total_old / total_new:.1f}x); {mismatches} parity mismatches")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-file benchmark: pd.read_html over all tables vs targeted lxml extraction."
+    )
+    parser.add_argument("--raw-dir", type=Path,
+                        help="Benchmark real pages from this raw dir (default: synthetic pages).")
+    parser.add_argument("--pages", type=int, default=10,
+                        help="Synthetic pages when --raw-dir is not given (default: 10).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Best-of-N timing per file (default: 3).")
+    args = parser.parse_args()
+
+    tables = ["per_game", "roster"]
+
+    if args.raw_dir:
+        report(iter_pages(args.raw_dir), tables, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for i in range(args.pages):
+            slug = f"team-{i:04d}"
+            (tmp / f"{slug}_2025.html").write_text(
+                render_team_page(slug, 2025), encoding="utf-8")
+        report(iter_pages(tmp), tables, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
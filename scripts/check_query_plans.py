@@ -0,0 +1,170 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+from rollups import FINGERPRINT_SQL, PROFILE_SQL, SCOPE_WHERE, TEAM_SQL, \
+    refresh_rollups, source_fingerprints
+from schema_migrations import migrate
+
+# ---------------------------------------------------------
+# Query-plan regression check
+#
+# The queries the app and the loaders run, each with the index its plan
+# must use. Any plan step that scans a whole table fails the check, so a
+# dropped or renamed index (or a query that stops matching its index) shows
+# up here before it shows up as a slow page.
+# ---------------------------------------------------------
+
+PROFILE_QUERY = """
+    SELECT player_name, team_slug, conference_key, season_end_year,
+           g, mp, pts, reb, ast, class_year, pos, height_cm, weight_kg
+    FROM player_season_profile
+    WHERE conference_key = ?
+      AND season_end_year = ?
+"""
+
+SCOPE = ("sun-belt", 2025)
+
+# (name, SQL, params, indexes the plan must use)
+CHECKS = [
+    ("app: seasons of a conference",
+     "SELECT DISTINCT season_end_year FROM team_season_rollup "
+     "WHERE conference_key = ? ORDER BY season_end_year DESC",
+     ("sun-belt",), ["PRIMARY KEY"]),
+    ("app: teams of a conference-season",
+     "SELECT team_slug FROM team_season_rollup "
+     "WHERE conference_key = ? AND season_end_year = ? ORDER BY team_slug",
+     SCOPE, ["PRIMARY KEY"]),
+    ("app: player profiles, all teams",
+     PROFILE_QUERY + " ORDER BY team_slug, player_name",
+     SCOPE, ["PRIMARY KEY"]),
+    ("app: player profiles, one team",
+     PROFILE_QUERY + " AND team_slug = ? ORDER BY team_slug, player_name",
+     (*SCOPE, "troy"), ["PRIMARY KEY"]),
+    ("app: player profiles, name search",
+     PROFILE_QUERY + " AND player_id IN (SELECT rowid FROM player_name_search "
+                     "WHERE player_name_search MATCH ?) ORDER BY team_slug, player_name",
+     (*SCOPE, '"jal"* "smi"*'), ["PRIMARY KEY", "player_name_search VIRTUAL TABLE"]),
+    ("rollups: profile rows of a conference-season",
+     PROFILE_SQL, SCOPE,
+     ["idx_pss_conf_season_team", "sqlite_autoindex_player_roster_attrs_1"]),
+    ("rollups: team rows of a conference-season",
+     TEAM_SQL, SCOPE, ["PRIMARY KEY"]),
+    ("rollups: source fingerprint, season stats",
+     FINGERPRINT_SQL["player_season_stats"].format(where=SCOPE_WHERE), SCOPE,
+     ["idx_pss_conf_season_team"]),
+    ("rollups: source fingerprint, roster",
+     FINGERPRINT_SQL["player_roster_attrs"].format(where=SCOPE_WHERE), SCOPE,
+     ["idx_pra_conf_season_team"]),
+    ("loader: player ids by name",
+     "SELECT MIN(player_id) FROM players WHERE player_name = ?",
+     ("Jalen Smith",), ["idx_players_name"]),
+    ("loader: player-season record lookup",
+     "SELECT player_id FROM player_identity "
+     "WHERE player_name = ? AND team_slug = ? AND season_end_year = ?",
+     ("Jalen Smith", "troy", 2025), ["sqlite_autoindex_player_identity_1"]),
+    ("identity: records of a player",
+     "SELECT team_slug, season_end_year FROM player_identity WHERE player_id = ?",
+     (1,), ["idx_player_identity_player"]),
+    ("loader: delta delete scope, season stats",
+     "DELETE FROM player_season_stats WHERE conference_key = ? AND season_end_year = ?",
+     SCOPE, ["idx_pss_conf_season_team"]),
+    ("loader: delta delete scope, roster",
+     "DELETE FROM player_roster_attrs WHERE conference_key = ? AND season_end_year = ?",
+     SCOPE, ["idx_pra_conf_season_team"]),
+]
+
+
+def scratch_db(players: int = 5_000) -> sqlite3.Connection:
+    """
+    In-memory database at the latest schema with a few seasons of rows, and
+    ANALYZEd, so the planner sees realistic statistics.
+    """
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("BEGIN")
+    migrate(conn)
+    conn.execute("INSERT INTO conferences VALUES ('sun-belt', 'Sun Belt'), ('big-12', 'Big 12')")
+    conn.executemany("INSERT INTO teams VALUES (?, ?, NULL)",
+                     [(f"team-{i}", "sun-belt" if i % 2 else "big-12")
+                      for i in range(28)])
+    conn.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO players (player_id, player_name) SELECT i, 'Player ' || i FROM n
+        """,
+        (players,),
+    )
+    for table, values in (("player_season_stats", "g, mp, pts, reb, ast"),
+                          ("player_roster_attrs", "class_year, pos, height_cm, weight_kg")):
+        conn.execute(
+            f"""
+            INSERT INTO {table} (player_id, team_slug, conference_key,
+                                 season_end_year, {values})
+            SELECT p.player_id, t.team_slug, t.conference_key, y.season,
+                   {", ".join("NULL" for _ in values.split(","))}
+            FROM players p
+            JOIN teams t ON t.team_slug = 'team-' || (p.player_id % 28)
+            JOIN (SELECT 2022 AS season UNION ALL SELECT 2023
+                  UNION ALL SELECT 2024 UNION ALL SELECT 2025) y
+            """
+        )
+    conn.execute(
+        """
+        INSERT INTO player_identity (player_name, team_slug, season_end_year, player_id)
+        SELECT p.player_name, s.team_slug, s.season_end_year, s.player_id
+        FROM player_season_stats s JOIN players p USING (player_id)
+        """
+    )
+    refresh_rollups(conn, source_fingerprints(conn))
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    return conn
+
+
+def query_plan(conn, sql: str, params) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def plan_problems(plan: list[str], indexes: list[str]) -> list[str]:
+    problems = [f"full scan: {step}" for step in plan
+                if step.startswith("SCAN ") and " INDEX " not in step
+                and step != "SCAN CONSTANT ROW"]
+    text = "\n".join(plan)
+    problems += [f"does not use {index}" for index in indexes
+                 if f" {index}" not in text]
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that the app and loader queries use their indexes "
+                    "(exits 1 on a full scan or a missing index)."
+    )
+    parser.add_argument("--db", type=Path, default=None,
+                        help="Check this database instead of a scratch one "
+                             "built from the migrations.")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db) if args.db else scratch_db()
+    failed = 0
+    for name, sql, params, indexes in CHECKS:
+        plan = query_plan(conn, sql, params)
+        problems = plan_problems(plan, indexes)
+        print(f"{'FAIL' if problems else 'ok  '}  {name}")
+        if problems:
+            failed += 1
+            for step in plan:
+                print(f"        plan: {step}")
+            for problem in problems:
+                print(f"        !! {problem}")
+    conn.close()
+
+    if failed:
+        print(f"\n{failed} of {len(CHECKS)} query plans regressed")
+        sys.exit(1)
+    print(f"\nAll {len(CHECKS)} query plans use their indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,14 @@ import argparse
 from conferences import CONFERENCES, ConferenceConfig
 
 
-def parse_conference_season():
+def build_conference_season_parser(
+    description: str = "Scrape Sports-Reference team pages for a given conference & season.",
+) -> argparse.ArgumentParser:
     """
-    Parse CLI args and return (ConferenceConfig, season_end_year).
-    Example:
-      python scrape_conference_season.py --conference sun-belt --season 2025
+    Return a parser with the shared --conference / --season arguments.
+    Scripts that need extra options add them to the returned parser.
     """
-    parser = argparse.ArgumentParser(
-        description="Scrape Sports-Reference team pages for a given conference & season."
-    )
+    parser = argparse.ArgumentParser(description=description)
 
     parser.add_argument(
         "--conference",
@@ -24,9 +23,146 @@ def parse_conference_season():
         type=int,
         help="Season end year, e.g. 2025 for the 2024-25 season.",
     )
+    return parser
 
+
+def parse_conference_season():
+    """
+    Parse CLI args and return (ConferenceConfig, season_end_year).
+    Example:
+      python scrape_conference_season.py --conference sun-belt --season 2025
+    """
+    parser = build_conference_season_parser()
     args = parser.parse_args()
     conf: ConferenceConfig = CONFERENCES[args.conference]
     season_end_year: int = args.season
 
     return conf, season_end_year
+
+
+def add_fetch_args(parser: argparse.ArgumentParser) -> None:
+    """
+    Rate-limit / concurrency knobs for scripts that drive the AsyncFetcher.
+    """
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Max requests per second per host (default: 1.0).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Max in-flight requests per host (default: 4).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries for 429/5xx/network errors before giving up (default: 4).",
+    )
+    parser.add_argument(
+        "--cache-policy",
+        choices=("auto", "revalidate", "refetch"),
+        default="auto",
+        help=(
+            "auto: skip frozen past seasons already on disk, conditional GET "
+            "otherwise; revalidate: always conditional GET; refetch: ignore "
+            "the cache (default: auto)."
+        ),
+    )
+
+
+def parse_season_spec(value: str) -> list[int]:
+    """
+    '2025' -> [2025]; '2015-2025' -> [2015, ..., 2025] (season end years).
+    """
+    try:
+        if "-" in value:
+            start, end = (int(v) for v in value.split("-", 1))
+            if start > end:
+                raise ValueError
+            return list(range(start, end + 1))
+        return [int(value)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Bad season '{value}': use an end year (2025) or a range (2015-2025)."
+        )
+
+
+def build_batch_parser(description: str) -> argparse.ArgumentParser:
+    """
+    Like build_conference_season_parser, but --conference / --season take
+    lists. '--conference all' selects every entry in CONFERENCES.
+    """
+    parser = argparse.ArgumentParser(description=description)
+
+    parser.add_argument(
+        "--conference",
+        required=True,
+        nargs="+",
+        choices=["all"] + sorted(CONFERENCES.keys()),
+        help="One or more conference keys, or 'all'.",
+    )
+    parser.add_argument(
+        "--season",
+        required=True,
+        nargs="+",
+        type=parse_season_spec,
+        help="Season end years and/or ranges, e.g. 2024 2025 or 2015-2025.",
+    )
+    return parser
+
+
+def resolve_batch_args(args: argparse.Namespace) -> tuple[list[ConferenceConfig], list[int]]:
+    """
+    Turn parsed batch args into (conference configs, sorted season end years).
+    """
+    if "all" in args.conference:
+        keys = sorted(CONFERENCES.keys())
+    else:
+        keys = list(dict.fromkeys(args.conference))
+    seasons = sorted({year for spec in args.season for year in spec})
+    return [CONFERENCES[k] for k in keys], seasons
+
+
+def add_parse_args(parser: argparse.ArgumentParser) -> None:
+    """
+    Options shared by the raw-HTML parser scripts.
+    """
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse pages in N worker processes (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-parse every page, ignoring the parse manifest.",
+    )
+    parser.add_argument(
+        "--remove-legacy-csv",
+        action="store_true",
+        help="Delete the per-team / combined CSVs that older parser versions "
+             "wrote for this conference-season (kept by default).",
+    )
+
+
+def add_load_args(parser: argparse.ArgumentParser) -> None:
+    """
+    Write-mode flags shared by the SQLite loaders.
+    """
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Only insert new and update changed player-season rows, instead "
+             "of INSERT OR REPLACE for every row.",
+    )
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="With --delta: delete player-season rows of the loaded "
+             "conference-seasons that are no longer in the data.",
+    )
@@ -1,9 +1,10 @@
 from pathlib import Path
 import sqlite3
 
-import numpy as np
 import pandas as pd
 
+from similarity import neighbor_frame, nearest_neighbors, standardize
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
@@ -39,38 +40,13 @@ def main():
     feature_cols = ["pts", "ast", "trb", "stl", "blk", "mp", "ts_pct"]
     X = df[feature_cols].fillna(0.0).to_numpy(dtype=float)
 
-    # 2. Standardize (z-score)
-    means = X.mean(axis=0)
-    stds = X.std(axis=0)
-    stds[stds == 0] = 1.0  # avoid divide-by-zero
-
-    X_norm = (X - means) / stds
-
-    # 3. Compute nearest neighbours (Euclidean distance)
-    records = []
+    # 2. Standardize (z-score) and 3. nearest neighbours (Euclidean
+    # distance), top-5 comps per player
+    X_norm, _, _ = standardize(X)
+    neighbors = nearest_neighbors(X_norm, k=5)
     n = X_norm.shape[0]
-    k = 5  # top-5 comps per player
-
-    for i in range(n):
-        diffs = X_norm - X_norm[i]
-        dists = np.sqrt((diffs ** 2).sum(axis=1))
-        dists[i] = np.inf  # ignore self
-
-        nn_idx = np.argsort(dists)[:k]
-
-        for rank, j in enumerate(nn_idx, start=1):
-            records.append(
-                {
-                    "player_id": int(df.loc[i, "player_id"]),
-                    "season": int(df.loc[i, "season"]),
-                    "comp_player_id": int(df.loc[j, "player_id"]),
-                    "comp_season": int(df.loc[j, "season"]),
-                    "distance": float(dists[j]),
-                    "rank": rank,
-                }
-            )
-
-    sim_df = pd.DataFrame(records)
+
+    sim_df = neighbor_frame(df[["player_id", "season"]], neighbors)
     print(f"Computed {len(sim_df)} similarity rows for {n} players.")
 
     # 4. Create / replace similarity table
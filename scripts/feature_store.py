@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from similarity import FEATURES, standardize
+from versioned_dir import POINTER, publish, read_current
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+STORE_DIR = PROJECT_ROOT / "ncaa-analytics" / "features"
+
+Scope = tuple[str, int]  # (conference_key, season_end_year)
+
+
+# ---------------------------------------------------------
+# Memory-mapped player-season feature store
+#
+# One directory per conference-season, written from player_season_profile
+# after the rollups are refreshed. Each build goes to a new version
+# subdirectory (v1, v2, ...) and CURRENT names the live one:
+#
+#   CURRENT              "v7"
+#   v7/values.npy        (n, d) float32 profile features, NaN = missing
+#   v7/z.npy             (n, d) float32 z-scored within the conference-
+#                        season, missing = 0 (the mean)
+#   v7/player_id.npy     (n,) row keys, sorted by player_id then team_slug
+#   v7/team_slug.npy
+#   v7/meta.json         features, rows, means / stds, and the rollup
+#                        fingerprint the files were built from
+#
+# Consumers open the arrays memory-mapped, so opening costs no copy and
+# processes reading the same conference-season share its pages. A
+# conference-season is rebuilt when its rollup_freshness fingerprint (or
+# the feature list) no longer matches meta.json. Versions are published
+# through versioned_dir, so a reader sees the old files or the new ones,
+# never a missing conference-season.
+#
+# The store's feature list is kept in features.json at its root (FEATURES
+# until feature_store.py --features sets another), so the refreshes after
+# loads rebuild with the columns the store was built with.
+# ---------------------------------------------------------
+
+ARRAYS = ["values", "z", "player_id", "team_slug"]
+
+FEATURES_FILE = "features.json"
+
+
+@dataclass
+class FeatureMatrix:
+    conference_key: str
+    season_end_year: int
+    features: list[str]
+    values: np.ndarray      # (n, d) float32
+    z: np.ndarray           # (n, d) float32
+    player_id: np.ndarray   # (n,) int64
+    team_slug: np.ndarray   # (n,) str
+    means: np.ndarray       # (d,) float64
+    stds: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.player_id)
+
+    def rows_of(self, player_id: int) -> slice:
+        """Rows of a player (one per team they played for), by binary search."""
+        return slice(np.searchsorted(self.player_id, player_id, side="left"),
+                     np.searchsorted(self.player_id, player_id, side="right"))
+
+    def row_of(self, player_id: int, team_slug: str) -> int | None:
+        rows = self.rows_of(player_id)
+        for row in range(rows.start, rows.stop):
+            if self.team_slug[row] == team_slug:
+                return row
+        return None
+
+
+def store_features(root: Path = STORE_DIR) -> list[str]:
+    """The feature list the store is built with."""
+    try:
+        return json.loads((root / FEATURES_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return list(FEATURES)
+
+
+def set_store_features(features: list[str], root: Path = STORE_DIR) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = root / f"{FEATURES_FILE}.tmp"
+    tmp.write_text(json.dumps(list(features)), encoding="utf-8")
+    os.replace(tmp, root / FEATURES_FILE)
+
+
+def scope_dir(scope: Scope, root: Path = STORE_DIR) -> Path:
+    conference_key, season_end_year = scope
+    return root / conference_key / str(season_end_year)
+
+
+def _read_meta(version: Path) -> dict:
+    return json.loads((version / "meta.json").read_text(encoding="utf-8"))
+
+
+def read_meta(scope: Scope, root: Path = STORE_DIR) -> dict | None:
+    return read_current(scope_dir(scope, root), _read_meta)
+
+
+def build_matrix(conn, scope: Scope,
+                 features: list[str] = FEATURES) -> tuple[dict[str, np.ndarray], dict]:
+    """The arrays and metadata of one conference-season, from its profile rows."""
+    rows = conn.execute(
+        f"""
+        SELECT player_id, team_slug, {", ".join(features)}
+        FROM player_season_profile
+        WHERE conference_key = ? AND season_end_year = ?
+        ORDER BY player_id, team_slug
+        """,
+        scope,
+    ).fetchall()
+    values = np.array([row[2:] for row in rows], dtype=np.float64).reshape(
+        len(rows), len(features))  # None -> NaN
+    z, means, stds = standardize(values)
+    arrays = {
+        "values": values.astype(np.float32),
+        "z": z.astype(np.float32),
+        "player_id": np.array([row[0] for row in rows], dtype=np.int64),
+        "team_slug": np.array([row[1] for row in rows], dtype=str),
+    }
+    meta = {"conference_key": scope[0], "season_end_year": scope[1],
+            "features": list(features), "rows": len(rows),
+            "means": means.tolist(), "stds": stds.tolist()}
+    return arrays, meta
+
+
+def save_matrix(scope: Scope, arrays: dict[str, np.ndarray], meta: dict,
+                root: Path = STORE_DIR) -> None:
+    def write(version: Path) -> None:
+        for name in ARRAYS:
+            np.save(version / f"{name}.npy", arrays[name])
+        (version / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    publish(scope_dir(scope, root), write)
+
+
+def _open_version(version: Path) -> FeatureMatrix:
+    meta = _read_meta(version)
+    arrays = {name: np.load(version / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+    return FeatureMatrix(meta["conference_key"], meta["season_end_year"],
+                         meta["features"], **arrays,
+                         means=np.array(meta["means"]), stds=np.array(meta["stds"]))
+
+
+def open_scope(scope: Scope, root: Path = STORE_DIR) -> FeatureMatrix:
+    """A conference-season's features, memory-mapped read-only."""
+    matrix = read_current(scope_dir(scope, root), _open_version)
+    if matrix is None:
+        raise FileNotFoundError(f"no features stored for {scope}")
+    return matrix
+
+
+def stored_scopes(root: Path = STORE_DIR) -> list[Scope]:
+    return sorted((current.parent.parent.name, int(current.parent.name))
+                  for current in root.glob(f"*/*/{POINTER}")
+                  if current.parent.name.isdigit())
+
+
+def open_store(conference_keys: list[str] | None = None,
+               seasons: list[int] | None = None,
+               root: Path = STORE_DIR) -> dict[Scope, FeatureMatrix]:
+    return {scope: open_scope(scope, root) for scope in stored_scopes(root)
+            if (not conference_keys or scope[0] in conference_keys)
+            and (not seasons or scope[1] in seasons)}
+
+
+def stale_feature_scopes(conn, features: list[str] | None = None,
+                         root: Path = STORE_DIR) -> list[Scope]:
+    """
+    Conference-seasons whose stored features no longer match the rollups:
+    rebuilt since, never stored, built with other features (by default, not
+    the store's), or gone.
+    """
+    features = features or store_features(root)
+    current = dict(((conf, season), fingerprint) for conf, season, fingerprint in
+                   conn.execute("SELECT conference_key, season_end_year, "
+                                "source_fingerprint FROM rollup_freshness"))
+    stale = []
+    for scope in sorted(current.keys() | set(stored_scopes(root))):
+        meta = read_meta(scope, root)
+        if meta is None or meta.get("source_fingerprint") != current.get(scope) \
+                or meta["features"] != list(features):
+            stale.append(scope)
+    return stale
+
+
+def refresh_scopes(conn, scopes: Iterable[Scope], features: list[str] | None = None,
+                   root: Path = STORE_DIR) -> dict[Scope, int]:
+    """
+    Rebuild the feature files of these conference-seasons (removing those
+    with no rollups any more) with `features`, by default the store's.
+    Returns rows written per conference-season.
+    """
+    features = features or store_features(root)
+    written = {}
+    for scope in sorted(set(scopes)):
+        fingerprint = conn.execute(
+            "SELECT source_fingerprint FROM rollup_freshness "
+            "WHERE conference_key = ? AND season_end_year = ?", scope).fetchone()
+        if fingerprint is None:
+            shutil.rmtree(scope_dir(scope, root), ignore_errors=True)
+            continue
+        arrays, meta = build_matrix(conn, scope, features)
+        meta["source_fingerprint"] = fingerprint[0]
+        save_matrix(scope, arrays, meta, root)
+        written[scope] = meta["rows"]
+    return written
+
+
+def refresh_after_rollups(db_path: Path, scopes: Iterable[Scope],
+                          root: Path = STORE_DIR) -> None:
+    """Rebuild the feature files of conference-seasons whose rollups were refreshed."""
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    started = time.perf_counter()
+    with closing(sqlite3.connect(db_path)) as conn:
+        written = refresh_scopes(conn, scopes, root=root)
+    print(f"Refreshed features for {len(written)} conference-seasons "
+          f"({sum(written.values())} rows) in {time.perf_counter() - started:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Refresh the memory-mapped player-season feature store "
+                    "(only stale conference-seasons unless --all)."
+    )
+    parser.add_argument("--all", action="store_true",
+                        help="Rebuild every conference-season.")
+    parser.add_argument("--features", nargs="+", default=None,
+                        help="Profile columns to store from now on (default: the "
+                             f"store's, at first {' '.join(FEATURES)}).")
+    parser.add_argument("--out", type=Path, default=STORE_DIR,
+                        help=f"Store directory (default: {STORE_DIR}).")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Recorded first: scopes still on an older list stay stale until rebuilt
+    if args.features:
+        set_store_features(args.features, args.out)
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        scopes = stale_feature_scopes(conn, root=args.out)
+        if args.all:
+            scopes += [tuple(row) for row in conn.execute(
+                "SELECT conference_key, season_end_year FROM rollup_freshness")]
+        written = refresh_scopes(conn, scopes, root=args.out)
+
+    for (conf, season), n_rows in written.items():
+        print(f"  {conf} {season}: {n_rows} player-seasons")
+    print(f"Refreshed {len(written)} conference-seasons in "
+          f"{time.perf_counter() - started:.2f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
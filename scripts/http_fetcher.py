@@ -0,0 +1,227 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ---------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------
+
+class TokenBucket:
+    """
+    Per-host token bucket.
+
+    Tokens refill at `rate` per second up to `burst`. On throttling the
+    effective rate is cut in half (and the bucket can be paused until a
+    Retry-After deadline); successes slowly restore it to the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock: asyncio.Lock | None = None
+        self._loop = None
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens +
+                          (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        # Bucket state outlives an event loop (fetch_team_html runs one loop
+        # per call), the lock must not.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def throttle(self, delay: float) -> None:
+        """Halve the rate and stop handing out tokens for `delay` seconds."""
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    def reward(self) -> None:
+        """Additive recovery towards the configured rate after a success."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+# ---------------------------------------------------------
+# Fetch engine
+# ---------------------------------------------------------
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str
+    headers: dict = field(default_factory=dict)
+    attempts: int = 1
+    elapsed: float = 0.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Return the Retry-After delay in seconds (delta-seconds or HTTP-date form).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class AsyncFetcher:
+    """
+    Async HTTP fetch engine shared by the scrapers.
+
+    - one requests.Session (connection pool sized to `concurrency`)
+    - per-host token bucket (`rate` requests/sec) and concurrency cap
+    - retries 429/5xx with exponential back-off, honoring Retry-After
+
+    Blocking I/O runs in a thread pool so the event loop only schedules work.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        concurrency: int = 4,
+        max_retries: int = 4,
+        timeout: float = 15.0,
+        headers: dict | None = None,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+    ):
+        self.rate = rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=concurrency,
+                              pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._slots_loop = None
+
+        self.requests_sent = 0
+        self.retries = 0
+        self.fetch_times: list[float] = []  # per fetch, retries included
+
+    def _host_state(self, url: str) -> tuple[TokenBucket, asyncio.Semaphore]:
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = {}
+            self._slots_loop = loop
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate)
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.concurrency)
+        return self._buckets[host], self._slots[host]
+
+    def _get(self, url: str, headers: dict | None) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    async def fetch(self, url: str, headers: dict | None = None) -> FetchResult:
+        """
+        GET `url`, retrying throttled/failed responses. Returns the final
+        response whatever its status; raises only on exhausted network errors.
+        """
+        bucket, slot = self._host_state(url)
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await bucket.acquire()
+            try:
+                async with slot:
+                    self.requests_sent += 1
+                    resp = await loop.run_in_executor(
+                        self._executor, self._get, url, headers)
+            except requests.RequestException:
+                if attempt > self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if resp.status_code in RETRY_STATUSES and attempt <= self.max_retries:
+                self.retries += 1
+                delay = parse_retry_after(resp.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self._backoff(attempt)
+                delay = min(delay, self.backoff_cap)
+                bucket.throttle(delay)
+                continue
+
+            if resp.status_code < 400:
+                bucket.reward()
+
+            elapsed = time.monotonic() - started
+            self.fetch_times.append(elapsed)
+            return FetchResult(
+                url=url,
+                status=resp.status_code,
+                text=resp.text,
+                headers=dict(resp.headers),
+                attempts=attempt,
+                elapsed=elapsed,
+            )
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def fetch_all(self, urls: list[str]) -> list[FetchResult | BaseException]:
+        """
+        Fetch many URLs concurrently; results come back in input order, with
+        exceptions returned in place rather than raised.
+        """
+        tasks = [self.fetch(url) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.session.close()
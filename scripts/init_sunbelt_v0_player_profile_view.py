@@ -1,5 +1,6 @@
 from pathlib import Path
-import sqlite3
+
+from sqlite_bulk import bulk_load, execute_script
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
@@ -32,11 +33,8 @@ WHERE t.conference = 'Sun Belt'
 
 
 def main() -> None:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.executescript(DDL)
-    conn.commit()
-    conn.close()
+    with bulk_load(DB_PATH, analyze=False) as conn:
+        execute_script(conn, DDL)
     print(f"Created view sun_belt_player_profile_2024_25 on {DB_PATH}")
 
 
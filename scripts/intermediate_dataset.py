@@ -0,0 +1,262 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from cli_args import build_conference_season_parser
+from conferences import CONFERENCES
+from parse_manifest import ParseManifest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_INTERMEDIATE = PROJECT_ROOT / "ncaa-analytics" / "data_intermediate"
+DATASET_ROOT = DATA_INTERMEDIATE / "parquet"
+
+PART_NAME = "part-0.parquet"
+
+
+# ---------------------------------------------------------
+# Schemas
+#
+# Parsed tables are stored hive-partitioned, one Parquet file per
+# conference-season, rows sorted by team:
+#
+#   parquet/<kind>/conference_key=<key>/season_end_year=<year>/part-0.parquet
+#
+# conference_key / season_end_year live in the directory names only; readers
+# get them back as ordinary columns. A team is ~15 rows, too small for a file
+# of its own (the Parquet footer alone is bigger than the team's CSV), so
+# team_slug is the leading sort column inside the season file instead.
+# ---------------------------------------------------------
+
+PARTITION_SCHEMA = pa.schema([
+    ("conference_key", pa.string()),
+    ("season_end_year", pa.int16()),
+])
+
+_COUNT = pa.int16()
+_STAT = pa.float64()
+
+PER_GAME_SCHEMA = pa.schema(
+    [("team_slug", pa.string()), ("Rk", _COUNT), ("Player", pa.string()),
+     ("Pos", pa.string()), ("G", _COUNT), ("GS", _COUNT)]
+    + [(col, _STAT) for col in (
+        "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%", "2P", "2PA", "2P%",
+        "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST", "STL", "BLK",
+        "TOV", "PF", "PTS")]
+    + [("Awards", pa.string())]
+)
+
+ROSTER_SCHEMA = pa.schema([
+    ("team_slug", pa.string()),
+    ("player", pa.string()),
+    ("class_year", pa.string()),
+    ("pos", pa.string()),
+    ("height_raw", pa.string()),
+    ("weight_lbs", pa.int16()),
+    ("height_cm", pa.int16()),
+    ("weight_kg", pa.int16()),
+])
+
+SCHEMAS: dict[str, pa.Schema] = {
+    "per_game": PER_GAME_SCHEMA,
+    "roster": ROSTER_SCHEMA,
+}
+
+
+# ---------------------------------------------------------
+# Layout
+# ---------------------------------------------------------
+
+def season_dir(kind: str, conference_key: str, season_end_year: int,
+               root: Path = DATASET_ROOT) -> Path:
+    return (root / kind / f"conference_key={conference_key}"
+            / f"season_end_year={season_end_year}")
+
+
+def season_file(kind: str, conference_key: str, season_end_year: int,
+                root: Path = DATASET_ROOT) -> Path:
+    return season_dir(kind, conference_key, season_end_year, root) / PART_NAME
+
+
+def season_manifest(kind: str, conference_key: str, season_end_year: int,
+                    parser_version: str, root: Path = DATASET_ROOT) -> ParseManifest:
+    """
+    Parse manifest for one conference-season partition, kept next to its
+    Parquet file (the leading underscore keeps it out of dataset scans).
+    """
+    return ParseManifest(
+        season_dir(kind, conference_key, season_end_year, root), kind,
+        parser_version, season_file(kind, conference_key, season_end_year, root))
+
+
+def team_slug_of(stem: str) -> str:
+    """'troy_2025' -> 'troy'"""
+    return stem.rsplit("_", 1)[0]
+
+
+# ---------------------------------------------------------
+# Write
+# ---------------------------------------------------------
+
+def _coerce(values: pd.Series, type_: pa.DataType) -> pd.Series:
+    if pa.types.is_string(type_):
+        text = values.astype("string")
+        return text.where(text != "")
+    numbers = pd.to_numeric(values, errors="coerce")
+    if pa.types.is_integer(type_):
+        return numbers.where(numbers % 1 == 0).astype("Int64")
+    return numbers.astype("float64")
+
+
+def to_arrow(df: pd.DataFrame, kind: str) -> pa.Table:
+    """
+    Cast a parsed team table to the kind's schema. Schema columns missing from
+    the frame become all-null; columns the schema does not know are kept as
+    strings, after the schema columns. Partition columns are dropped.
+    """
+    schema = SCHEMAS[kind]
+    extra = [c for c in df.columns
+             if c not in schema.names and c not in PARTITION_SCHEMA.names]
+    full = pa.schema(list(schema) + [pa.field(c, pa.string()) for c in extra])
+
+    arrays = []
+    for field in full:
+        if field.name in df.columns:
+            values = _coerce(df[field.name], field.type)
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+        else:
+            arrays.append(pa.nulls(len(df), type=field.type))
+    return pa.Table.from_arrays(arrays, schema=full)
+
+
+def update_season(kind: str, conference_key: str, season_end_year: int,
+                  updates: dict[str, pd.DataFrame | None], teams: set[str],
+                  root: Path = DATASET_ROOT) -> int:
+    """
+    Rewrite a conference-season partition: rows of teams in `updates` are
+    replaced by the new frame (None drops the team), rows of teams not in
+    `teams` (pages that no longer exist) are dropped, everything else is kept
+    as is. Written atomically; returns the partition's row count.
+    """
+    path = season_file(kind, conference_key, season_end_year, root)
+    parts = []
+    if path.exists():
+        existing = pq.read_table(path)
+        keep = pa.array(sorted(teams - updates.keys()), type=pa.string())
+        parts.append(existing.filter(pc.is_in(existing["team_slug"], keep)))
+    parts += [to_arrow(df, kind) for df in updates.values() if df is not None]
+
+    table = pa.concat_tables(parts, promote_options="default") if parts \
+        else SCHEMAS[kind].empty_table()
+    # Arrow's sort is stable: rows keep their table order within a team
+    table = table.sort_by("team_slug")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+# ---------------------------------------------------------
+# Read: the "combined" table is a view over the partitions
+# ---------------------------------------------------------
+
+def part_files(kind: str, conference_key: str | None = None,
+               season_end_year: int | None = None,
+               root: Path = DATASET_ROOT) -> list[Path]:
+    conf_glob = f"conference_key={conference_key or '*'}"
+    season_glob = f"season_end_year={season_end_year or '*'}"
+    return sorted((root / kind).glob(f"{conf_glob}/{season_glob}/{PART_NAME}"))
+
+
+def open_dataset(kind: str, conference_key: str | None = None,
+                 season_end_year: int | None = None,
+                 root: Path = DATASET_ROOT) -> ds.Dataset | None:
+    """
+    Dataset over the matching partitions (None when there are none). Seasons
+    can differ in their extra columns, so the schema is unified from every
+    file footer.
+    """
+    files = part_files(kind, conference_key, season_end_year, root)
+    if not files:
+        return None
+    schema = pa.unify_schemas(
+        [pq.read_schema(f) for f in files] + [PARTITION_SCHEMA])
+    return ds.dataset(
+        [str(f) for f in files],
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        partition_base_dir=str(root / kind),
+    )
+
+
+def read_dataset(kind: str, conference_key: str | None = None,
+                 season_end_year: int | None = None,
+                 columns: list[str] | None = None,
+                 teams: list[str] | None = None,
+                 root: Path = DATASET_ROOT) -> pd.DataFrame:
+    """
+    Read one kind of parsed table for a conference / season / teams (None =
+    all) as a single DataFrame. Only the partition columns, team_slug and
+    `columns` are read; requested columns the dataset does not have are
+    skipped, since per-game tables vary by season.
+    """
+    key_cols = PARTITION_SCHEMA.names + ["team_slug"]
+    dataset = open_dataset(kind, conference_key, season_end_year, root)
+    if dataset is None:
+        return pd.DataFrame(columns=key_cols + (columns or []))
+
+    names = [c for c in dataset.schema.names if c not in key_cols]
+    if columns is not None:
+        names = [c for c in columns if c in names]
+    team_filter = None if teams is None else ds.field("team_slug").isin(teams)
+    return dataset.to_table(columns=key_cols + names,
+                            filter=team_filter).to_pandas()
+
+
+def remove_legacy_csvs(legacy_dir: Path, kind: str) -> int:
+    """
+    Delete the per-team / combined CSVs and CSV parse manifest that the
+    parsers used to write for `kind` in `legacy_dir`. Returns files removed.
+    """
+    if not legacy_dir.is_dir():
+        return 0
+    stale = [*legacy_dir.glob(f"*_{kind}.csv"),
+             *legacy_dir.glob(f"*_{kind}_all_teams.csv"),
+             *legacy_dir.glob(f"_parse_manifest_{kind}.json")]
+    for path in stale:
+        path.unlink()
+    if not any(legacy_dir.iterdir()):
+        legacy_dir.rmdir()
+    return len(stale)
+
+
+# ---------------------------------------------------------
+# Main: export the combined view as CSV on demand
+# ---------------------------------------------------------
+
+def main() -> None:
+    parser = build_conference_season_parser(
+        "Export a conference-season's parsed tables from the Parquet dataset as one CSV."
+    )
+    parser.add_argument("--kind", choices=sorted(SCHEMAS), default="per_game")
+    parser.add_argument("--out", type=Path,
+                        help="Output CSV (default: <key>_<season>_<kind>_all_teams.csv "
+                             "in the current directory).")
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+
+    df = read_dataset(args.kind, conf.key, args.season)
+    out = args.out or Path(f"{conf.key}_{args.season}_{args.kind}_all_teams.csv")
+    df.to_csv(out, index=False)
+    print(f"Wrote {out} ({len(df)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from cli_args import add_load_args, build_batch_parser, resolve_batch_args
+from conferences import ConferenceConfig
+from load_conference_season_sqlite import DB_PATH, KEEP_INDEXES, LOAD_TABLES, \
+    prepare_conference_season, write_conference_season
+from rollups import refresh_after_load
+from schema_migrations import migrate
+from sqlite_bulk import RowCounts, bulk_load
+
+
+@dataclass(frozen=True)
+class LoadJob:
+    conf: ConferenceConfig
+    season_end_year: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.conf.key}/{self.season_end_year}"
+
+
+@dataclass
+class LoadStats:
+    loaded: int = 0
+    # (conference_key, season_end_year) of the seasons that changed
+    written: list[tuple[str, int]] = field(default_factory=list)
+    stat_rows: RowCounts = field(default_factory=RowCounts)
+    roster_rows: RowCounts = field(default_factory=RowCounts)
+    skipped: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+def prepare_job(job: LoadJob):
+    """
+    Worker side: read + normalise one conference-season. Returns
+    ((stats_df, roster_df), seconds).
+    """
+    started = time.perf_counter()
+    frames = prepare_conference_season(job.conf, job.season_end_year)
+    return frames, time.perf_counter() - started
+
+
+def prepared(jobs: list[LoadJob], workers: int, queue_size: int):
+    """
+    Yield (job, future) in job order. With workers > 1 the jobs are prepared
+    in a process pool, but at most `queue_size` prepared-or-in-progress
+    seasons are held at a time, so a slow writer doesn't let finished frames
+    pile up in memory. Job order is kept so player ids come out the same as
+    a serial run.
+    """
+    if workers <= 1:
+        for job in jobs:
+            future = Future()
+            try:
+                future.set_result(prepare_job(job))
+            except Exception as exc:
+                future.set_exception(exc)
+            yield job, future
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[tuple[LoadJob, Future]] = deque()
+        todo = iter(jobs)
+        for job in todo:
+            pending.append((job, pool.submit(prepare_job, job)))
+            if len(pending) >= queue_size:
+                break
+        while pending:
+            yield pending.popleft()
+            job = next(todo, None)
+            if job is not None:
+                pending.append((job, pool.submit(prepare_job, job)))
+
+
+def run_loads(conn, jobs: list[LoadJob], workers: int, queue_size: int,
+              delta: bool = False, delete_missing: bool = False) -> LoadStats:
+    """
+    Single writer: take prepared seasons off the queue and write them
+    through `conn`, one at a time.
+    """
+    stats = LoadStats()
+    total = len(jobs)
+
+    for n, (job, future) in enumerate(prepared(jobs, workers, queue_size), 1):
+        try:
+            (stats_df, roster_df), read_s = future.result()
+        except FileNotFoundError as exc:
+            stats.skipped.append(job.key)
+            print(f"[{n}/{total}] {job.key}: skipped -> {exc}")
+            continue
+        except Exception as exc:
+            stats.failed.append(job.key)
+            print(f"[{n}/{total}] {job.key}: ERROR -> {exc}")
+            continue
+
+        started = time.perf_counter()
+        stat_counts, roster_counts = write_conference_season(
+            conn, job.conf, job.season_end_year, stats_df, roster_df,
+            delta=delta, delete_missing=delete_missing)
+        write_s = time.perf_counter() - started
+
+        stats.loaded += 1
+        if stat_counts.written or roster_counts.written:
+            stats.written.append((job.conf.key, job.season_end_year))
+        stats.stat_rows += stat_counts
+        stats.roster_rows += roster_counts
+        print(f"[{n}/{total}] {job.key}: stats {stat_counts}; roster "
+              f"{roster_counts} (read {read_s:.2f}s, write {write_s:.2f}s)")
+
+    return stats
+
+
+def main() -> None:
+    parser = build_batch_parser(
+        "Load many conference-seasons from the intermediate dataset into "
+        "SQLite: worker processes read and normalise, one writer inserts."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Reader processes (default: one per CPU; 1 = serial).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="Max conference-seasons read ahead of the writer (default: 2 x workers).",
+    )
+    add_load_args(parser)
+    args = parser.parse_args()
+    if args.delete_missing and not args.delta:
+        parser.error("--delete-missing needs --delta")
+    confs, seasons = resolve_batch_args(args)
+
+    jobs = [LoadJob(conf, season) for season in seasons for conf in confs]
+    workers = max(1, min(args.workers, len(jobs)))
+    queue_size = max(1, args.queue_size or 2 * workers)
+
+    print(f"Conferences: {', '.join(c.key for c in confs)}")
+    print(f"Seasons: {', '.join(str(s) for s in seasons)}")
+    print(f"Database: {DB_PATH}")
+    print(f"Jobs: {len(jobs)} conference-seasons, {workers} workers, "
+          f"read-ahead {queue_size}\n")
+
+    # One bulk_load session for the whole batch: indexes are rebuilt, foreign
+    # keys checked and tables analyzed once, and a failed write rolls back
+    # every season rather than leaving a half-loaded batch.
+    started = time.perf_counter()
+    # (A delta load keeps the indexes: it only touches changed rows.)
+    with bulk_load(DB_PATH, LOAD_TABLES, defer_indexes=not args.delta,
+                   keep_indexes=KEEP_INDEXES) as conn:
+        migrate(conn)
+        stats = run_loads(conn, jobs, workers, queue_size,
+                          delta=args.delta, delete_missing=args.delete_missing)
+    elapsed = time.perf_counter() - started
+
+    n_rows = stats.stat_rows.rows + stats.roster_rows.rows
+    print(f"\nLoaded {stats.loaded} conference-seasons into {DB_PATH}")
+    print(f"  player_season_stats: {stats.stat_rows}")
+    print(f"  player_roster_attrs: {stats.roster_rows}")
+    print(f"{n_rows} rows in {elapsed:.2f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    if stats.skipped:
+        print(f"Skipped (no parsed data): {', '.join(stats.skipped)}")
+    if stats.failed:
+        print("Failed (nothing written for these):")
+        for key in stats.failed:
+            print(f"  - {key}")
+
+    refresh_after_load(DB_PATH, stats.written)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
-import sqlite3
+import json
+import time
 from pathlib import Path
 
 import pandas as pd
 
-from cli_args import parse_conference_season
+from cli_args import add_load_args, build_conference_season_parser
+from conferences import CONFERENCES
+from intermediate_dataset import read_dataset, season_dir
+from rollups import refresh_after_load
+from schema_migrations import migrate
+from sqlite_bulk import RowCounts, bulk_load, insert_chunked, stage_rows, upsert_delta
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
+LOAD_TABLES = ["conferences", "teams", "players", "player_identity",
+               "player_season_stats", "player_roster_attrs"]
+# Looked up by name for every new player-season, so kept during bulk loads
+KEEP_INDEXES = ["idx_players_name"]
+
+# A player-season record as listed in the source
+RECORD_KEY = ["player_name", "team_slug", "season_end_year"]
+
 
 def upsert_conference(conn, conf):
     conn.execute(
@@ -18,64 +32,188 @@ def upsert_conference(conn, conf):
 
 def get_or_create_player_ids(conn, names: list[str]) -> dict[str, int]:
     """
-    Return mapping {player_name -> player_id}.
-    Very simple: uniqueness by name only for now.
+    Return mapping {player_name -> player_id}: the name's first player,
+    created if there is none. Names are not unique (player_identity.py can
+    split one into several players); get_or_create_season_player_ids is the
+    record-level lookup the loaders use.
+
+    Set-based: the distinct names are staged in a temp table (one statement,
+    via json_each), missing ones are inserted with one INSERT ... SELECT and
+    the whole map is read back with one join. Missing names are inserted in
+    first-seen order, so they get the same ids as a name-at-a-time loop.
     """
+    distinct = list(dict.fromkeys(names))
     cur = conn.cursor()
-    ids: dict[str, int] = {}
-
-    for name in names:
-        if name in ids:
-            continue
-        cur.execute(
-            "SELECT player_id FROM players WHERE player_name = ?", (name,))
-        row = cur.fetchone()
-        if row:
-            ids[name] = row[0]
-        else:
-            cur.execute(
-                "INSERT INTO players (player_name) VALUES (?)", (name,))
-            ids[name] = cur.lastrowid
+    # Keyed by name, so both statements below walk players' name index in
+    # order instead of jumping around it.
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS load_player_names (
+            player_name TEXT PRIMARY KEY,
+            seq         INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute("DELETE FROM load_player_names")
+    cur.execute(
+        "INSERT INTO load_player_names (player_name, seq) "
+        "SELECT value, key FROM json_each(?) ORDER BY value",
+        (json.dumps(distinct),),
+    )
 
+    cur.execute(
+        """
+        INSERT INTO players (player_name)
+        SELECT n.player_name
+        FROM load_player_names n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM players p WHERE p.player_name = n.player_name)
+        ORDER BY n.seq
+        """
+    )
+    ids = dict(cur.execute(
+        """
+        SELECT n.player_name, MIN(p.player_id)
+        FROM load_player_names n
+        JOIN players p ON p.player_name = n.player_name
+        GROUP BY n.player_name
+        """
+    ))
+    cur.execute("DELETE FROM load_player_names")
     return ids
 
 
-def load_stats_and_rosters(conf, season_end_year: int):
-    season_label = f"{season_end_year - 1}-{season_end_year}"
-
-    interm_dir = (
-        PROJECT_ROOT
-        / "ncaa-analytics"
-        / "data_intermediate"
-        / conf.data_subdir
-        / season_label
+def get_or_create_season_player_ids(conn, records: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attach player_id to distinct RECORD_KEY rows. Records already in
+    player_identity keep the player they were resolved to; new ones get
+    their name's player (get_or_create_player_ids, names in sorted order)
+    and are added to player_identity, for player_identity.py to revisit.
+    """
+    records = records[RECORD_KEY].drop_duplicates()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS load_player_records (
+            player_name      TEXT NOT NULL,
+            team_slug        TEXT NOT NULL,
+            season_end_year  INTEGER NOT NULL,
+            PRIMARY KEY (player_name, team_slug, season_end_year)
+        ) WITHOUT ROWID
+        """
     )
+    cur.execute("DELETE FROM load_player_records")
+    insert_chunked(conn, "INSERT INTO load_player_records VALUES (?, ?, ?)",
+                   records, RECORD_KEY)
+    known = pd.DataFrame(
+        cur.execute(
+            """
+            SELECT r.player_name, r.team_slug, r.season_end_year, i.player_id
+            FROM load_player_records r
+            JOIN player_identity i USING (player_name, team_slug, season_end_year)
+            """
+        ).fetchall(),
+        columns=RECORD_KEY + ["player_id"],
+    ).astype({"season_end_year": records["season_end_year"].dtype,
+              "player_id": "int64"})
+    cur.execute("DELETE FROM load_player_records")
+
+    new = records.merge(known[RECORD_KEY], how="left", on=RECORD_KEY,
+                        indicator=True)
+    new = new[new["_merge"] == "left_only"].drop(columns="_merge")
+    if not new.empty:
+        name_to_id = get_or_create_player_ids(
+            conn, sorted(new["player_name"].unique()))
+        new["player_id"] = new["player_name"].map(name_to_id)
+        insert_chunked(
+            conn,
+            "INSERT INTO player_identity "
+            "(player_name, team_slug, season_end_year, player_id) "
+            "VALUES (?, ?, ?, ?)",
+            new, RECORD_KEY + ["player_id"])
+
+    return pd.concat([known, new], ignore_index=True)
+
+
+def write_identity_evidence(conn, stats_df: pd.DataFrame,
+                            roster_df: pd.DataFrame) -> None:
+    """
+    Record, on each player_identity record of the load, what its listed name
+    has: a season-stats row, a roster row, and the roster height and class
+    year. player_identity.py resolves from this, never from the rows of the
+    player a record currently points to.
+    """
+    stats_keys = stats_df[RECORD_KEY].drop_duplicates()
+    roster = roster_df.drop_duplicates(RECORD_KEY)[
+        RECORD_KEY + ["height_cm", "class_year"]]
+    evidence = (stats_keys.assign(listed_in_stats=1)
+                .merge(roster.assign(listed_in_roster=1), on=RECORD_KEY, how="outer")
+                .fillna({"listed_in_stats": 0, "listed_in_roster": 0}))
+    columns = RECORD_KEY + ["listed_in_stats", "listed_in_roster", "height_cm",
+                            "class_year"]
+    staging = stage_rows(conn, "player_identity", RECORD_KEY, evidence, columns)
+    conn.execute(
+        f"""
+        UPDATE player_identity SET
+            listed_in_stats = s.listed_in_stats,
+            listed_in_roster = s.listed_in_roster,
+            height_cm = s.height_cm,
+            class_year = s.class_year
+        FROM temp."{staging}" s
+        WHERE player_identity.player_name = s.player_name
+          AND player_identity.team_slug = s.team_slug
+          AND player_identity.season_end_year = s.season_end_year
+        """
+    )
+    conn.execute(f'DROP TABLE temp."{staging}"')
+
+
+def drop_collisions(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    Rows of two listed names that now point to one player in a team-season
+    would be written to one key, the last silently winning (and reported as
+    an update by every later --delta load). Report them and keep the first.
+    """
+    colliding = df.duplicated(SEASON_KEY, keep=False)
+    if not colliding.any():
+        return df
+    for (player_id, team_slug, season), group in df[colliding].groupby(SEASON_KEY):
+        names = ", ".join(repr(name) for name in group["player_name"])
+        print(f"  !! {table}: {names} ({team_slug} {season}) all map to player "
+              f"{int(player_id)}; only the first row is written. Run player_identity.py "
+              f"to split them, then reload.")
+    return df[~df.duplicated(SEASON_KEY, keep="first")]
 
-    stats_csv = interm_dir / \
-        f"{conf.key}_{season_end_year}_per_game_all_teams.csv"
-    roster_csv = interm_dir / \
-        f"{conf.key}_{season_end_year}_roster_all_teams.csv"
 
-    if not stats_csv.exists():
-        raise FileNotFoundError(f"Missing stats CSV: {stats_csv}")
-    if not roster_csv.exists():
-        raise FileNotFoundError(f"Missing roster CSV: {roster_csv}")
+# Only these columns are read from the Parquet dataset; per-game tables
+# call rebounds either TRB or REB depending on the season.
+STATS_COLUMNS = ["Player", "G", "MP", "PTS", "TRB", "REB", "AST"]
+ROSTER_COLUMNS = ["player", "class_year", "pos", "height_cm", "weight_kg"]
 
-    stats_df = pd.read_csv(stats_csv)
-    roster_df = pd.read_csv(roster_csv)
+# Columns written per row, after player_id
+STATS_FIELDS = ["team_slug", "conference_key", "season_end_year",
+                "g", "mp", "pts", "reb", "ast"]
+ROSTER_FIELDS = ["team_slug", "conference_key", "season_end_year",
+                 "class_year", "pos", "height_cm", "weight_kg"]
+
+
+def load_stats_and_rosters(conf, season_end_year: int):
+    stats_df = read_dataset("per_game", conf.key, season_end_year, STATS_COLUMNS)
+    roster_df = read_dataset("roster", conf.key, season_end_year, ROSTER_COLUMNS)
+
+    if stats_df.empty:
+        raise FileNotFoundError(
+            f"No per-game data for {conf.key} {season_end_year} in "
+            f"{season_dir('per_game', conf.key, season_end_year)}")
+    if roster_df.empty:
+        raise FileNotFoundError(
+            f"No roster data for {conf.key} {season_end_year} in "
+            f"{season_dir('roster', conf.key, season_end_year)}")
 
     # Normalise column names
     stats_df.columns = [c.lower() for c in stats_df.columns]
     roster_df.columns = [c.lower() for c in roster_df.columns]
 
-    # Ensure required metadata exists
-    # stats parser added: team_slug, season_end_year
-    if "team_slug" not in stats_df.columns or "season_end_year" not in stats_df.columns:
-        raise ValueError("Stats CSV missing team_slug or season_end_year.")
-
-    if "team_slug" not in roster_df.columns or "season_end_year" not in roster_df.columns:
-        raise ValueError("Roster CSV missing team_slug or season_end_year.")
-
     # Align on player name key
     # stats: "player", roster: "player"
     stats_df["player_name"] = stats_df["player"].astype(str).str.strip()
@@ -84,90 +222,146 @@ def load_stats_and_rosters(conf, season_end_year: int):
     return stats_df, roster_df
 
 
-def main():
-    conf, season_end_year = parse_conference_season()
+def rebounds(stats_df: pd.DataFrame) -> pd.Series:
+    """
+    Total rebounds: TRB, falling back to REB where TRB is missing. A real
+    zero stays zero (the old `trb or reb` turned 0 into REB and let NaN
+    through).
+    """
+    trb = stats_df["trb"] if "trb" in stats_df.columns else None
+    reb = stats_df["reb"] if "reb" in stats_df.columns else None
+    if trb is None and reb is None:
+        return pd.Series(float("nan"), index=stats_df.index)
+    if trb is None:
+        return reb
+    return trb if reb is None else trb.fillna(reb)
+
+
+def prepare_conference_season(conf, season_end_year: int):
+    """
+    Read and normalise one conference-season for loading: returns
+    (stats_df, roster_df) with conference_key / reb filled in, cut down to
+    the columns write_conference_season needs. Pure pandas, no database, so
+    it can run in a worker process.
+    """
     stats_df, roster_df = load_stats_and_rosters(conf, season_end_year)
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
-
-    with conn:
-        upsert_conference(conn, conf)
-
-        # teams
-        team_slugs = sorted(stats_df["team_slug"].unique())
-        for slug in team_slugs:
-            conn.execute(
-                "INSERT OR IGNORE INTO teams (team_slug, conference_key, school_name) VALUES (?, ?, NULL)",
-                (slug, conf.key),
-            )
-
-        # players
-        all_names = sorted(set(stats_df["player_name"]) | set(
-            roster_df["player_name"]))
-        name_to_id = get_or_create_player_ids(conn, all_names)
-
-        # player_season_stats
-        stats_rows = []
-        for _, row in stats_df.iterrows():
-            pid = name_to_id[row["player_name"]]
-            stats_rows.append(
-                (
-                    pid,
-                    row["team_slug"],
-                    conf.key,
-                    int(row["season_end_year"]),
-                    row.get("g"),
-                    row.get("mp"),
-                    row.get("pts"),
-                    row.get("trb") or row.get("reb"),
-                    row.get("ast"),
-                )
-            )
-
-        conn.executemany(
-            """
-            INSERT OR REPLACE INTO player_season_stats
-            (player_id, team_slug, conference_key, season_end_year,
-             g, mp, pts, reb, ast)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            stats_rows,
-        )
-
-        # player_roster_attrs
-        roster_rows = []
-        for _, row in roster_df.iterrows():
-            name = row["player_name"]
-            pid = name_to_id.get(name)
-            if pid is None:
-                continue
-            roster_rows.append(
-                (
-                    pid,
-                    row["team_slug"],
-                    conf.key,
-                    int(row["season_end_year"]),
-                    row.get("class_year"),
-                    row.get("pos"),
-                    row.get("height_cm"),
-                    row.get("weight_kg"),
-                )
-            )
-
-        conn.executemany(
-            """
-            INSERT OR REPLACE INTO player_roster_attrs
-            (player_id, team_slug, conference_key, season_end_year,
-             class_year, pos, height_cm, weight_kg)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            roster_rows,
-        )
-
-    conn.close()
-    print(
-        f"Loaded {len(stats_rows)} season stat rows and {len(roster_rows)} roster rows into {DB_PATH}")
+    stats_df["conference_key"] = conf.key
+    stats_df["reb"] = rebounds(stats_df)
+    roster_df["conference_key"] = conf.key
+
+    stats_df = stats_df.reindex(columns=["player_name"] + STATS_FIELDS)
+    roster_df = roster_df.reindex(columns=["player_name"] + ROSTER_FIELDS)
+    return stats_df, roster_df
+
+
+STATS_SQL = """
+INSERT OR REPLACE INTO player_season_stats
+(player_id, team_slug, conference_key, season_end_year,
+ g, mp, pts, reb, ast)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ROSTER_SQL = """
+INSERT OR REPLACE INTO player_roster_attrs
+(player_id, team_slug, conference_key, season_end_year,
+ class_year, pos, height_cm, weight_kg)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Primary key of both player-season tables
+SEASON_KEY = ["player_id", "team_slug", "season_end_year"]
+
+
+def write_season_table(conn, table: str, replace_sql: str, df: pd.DataFrame,
+                       columns: list[str], scope: dict[str, object],
+                       delta: bool, delete_missing: bool) -> RowCounts:
+    if not delta:
+        return RowCounts(replaced=insert_chunked(conn, replace_sql, df, columns))
+    return upsert_delta(conn, table, SEASON_KEY, df, columns,
+                        delete_scope=scope if delete_missing else None)
+
+
+def write_conference_season(conn, conf, season_end_year: int,
+                            stats_df: pd.DataFrame, roster_df: pd.DataFrame,
+                            delta: bool = False,
+                            delete_missing: bool = False) -> tuple[RowCounts, RowCounts]:
+    """
+    Write one prepared conference-season (see prepare_conference_season)
+    through `conn`, inside the caller's bulk_load session. Returns the
+    (player_season_stats, player_roster_attrs) RowCounts.
+
+    By default every row is written with INSERT OR REPLACE. With `delta`,
+    only new or changed rows are written (sqlite_bulk.upsert_delta), and with
+    `delete_missing` too, rows of this conference-season that are no longer
+    in the data are deleted.
+    """
+    upsert_conference(conn, conf)
+
+    # teams
+    team_slugs = sorted(stats_df["team_slug"].unique())
+    conn.executemany(
+        "INSERT OR IGNORE INTO teams (team_slug, conference_key, school_name) VALUES (?, ?, NULL)",
+        [(slug, conf.key) for slug in team_slugs],
+    )
+
+    # players
+    ids = get_or_create_season_player_ids(
+        conn, pd.concat([stats_df[RECORD_KEY], roster_df[RECORD_KEY]]))
+    write_identity_evidence(conn, stats_df, roster_df)
+
+    scope = {"conference_key": conf.key, "season_end_year": season_end_year}
+
+    # player_season_stats
+    stats_df = drop_collisions(
+        stats_df.merge(ids, on=RECORD_KEY, how="left", validate="many_to_one"),
+        "player_season_stats")
+    stats_counts = write_season_table(
+        conn, "player_season_stats", STATS_SQL, stats_df,
+        ["player_id"] + STATS_FIELDS, scope, delta, delete_missing)
+
+    # player_roster_attrs
+    roster_df = drop_collisions(
+        roster_df.merge(ids, on=RECORD_KEY, how="inner", validate="many_to_one"),
+        "player_roster_attrs")
+    roster_counts = write_season_table(
+        conn, "player_roster_attrs", ROSTER_SQL, roster_df,
+        ["player_id"] + ROSTER_FIELDS, scope, delta, delete_missing)
+    return stats_counts, roster_counts
+
+
+def main():
+    parser = build_conference_season_parser(
+        "Load one conference-season from the intermediate dataset into SQLite."
+    )
+    add_load_args(parser)
+    args = parser.parse_args()
+    if args.delete_missing and not args.delta:
+        parser.error("--delete-missing needs --delta")
+    conf = CONFERENCES[args.conference]
+    season_end_year = args.season
+    stats_df, roster_df = prepare_conference_season(conf, season_end_year)
+
+    started = time.perf_counter()
+    # A delta load touches few rows; dropping and rebuilding every secondary
+    # index around it would cost more than it saves.
+    with bulk_load(DB_PATH, LOAD_TABLES, defer_indexes=not args.delta,
+                   keep_indexes=KEEP_INDEXES) as conn:
+        migrate(conn)
+        stats_counts, roster_counts = write_conference_season(
+            conn, conf, season_end_year, stats_df, roster_df,
+            delta=args.delta, delete_missing=args.delete_missing)
+    elapsed = time.perf_counter() - started
+
+    n_rows = stats_counts.rows + roster_counts.rows
+    print(f"player_season_stats: {stats_counts}")
+    print(f"player_roster_attrs: {roster_counts}")
+    print(f"Loaded {stats_counts.rows} season stat rows and "
+          f"{roster_counts.rows} roster rows into {DB_PATH}")
+    print(f"{n_rows} rows in {elapsed:.2f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    if stats_counts.written or roster_counts.written:
+        refresh_after_load(DB_PATH, [(conf.key, season_end_year)])
 
 
 if __name__ == "__main__":
@@ -1,25 +1,26 @@
 from pathlib import Path
-import sqlite3
 
 import pandas as pd
 
+from intermediate_dataset import read_dataset, season_dir
+from sqlite_bulk import bulk_load, insert_chunked
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
-CSV_PATH = (
-    PROJECT_ROOT
-    / "ncaa-analytics"
-    / "data_intermediate"
-    / "sun_belt"
-    / "2024-25"
-    / "sun_belt_2024_25_per_game_all_teams.csv"
-)
+CONFERENCE_KEY = "sun-belt"
+SEASON_END_YEAR = 2025
 
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 TABLE_NAME = "player_per_game_sun_belt_2024_25"
 
 
-def load_csv() -> pd.DataFrame:
-    df = pd.read_csv(CSV_PATH)
+def load_per_game() -> pd.DataFrame:
+    df = read_dataset("per_game", CONFERENCE_KEY, SEASON_END_YEAR)
+    if df.empty:
+        raise FileNotFoundError(
+            f"No per-game data for {CONFERENCE_KEY} {SEASON_END_YEAR} in "
+            f"{season_dir('per_game', CONFERENCE_KEY, SEASON_END_YEAR)}")
+    df = df.drop(columns=["conference_key"])
 
     # Normalize column names for SQL (no %, spaces, etc.)
     rename_map = {
@@ -53,7 +54,7 @@ def load_csv() -> pd.DataFrame:
         "PTS": "pts",
         "Awards": "awards",
         "team_slug": "team_slug",
-        "season": "season",
+        "season_end_year": "season",
     }
 
     df = df.rename(columns=rename_map)
@@ -67,31 +68,29 @@ def load_csv() -> pd.DataFrame:
 
 
 def write_to_sqlite(df: pd.DataFrame) -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        # Replace table each time for now
-        df.to_sql(TABLE_NAME, conn, if_exists="replace", index=False)
+    # One transaction: replace the table, bulk insert, then index
+    with bulk_load(DB_PATH, [TABLE_NAME], defer_indexes=False) as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+        conn.execute(pd.io.sql.get_schema(df, TABLE_NAME))
+        marks = ", ".join("?" * len(df.columns))
+        insert_chunked(conn, f"INSERT INTO {TABLE_NAME} VALUES ({marks})",
+                       df, list(df.columns))
 
         # Simple index to speed up lookups
-        with conn:
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_team_season "
-                f"ON {TABLE_NAME} (team_slug, season)"
-            )
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_player "
-                f"ON {TABLE_NAME} (player)"
-            )
-
-    finally:
-        conn.close()
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_team_season "
+            f"ON {TABLE_NAME} (team_slug, season)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_player "
+            f"ON {TABLE_NAME} (player)"
+        )
 
 
 def main():
-    print(f"Loading CSV from: {CSV_PATH}")
-    df = load_csv()
+    print(f"Loading per-game data from: "
+          f"{season_dir('per_game', CONFERENCE_KEY, SEASON_END_YEAR)}")
+    df = load_per_game()
     print(f"Loaded {len(df)} rows")
 
     print(f"Writing to SQLite DB: {DB_PATH} (table={TABLE_NAME})")
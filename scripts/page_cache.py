@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from http_fetcher import AsyncFetcher
+from raw_store import RawStore
+
+
+# Men's D1 seasons wrap up with the tournament in early April; after this
+# month of the end year a season's pages are treated as final.
+SEASON_FROZEN_AFTER_MONTH = 5
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    sha256: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: str | None = None
+    validated_at: str | None = None
+
+
+@dataclass
+class CacheStats:
+    hit: int = 0           # served from disk, no request sent
+    revalidated: int = 0   # conditional GET answered 304
+    fetched: int = 0       # full page transfer
+    errors: int = 0
+    failed: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.hit} hit, {self.revalidated} revalidated, "
+            f"{self.fetched} fetched, {self.errors} errors"
+        )
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def meta_path(html_path: Path) -> Path:
+    """troy_2025.html -> troy_2025.meta.json (stored next to the raw HTML)."""
+    return html_path.with_suffix(".meta.json")
+
+
+def load_entry(html_path: Path) -> CacheEntry | None:
+    path = meta_path(html_path)
+    if not path.exists():
+        return None
+    try:
+        return CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+    except (ValueError, TypeError):
+        return None
+
+
+def save_entry(html_path: Path, entry: CacheEntry) -> None:
+    write_atomic(meta_path(html_path), json.dumps(asdict(entry), indent=2))
+
+
+def write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def is_frozen_season(season_end_year: int, today: date | None = None) -> bool:
+    today = today or date.today()
+    return today >= date(season_end_year, SEASON_FROZEN_AFTER_MONTH, 1)
+
+
+def cached_body_is_intact(html_path: Path, entry: CacheEntry, store: RawStore) -> bool:
+    if store.has(entry.sha256):
+        return True
+    # Legacy layout: plain HTML written before the compressed store existed.
+    if not html_path.exists():
+        return False
+    return sha256_text(html_path.read_text(encoding="utf-8")) == entry.sha256
+
+
+def page_available(html_path: Path, store: RawStore) -> bool:
+    entry = load_entry(html_path)
+    if entry is not None and store.has(entry.sha256):
+        return True
+    return html_path.exists()
+
+
+def conditional_headers(entry: CacheEntry) -> dict:
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+async def fetch_cached(
+    fetcher: AsyncFetcher,
+    url: str,
+    html_path: Path,
+    season_end_year: int,
+    policy: str = "auto",
+    store: RawStore | None = None,
+) -> str:
+    """
+    Bring the page for `html_path` up to date with `url` and return what it
+    cost: "hit", "revalidated" or "fetched". Bodies go to the compressed raw
+    store; `html_path` only names the page and its sidecar.
+
+    - auto:       frozen past seasons with an intact cached copy are hits;
+                  everything else is a conditional GET
+    - revalidate: always send a conditional GET when a cached copy exists
+    - refetch:    ignore the cache and download again
+    """
+    store = store or RawStore()
+    entry = load_entry(html_path)
+    if entry is not None and not cached_body_is_intact(html_path, entry, store):
+        entry = None
+
+    if entry is not None and policy == "auto" and is_frozen_season(season_end_year):
+        return "hit"
+
+    headers = conditional_headers(entry) if entry and policy != "refetch" else None
+    result = await fetcher.fetch(url, headers=headers)
+
+    if result.status == 304 and entry is not None:
+        entry.etag = result.headers.get("ETag", entry.etag)
+        entry.last_modified = result.headers.get(
+            "Last-Modified", entry.last_modified)
+        entry.validated_at = _now()
+        save_entry(html_path, entry)
+        return "revalidated"
+
+    if result.status != 200:
+        raise RuntimeError(f"HTTP {result.status} for {url}")
+
+    digest = store.put(result.text)
+
+    now = _now()
+    save_entry(
+        html_path,
+        CacheEntry(
+            url=url,
+            sha256=digest,
+            etag=result.headers.get("ETag"),
+            last_modified=result.headers.get("Last-Modified"),
+            fetched_at=now,
+            validated_at=now,
+        ),
+    )
+    return "fetched"
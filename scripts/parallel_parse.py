@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterator
+
+from raw_store import RawPage
+
+
+def _call_safely(fn: Callable, args: tuple, page: RawPage):
+    """
+    Run fn(page, *args) and return (result, error message). Errors travel
+    back as strings so any exception survives the trip out of a worker.
+    """
+    try:
+        return fn(page, *args), None
+    except Exception as e:
+        return None, str(e)
+
+
+def map_pages(
+    fn: Callable,
+    pages: list[RawPage],
+    workers: int = 1,
+    *args,
+) -> Iterator[tuple[RawPage, object, str | None]]:
+    """
+    Yield (page, fn(page, *args), error) for every page, in input order, so
+    output is identical whether pages are parsed serially (workers <= 1) or
+    in a process pool. `fn` must be a module-level function.
+    """
+    call = partial(_call_safely, fn, args)
+
+    if workers <= 1 or len(pages) <= 1:
+        for page in pages:
+            yield (page, *call(page))
+        return
+
+    workers = min(workers, len(pages))
+    chunksize = max(1, len(pages) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for page, (result, error) in zip(pages, pool.map(call, pages, chunksize=chunksize)):
+            yield page, result, error
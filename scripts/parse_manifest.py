@@ -0,0 +1,97 @@
+import hashlib
+import json
+from pathlib import Path
+
+from page_cache import write_atomic
+from raw_store import RawPage
+
+
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseManifest:
+    """
+    Record of which raw pages a parser has already turned into rows of
+    `output_file` (one conference-season partition of the Parquet dataset),
+    stored as <out_dir>/_parse_manifest_<kind>.json:
+
+    {
+      "parser_version": "2",
+      "pages": {
+        "troy_2025": {"sha256": "...", "mtime_ns": ..., "size": ...,
+                      "status": "ok"},
+        "xyz_2025":  {"sha256": "...", "status": "empty",
+                      "reason": "No per-game player table found ..."}
+      }
+    }
+
+    A page is re-parsed when it is new, its content hash changed, the output
+    file is missing, or the parser version changed. Store pages carry their hash
+    already; plain .html files are only re-hashed when mtime/size moved.
+    """
+
+    def __init__(self, out_dir: Path, kind: str, parser_version: str,
+                 output_file: Path):
+        self.out_dir = out_dir
+        self.output_file = output_file
+        self.kind = kind
+        self.parser_version = parser_version
+        self.path = out_dir / f"_parse_manifest_{kind}.json"
+        self.pages: dict[str, dict] = {}
+        self._fingerprints: dict[str, dict] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            # A different parser version invalidates every cached output
+            if data.get("parser_version") == parser_version:
+                self.pages = data.get("pages", {})
+
+    def fingerprint(self, page: RawPage) -> dict:
+        if page.compressed:
+            return {"sha256": page.sha256}
+        if page.stem not in self._fingerprints:
+            st = page.path.stat()
+            prev = self.pages.get(page.stem, {})
+            if prev.get("mtime_ns") == st.st_mtime_ns and prev.get("size") == st.st_size:
+                sha256 = prev["sha256"]
+            else:
+                sha256 = hash_file(page.path)
+            self._fingerprints[page.stem] = {
+                "sha256": sha256, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        return self._fingerprints[page.stem]
+
+    def needs_parse(self, page: RawPage) -> bool:
+        prev = self.pages.get(page.stem)
+        if prev is None or prev["sha256"] != self.fingerprint(page)["sha256"]:
+            return True
+        return prev["status"] == "ok" and not self.output_file.exists()
+
+    def record_ok(self, page: RawPage) -> None:
+        self.pages[page.stem] = {**self.fingerprint(page), "status": "ok"}
+
+    def record_empty(self, page: RawPage, reason: str) -> None:
+        self.pages[page.stem] = {**self.fingerprint(page), "status": "empty",
+                                 "reason": reason}
+
+    def forget_missing(self, pages: list[RawPage]) -> list[str]:
+        """Drop entries for pages no longer in the raw dir."""
+        present = {p.stem for p in pages}
+        gone = [stem for stem in self.pages if stem not in present]
+        for stem in gone:
+            del self.pages[stem]
+        return gone
+
+    def ok_stems(self) -> list[str]:
+        return [stem for stem in sorted(self.pages)
+                if self.pages[stem]["status"] == "ok"]
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(
+            {"parser_version": self.parser_version, "pages": self.pages},
+            indent=1, sort_keys=True))
+
@@ -0,0 +1,157 @@
+from pathlib import Path
+
+import pandas as pd
+
+from cli_args import add_parse_args, build_conference_season_parser
+from conferences import CONFERENCES
+from parallel_parse import map_pages
+from intermediate_dataset import DATA_INTERMEDIATE, remove_legacy_csvs, season_file, \
+    season_manifest, team_slug_of, update_season
+from parse_sportsref_conference_rosters import PARSER_VERSION as ROSTER_PARSER_VERSION
+from parse_sportsref_conference_rosters import clean_roster_table
+from parse_sportsref_conference_stats import PARSER_VERSION as PER_GAME_PARSER_VERSION
+from parse_sportsref_conference_stats import clean_per_game_table
+from raw_store import RawPage, iter_pages
+from team_page import extract_team_tables
+
+
+def parse_team_page(page: RawPage, season_end_year: int) -> dict:
+    """
+    Worker-safe single pass over one page. Returns
+    {"per_game": df | None, "per_game_reason": why it is None,
+     "roster": df | None, "roster_error": why it is None}.
+    """
+    tables = extract_team_tables(page, ["per_game", "roster"])
+    out = {"per_game": None, "per_game_reason": None,
+           "roster": None, "roster_error": None}
+
+    if tables["per_game"] is None:
+        out["per_game_reason"] = f"No per-game player table found in {page.name}"
+    else:
+        out["per_game"] = clean_per_game_table(
+            tables["per_game"], page.stem, season_end_year)
+
+    try:
+        if tables["roster"] is None:
+            raise ValueError(f"No roster table found in {page.name}")
+        out["roster"] = clean_roster_table(tables["roster"], page.stem)
+    except Exception as e:
+        out["roster_error"] = str(e)
+
+    return out
+
+
+def main() -> None:
+    """
+    Parse every team page for a conference-season once and write both the
+    per-game and roster outputs (same partitions as the two single-table parsers).
+    """
+    parser = build_conference_season_parser(
+        "Parse per-game and roster tables from a conference-season's team pages in one pass."
+    )
+    add_parse_args(parser)
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+    season_end_year: int = args.season
+
+    project_root = Path(__file__).resolve().parents[1]
+    season_label = f"{season_end_year - 1}-{season_end_year}"
+
+    raw_dir = (
+        project_root
+        / "ncaa-analytics"
+        / "data_raw"
+        / conf.data_subdir
+        / season_label
+    )
+
+    print(f"Conference: {conf.name} ({conf.key})")
+    print(f"Season end year: {season_end_year}")
+    print(f"Reading pages from: {raw_dir}\n")
+
+    # Same manifests as the single-table parsers, so the scripts can be
+    # mixed freely; a page is parsed if either output is stale.
+    manifests = {
+        "per_game": season_manifest(
+            "per_game", conf.key, season_end_year, PER_GAME_PARSER_VERSION),
+        "roster": season_manifest(
+            "roster", conf.key, season_end_year, ROSTER_PARSER_VERSION),
+    }
+    pages = iter_pages(raw_dir, f"*_{season_end_year}")
+    gone = {kind: m.forget_missing(pages) for kind, m in manifests.items()}
+    if args.force:
+        todo = pages
+    else:
+        todo = [p for p in pages
+                if any(m.needs_parse(p) for m in manifests.values())]
+    print(f"Pages: {len(pages)} total, {len(todo)} new/changed, "
+          f"{len(set().union(*gone.values()))} removed\n")
+
+    errors: list[tuple[str, str]] = []
+    updates: dict[str, dict[str, pd.DataFrame | None]] = {
+        kind: {} for kind in manifests}
+
+    for page, result, error in map_pages(
+            parse_team_page, todo, args.workers, season_end_year):
+        print(f"Parsing {page.name} ...")
+        team_slug = team_slug_of(page.stem)
+        if error is not None:
+            # Failures are recorded like empty tables, so a page is retried
+            # only once it (or a parser) changes
+            errors.append((page.name, error))
+            print(f"  !! ERROR on {page.name}: {error}")
+            for kind, manifest in manifests.items():
+                updates[kind][team_slug] = None
+                manifest.record_empty(page, error)
+            continue
+
+        per_game = manifests["per_game"]
+        updates["per_game"][team_slug] = result["per_game"]
+        if result["per_game"] is None:
+            print(f"  {result['per_game_reason']}")
+            per_game.record_empty(page, result["per_game_reason"])
+        else:
+            df = result["per_game"]
+            per_game.record_ok(page)
+            print(f"  -> per-game: {len(df)} rows")
+
+        roster = manifests["roster"]
+        if result["roster"] is None:
+            errors.append((page.name, result["roster_error"]))
+            print(f"  !! ERROR on {page.name}: {result['roster_error']}")
+            updates["roster"][team_slug] = None
+            roster.record_empty(page, result["roster_error"])
+        else:
+            df = result["roster"]
+            updates["roster"][team_slug] = df
+            roster.record_ok(page)
+            print(f"  -> roster:   {len(df)} rows")
+
+    legacy_dir = DATA_INTERMEDIATE / conf.data_subdir / season_label
+    page_teams = {team_slug_of(p.stem) for p in pages}
+    print()
+    for kind, manifest in manifests.items():
+        if args.remove_legacy_csv:
+            removed = remove_legacy_csvs(legacy_dir, kind)
+            if removed:
+                print(f"Removed {removed} old {kind} CSV files from {legacy_dir}")
+        out_file = season_file(kind, conf.key, season_end_year)
+        teams = manifest.ok_stems()
+        if not teams:
+            print(f"No {kind} tables parsed for any team.")
+        elif updates[kind] or gone[kind] or not out_file.exists():
+            n_rows = update_season(kind, conf.key, season_end_year,
+                                   updates[kind], page_teams)
+            print(f"Wrote {kind} partition: {len(teams)} teams, {n_rows} rows")
+        else:
+            print(f"No changes; {kind} partition is up to date.")
+        manifest.save()
+
+    if errors:
+        print(f"\n{len(errors)} errors:")
+        for name, msg in errors:
+            print(f"  - {name}: {msg}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 
-from cli_args import parse_conference_season
+from cli_args import add_parse_args, build_conference_season_parser
+from conferences import CONFERENCES
+from parallel_parse import map_pages
+from intermediate_dataset import DATA_INTERMEDIATE, remove_legacy_csvs, season_file, \
+    season_manifest, team_slug_of, update_season
+from raw_store import RawPage, as_page, iter_pages
+from team_page import extract_team_tables
+
+# Bump when the roster output format changes; invalidates the parse manifest.
+PARSER_VERSION = "3"
 
 
 # ---------------------------------------------------------
@@ -29,26 +40,101 @@ def parse_weight_to_kg(wt):
     return round(lbs * 0.45359237)
 
 
-def find_roster_table(html_path: Path) -> pd.DataFrame:
+# ---------------------------------------------------------
+# Vectorized conversions (column-at-a-time versions of the helpers above)
+# ---------------------------------------------------------
+
+CLASS_YEAR_CODES = {
+    "FR": "FR", "FRESHMAN": "FR",
+    "SO": "SO", "SOPHOMORE": "SO",
+    "JR": "JR", "JUNIOR": "JR",
+    "SR": "SR", "SENIOR": "SR",
+    "GR": "GR", "GRAD": "GR", "GRADUATE": "GR", "5TH": "GR",
+}
+
+POSITION_CODES = {
+    "GUARD": "G", "FORWARD": "F", "CENTER": "C",
+}
+
+
+def _per_unique(values: pd.Series, convert, dtype: str) -> pd.Series:
     """
-    Find roster table: needs 'Player' and ('Class' or 'Pos')
+    Apply a vectorized `convert` to the distinct values of a column only and
+    broadcast back: roster columns repeat a few dozen values ("6-5", "FR").
+    """
+    codes, uniques = pd.factorize(values)
+    converted = convert(pd.Series(uniques)).astype(dtype).array
+    # code -1 (missing input) becomes <NA>
+    return pd.Series(converted.take(codes, allow_fill=True),
+                     index=values.index, dtype=dtype)
+
+
+def _heights_to_cm(heights: pd.Series) -> pd.Series:
+    parts = heights.astype("string").str.strip().str.extract(r"^(\d+)-(\d+)$")
+    inches = parts[0].astype("float64") * 12 + parts[1].astype("float64")
+    # np.round rounds half to even, exactly like the scalar round()
+    return np.round(inches * 2.54)
+
+
+def _weights_to_kg(weights: pd.Series) -> pd.Series:
+    if is_numeric_dtype(weights):
+        lbs = weights.astype("float64")
+        lbs = lbs.where(lbs % 1 == 0)
+    else:
+        text = weights.astype("string").str.strip()
+        lbs = text.where(text.str.fullmatch(r"[+-]?\d+")).astype("float64")
+    return np.round(lbs * 0.45359237)
+
+
+def heights_to_cm(heights: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_height_to_cm: "6-5" -> 196, anything else -> <NA> (Int64).
+    """
+    return _per_unique(heights, _heights_to_cm, "Int64")
+
+
+def weights_to_kg(weights: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_weight_to_kg: "205" -> 93, anything else -> <NA> (Int64).
+    Numeric columns (read_html types weights as float when one is missing)
+    are converted directly where the value is a whole number of pounds.
     """
-    tables = pd.read_html(html_path, flavor="bs4")
+    return _per_unique(weights, _weights_to_kg, "Int64")
+
 
-    for tbl in tables:
-        cols = [str(c).strip().lower() for c in tbl.columns]
-        if "player" in cols and ("class" in cols or "pos" in cols):
-            return tbl
+def normalize_codes(values: pd.Series, codes: dict[str, str]) -> pd.Series:
+    """
+    Upper-case, drop dots/whitespace and map long forms to codes
+    ("Fr." -> "FR", "Senior" -> "SR"); unknown values stay upper-cased.
+    Blank -> <NA> (string dtype).
+    """
+    def convert(uniques: pd.Series) -> pd.Series:
+        text = uniques.astype("string").str.strip().str.upper().str.replace(
+            r"[.\s]", "", regex=True)
+        text = text.where(text != "")
+        return text.map(codes, na_action="ignore").fillna(text)
 
-    raise ValueError(f"No roster table found in {html_path.name}")
+    return _per_unique(values, convert, "string")
 
 
-def parse_roster_file(html_path: Path) -> pd.DataFrame:
-    stem = html_path.stem           # example: "troy_2025"
+def find_roster_table(page: RawPage | Path) -> pd.DataFrame:
+    """
+    Find roster table: needs 'Player' and ('Class' or 'Pos')
+    """
+    page = as_page(page)
+    tbl = extract_team_tables(page, ["roster"])["roster"]
+    if tbl is None:
+        raise ValueError(f"No roster table found in {page.name}")
+    return tbl
+
+
+def clean_roster_table(table: pd.DataFrame, stem: str) -> pd.DataFrame:
+    """
+    Normalize a raw roster table for the team-season `stem` (e.g. "troy_2025").
+    """
     team_slug, season_str = stem.rsplit("_", 1)
     season = int(season_str)
-
-    df = find_roster_table(html_path)
+    df = table
 
     # Rename columns
     rename_map = {}
@@ -68,7 +154,7 @@ def parse_roster_file(html_path: Path) -> pd.DataFrame:
     df = df.rename(columns=rename_map)
 
     if "player" not in df.columns:
-        raise ValueError(f"'Player' column missing in {html_path.name}")
+        raise ValueError(f"'Player' column missing in {stem}.html")
 
     keep_cols = ["player"]
     for col in ("class_year", "pos", "height_raw", "weight_lbs"):
@@ -85,20 +171,37 @@ def parse_roster_file(html_path: Path) -> pd.DataFrame:
     df["player"] = df["player"].astype(str).str.strip()
     df = df[df["player"] != ""]
 
-    df["height_cm"] = df.get("height_raw", pd.Series(
-        [None] * len(df))).apply(parse_height_to_cm)
-    df["weight_kg"] = df.get("weight_lbs", pd.Series(
-        [None] * len(df))).apply(parse_weight_to_kg)
+    if "class_year" in df.columns:
+        df["class_year"] = normalize_codes(df["class_year"], CLASS_YEAR_CODES)
+    if "pos" in df.columns:
+        df["pos"] = normalize_codes(df["pos"], POSITION_CODES)
+
+    missing = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    df["height_cm"] = heights_to_cm(
+        df["height_raw"]) if "height_raw" in df.columns else missing
+    df["weight_kg"] = weights_to_kg(
+        df["weight_lbs"]) if "weight_lbs" in df.columns else missing
 
     return df
 
 
+def parse_roster_file(page: RawPage | Path) -> pd.DataFrame:
+    page = as_page(page)
+    return clean_roster_table(find_roster_table(page), page.stem)
+
+
 # ---------------------------------------------------------
 # Main
 # ---------------------------------------------------------
 
 def main():
-    conf, season_end_year = parse_conference_season()
+    parser = build_conference_season_parser(
+        "Parse roster tables from a conference-season's team pages."
+    )
+    add_parse_args(parser)
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+    season_end_year: int = args.season
 
     project_root = Path(__file__).resolve().parents[1]
     season_label = f"{season_end_year - 1}-{season_end_year}"
@@ -111,46 +214,61 @@ def main():
         season_label
     )
 
-    out_dir = (
-        project_root /
-        "ncaa-analytics" /
-        "data_intermediate" /
-        conf.data_subdir /
-        season_label
-    )
-    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = season_file("roster", conf.key, season_end_year)
 
     print(f"Conference: {conf.name} ({conf.key})")
     print(f"Season end year: {season_end_year}")
     print(f"Reading from: {raw_dir}")
-    print(f"Writing to:   {out_dir}\n")
-
-    all_rows = []
-
-    for html_path in sorted(raw_dir.glob(f"*_{season_end_year}.html")):
-        print(f"Parsing roster from {html_path.name} ...")
-        try:
-            df_team = parse_roster_file(html_path)
-            print(f"  -> parsed {len(df_team)} rows")
-            all_rows.append(df_team)
-
-            out_csv = out_dir / f"{html_path.stem}_roster.csv"
-            df_team.to_csv(out_csv, index=False)
-
-        except Exception as e:
-            print(f"  !! ERROR on {html_path.name}: {e}")
-
-    if not all_rows:
+    print(f"Writing to:   {out_file}\n")
+
+    # Only new/changed pages (by content hash + parser version) are parsed;
+    # the rows of every other team are carried over from the season file.
+    manifest = season_manifest("roster", conf.key, season_end_year, PARSER_VERSION)
+    pages = iter_pages(raw_dir, f"*_{season_end_year}")
+    gone = manifest.forget_missing(pages)
+    todo = pages if args.force else [p for p in pages if manifest.needs_parse(p)]
+    print(f"Pages: {len(pages)} total, {len(todo)} new/changed, "
+          f"{len(gone)} removed\n")
+
+    # Workers parse; writing stays here, in page order, so --workers N
+    # produces exactly the serial output.
+    updates: dict[str, pd.DataFrame | None] = {}
+    for page, df_team, error in map_pages(parse_roster_file, todo, args.workers):
+        print(f"Parsing roster from {page.name} ...")
+        if error is not None:
+            # Recorded, so the page is retried only once it (or the parser)
+            # changes; the team's rows from an older version of it go
+            print(f"  !! ERROR on {page.name}: {error}")
+            updates[team_slug_of(page.stem)] = None
+            manifest.record_empty(page, error)
+            continue
+
+        print(f"  -> parsed {len(df_team)} rows")
+
+        updates[team_slug_of(page.stem)] = df_team
+        manifest.record_ok(page)
+
+    legacy_dir = DATA_INTERMEDIATE / conf.data_subdir / season_label
+    removed = remove_legacy_csvs(legacy_dir, "roster") if args.remove_legacy_csv else 0
+    if removed:
+        print(f"Removed {removed} old roster CSV files from {legacy_dir}")
+
+    teams = manifest.ok_stems()
+    if not teams:
+        manifest.save()
         print("No roster data parsed.")
         return
 
-    final_df = pd.concat(all_rows, ignore_index=True)
-    combined_csv = out_dir / \
-        f"{conf.key}_{season_end_year}_roster_all_teams.csv"
-    final_df.to_csv(combined_csv, index=False)
+    if not (updates or gone or not out_file.exists()):
+        manifest.save()
+        print(f"\nNo changes; {out_file.name} is up to date.")
+        return
+
+    n_rows = update_season("roster", conf.key, season_end_year, updates,
+                           {team_slug_of(p.stem) for p in pages})
+    manifest.save()
 
-    print(
-        f"\nWrote combined roster CSV: {combined_csv} ({len(final_df)} rows)")
+    print(f"\nWrote roster partition: {out_file} ({len(teams)} teams, {n_rows} rows)")
 
 
 if __name__ == "__main__":
@@ -2,36 +2,26 @@ from pathlib import Path
 
 import pandas as pd
 
-from cli_args import parse_conference_season
+from cli_args import add_parse_args, build_conference_season_parser
+from conferences import CONFERENCES
+from parallel_parse import map_pages
+from intermediate_dataset import DATA_INTERMEDIATE, remove_legacy_csvs, season_file, \
+    season_manifest, team_slug_of, update_season
+from raw_store import RawPage, as_page, iter_pages
+from team_page import extract_team_tables
 
+# Bump when the per-game output format changes; invalidates the parse manifest.
+PARSER_VERSION = "2"
 
-def extract_team_per_game(html_path: Path, season_end_year: int) -> pd.DataFrame | None:
+
+def clean_per_game_table(
+    table: pd.DataFrame, stem: str, season_end_year: int
+) -> pd.DataFrame:
     """
-    Given a Sports-Reference team HTML file, return the per-game player stats table
-    as a DataFrame, or None if not found.
+    Tidy a raw per-game table: string column names, no totals rows, and
+    team_slug / season_end_year metadata in front.
     """
-    print(f"Parsing {html_path.name} ...")
-
-    try:
-        # read_html will pull all tables on the page into a list of DataFrames
-        tables = pd.read_html(html_path, flavor="bs4")
-    except ValueError:
-        print(f"  No tables found in {html_path.name}")
-        return None
-
-    candidate = None
-    for df in tables:
-        cols = [str(c) for c in df.columns]
-        # Heuristic: per-game table has 'Player' and 'G' columns
-        if "Player" in cols and "G" in cols:
-            candidate = df
-            break
-
-    if candidate is None:
-        print(f"  No per-game player table found in {html_path.name}")
-        return None
-
-    df = candidate.copy()
+    df = table.copy()
 
     # Normalize column names to strings
     df.columns = [str(c) for c in df.columns]
@@ -43,16 +33,53 @@ def extract_team_per_game(html_path: Path, season_end_year: int) -> pd.DataFrame
         df = df[~df["Player"].isin(bad_labels)]
 
     # Add team + season metadata
-    team_slug = html_path.stem.replace(f"_{season_end_year}", "")
+    team_slug = stem.replace(f"_{season_end_year}", "")
     df.insert(0, "team_slug", team_slug)
     df.insert(1, "season_end_year", season_end_year)
 
     return df
 
 
+def parse_per_game_page(
+    page: RawPage, season_end_year: int
+) -> tuple[pd.DataFrame | None, str | None]:
+    """
+    Worker-safe (no printing) per-game parse: returns (table, None), or
+    (None, reason) when the page has no per-game table.
+    """
+    try:
+        table = extract_team_tables(page, ["per_game"])["per_game"]
+    except ValueError:
+        return None, f"No tables found in {page.name}"
+
+    if table is None:
+        return None, f"No per-game player table found in {page.name}"
+
+    return clean_per_game_table(table, page.stem, season_end_year), None
+
+
+def extract_team_per_game(page: RawPage | Path, season_end_year: int) -> pd.DataFrame | None:
+    """
+    Given a Sports-Reference team page (raw store object or HTML file), return
+    the per-game player stats table as a DataFrame, or None if not found.
+    """
+    page = as_page(page)
+    print(f"Parsing {page.name} ...")
+
+    df, reason = parse_per_game_page(page, season_end_year)
+    if reason:
+        print(f"  {reason}")
+    return df
+
+
 def main() -> None:
-    # Use shared CLI: returns (ConferenceConfig, season_end_year)
-    conf, season_end_year = parse_conference_season()
+    parser = build_conference_season_parser(
+        "Parse per-game player stats from a conference-season's team pages."
+    )
+    add_parse_args(parser)
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+    season_end_year: int = args.season
 
     project_root = Path(__file__).resolve().parents[1]
 
@@ -67,42 +94,70 @@ def main() -> None:
         / season_label
     )
 
-    out_dir = (
-        project_root
-        / "ncaa-analytics"
-        / "data_intermediate"
-        / conf.data_subdir
-        / season_label
-    )
-    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = season_file("per_game", conf.key, season_end_year)
 
     print(f"Conference: {conf.name} ({conf.key})")
     print(f"Season end year: {season_end_year}")
-    print(f"Reading HTML from: {raw_dir}")
-    print(f"Writing CSVs to:   {out_dir}\n")
-
-    all_dfs: list[pd.DataFrame] = []
+    print(f"Reading pages from: {raw_dir}")
+    print(f"Writing Parquet to: {out_file}\n")
+
+    # Only new/changed pages (by content hash + parser version) are parsed;
+    # the rows of every other team are carried over from the season file.
+    manifest = season_manifest("per_game", conf.key, season_end_year, PARSER_VERSION)
+    pages = iter_pages(raw_dir)
+    gone = manifest.forget_missing(pages)
+    todo = pages if args.force else [p for p in pages if manifest.needs_parse(p)]
+    print(f"Pages: {len(pages)} total, {len(todo)} new/changed, "
+          f"{len(gone)} removed\n")
+
+    errors: list[tuple[str, str]] = []
+    updates: dict[str, pd.DataFrame | None] = {}
+
+    # Results come back in page order whatever --workers is, so the output
+    # matches a serial run exactly.
+    for page, result, error in map_pages(
+            parse_per_game_page, todo, args.workers, season_end_year):
+        print(f"Parsing {page.name} ...")
+        if error is not None:
+            # Recorded like an empty table, so the page is retried only once
+            # it (or the parser) changes
+            print(f"  !! ERROR on {page.name}: {error}")
+            errors.append((page.name, error))
+            updates[team_slug_of(page.stem)] = None
+            manifest.record_empty(page, error)
+            continue
 
-    for html_path in sorted(raw_dir.glob("*.html")):
-        df = extract_team_per_game(html_path, season_end_year)
+        df, reason = result
+        updates[team_slug_of(page.stem)] = df
         if df is None:
+            print(f"  {reason}")
+            manifest.record_empty(page, reason)
             continue
 
-        out_csv = out_dir / f"{html_path.stem}_per_game.csv"
-        df.to_csv(out_csv, index=False)
-        all_dfs.append(df)
-        print(f"  -> wrote {out_csv.name} ({len(df)} rows)")
-
-    if all_dfs:
-        combined = pd.concat(all_dfs, ignore_index=True)
-        combined_csv = out_dir / \
-            f"{conf.key}_{season_end_year}_per_game_all_teams.csv"
-        combined.to_csv(combined_csv, index=False)
-        print(
-            f"\nWrote combined file: {combined_csv.name} ({len(combined)} rows)"
-        )
-    else:
+        manifest.record_ok(page)
+        print(f"  -> parsed {len(df)} rows")
+
+    teams = manifest.ok_stems()
+    if not teams:
         print("No per-game tables parsed for any team.")
+    elif updates or gone or not out_file.exists():
+        n_rows = update_season(
+            "per_game", conf.key, season_end_year, updates,
+            {team_slug_of(p.stem) for p in pages})
+        print(f"\nWrote {out_file.name}: {len(teams)} teams, {n_rows} rows")
+    else:
+        print(f"\nNo changes; {out_file.name} is up to date.")
+    manifest.save()
+
+    legacy_dir = DATA_INTERMEDIATE / conf.data_subdir / season_label
+    removed = remove_legacy_csvs(legacy_dir, "per_game") if args.remove_legacy_csv else 0
+    if removed:
+        print(f"Removed {removed} old per-game CSV files from {legacy_dir}")
+
+    if errors:
+        print(f"\n{len(errors)} pages failed:")
+        for name, msg in errors:
+            print(f"  - {name}: {msg}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,467 @@
+import argparse
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from feature_store import refresh_after_rollups
+from rollups import Scope, refresh_rollups
+from schema_migrations import migrate
+from sqlite_bulk import bulk_load
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+
+# ---------------------------------------------------------
+# Player identity
+#
+# `players` used to be one row per distinct name, so two different
+# "Jalen Smith"s were one player and "Jalen Smith" / "Jalen Smith Jr." were
+# two. Identity is now kept per player-season record in `player_identity`:
+#
+#   (player_name as listed, team_slug, season_end_year) -> player_id
+#
+# Loaders look records up there and fall back to the name for records they
+# have not seen (see load_conference_season_sqlite). This module re-derives
+# the mapping for the whole database:
+#
+# 1. every record gets blocking keys from its normalised name (accents
+#    folded, suffixes stripped): the full name ("jalen smith"), and first
+#    initial + last name within its team ("j smith|troy");
+# 2. records are only compared with others sharing a key, so cost grows
+#    with block sizes rather than n^2;
+# 3. a pair is scored on name, team, season continuity, height and class
+#    year, and pairs above MATCH_SCORE are merged, best first, unless the
+#    merged player would be in two places in one season;
+# 4. each cluster keeps the player_id most of its records already have, and
+#    player_identity / the player-season tables are re-pointed.
+#
+# Two records of one team-season under one normalised name ("Jalen Smith"
+# on the stats page, "Jalen Smith Jr." on the roster) are merged only if
+# they never both have a row in the same table: "Elijah Williams II" and
+# "Elijah Williams III" both have season stats, so they stay two players.
+# What a record has rows in, and its height and class year, are stored on
+# the record (player_identity.listed_in_stats etc.), never looked up through
+# its current player_id, so a second run starts from the same evidence and
+# changes nothing.
+# ---------------------------------------------------------
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Class years in order; GR (grad) counts as a fifth year
+CLASS_RANK = {"FR": 1, "SO": 2, "JR": 3, "SR": 4, "GR": 5}
+
+# Longest gap between two seasons of one player (redshirt + COVID year)
+MAX_SEASON_GAP = 6
+# Listed heights of one player differ by more than this -> different players
+HEIGHT_TOLERANCE_CM = 5.0
+
+MATCH_SCORE = 3.0
+
+IDENTITY_TABLES = ["players", "player_identity",
+                   "player_season_stats", "player_roster_attrs"]
+
+
+@dataclass(frozen=True)
+class SeasonRecord:
+    player_name: str
+    team_slug: str
+    season_end_year: int
+    player_id: int | None = None
+    height_cm: float | None = None
+    class_year: str | None = None
+    listed_in_stats: bool = False
+    listed_in_roster: bool = False
+
+    @property
+    def tables(self) -> int:
+        """Bit mask of the player-season tables the record has a row in."""
+        return int(bool(self.listed_in_stats)) | 2 * int(bool(self.listed_in_roster))
+
+
+# ---------------------------------------------------------
+# Names and blocking keys
+# ---------------------------------------------------------
+
+_NON_ALPHA = re.compile(r"[^a-z ]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    'José Núñez Jr.' -> 'jose nunez': accents folded, lower case,
+    punctuation dropped, generational suffixes stripped.
+    """
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    words = _NON_ALPHA.sub(" ", folded.lower().replace("'", "")).split()
+    while len(words) > 1 and words[-1] in SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def blocking_keys(normalized: str, team_slug: str) -> tuple[str, str]:
+    """
+    Full normalised name, and first initial + last name within a team
+    ('jalen smith', 'j smith|troy'). A looser name only counts next to a
+    shared team: across teams, "J. Smith" would pull in every J. Smith.
+    """
+    words = normalized.split()
+    initials = f"{words[0][0]} {words[-1]}" if len(words) > 1 else normalized
+    return normalized, f"{initials}|{team_slug}"
+
+
+# ---------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------
+
+def _is_number(value) -> bool:
+    return value is not None and value == value  # NaN != NaN
+
+
+def match_score(a: SeasonRecord, b: SeasonRecord, a_name: str, b_name: str) -> float:
+    """
+    Evidence that two records (of different seasons) are one player; 0 when
+    they cannot be.
+    """
+    gap = abs(a.season_end_year - b.season_end_year)
+    if gap == 0 or gap > MAX_SEASON_GAP:
+        return 0.0
+    early, late = (a, b) if a.season_end_year < b.season_end_year else (b, a)
+
+    close_height = False
+    if _is_number(a.height_cm) and _is_number(b.height_cm):
+        diff = abs(a.height_cm - b.height_cm)
+        if diff > HEIGHT_TOLERANCE_CM:
+            return 0.0
+        close_height = diff <= HEIGHT_TOLERANCE_CM / 2
+
+    class_step = None
+    if early.class_year in CLASS_RANK and late.class_year in CLASS_RANK:
+        class_step = CLASS_RANK[late.class_year] - CLASS_RANK[early.class_year]
+        # Class years never go back, and advance at most once a season
+        if class_step < 0 or class_step > gap:
+            return 0.0
+
+    score = 2.0 if a_name == b_name else 1.0
+    if a.team_slug == b.team_slug:
+        score += 1.0
+    if gap == 1:
+        score += 1.0
+    if close_height:
+        score += 0.5
+    if class_step == gap:
+        score += 0.5
+    return score
+
+
+# ---------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------
+
+class _Clusters:
+    """
+    Union-find over records. Each root also keeps the cluster's
+    season -> (team, normalised name, tables) slots, so merges that would
+    put one player on two teams in a season, or give the player two rows
+    of one table (two stat lines), are refused.
+    """
+
+    def __init__(self, slots: list[tuple[int, str, str, int]]):
+        self.parent = list(range(len(slots)))
+        self.seasons = [{season: (team, name, tables)}
+                        for season, team, name, tables in slots]
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return True
+        small, big = sorted((i, j), key=lambda r: len(self.seasons[r]))
+        big_seasons = self.seasons[big]
+        for season, (team, name, tables) in self.seasons[small].items():
+            other = big_seasons.get(season)
+            if other is not None and (other[:2] != (team, name) or other[2] & tables):
+                return False
+        for season, (team, name, tables) in self.seasons[small].items():
+            other = big_seasons.get(season)
+            big_seasons[season] = (team, name, tables | (other[2] if other else 0))
+        self.seasons[small] = {}
+        self.parent[small] = big
+        return True
+
+
+def resolve_identities(records: list[SeasonRecord]) -> list[int]:
+    """
+    Cluster player-season records into players. Returns a cluster label per
+    record (labels are record indexes, not player ids).
+    """
+    names = [normalize_name(r.player_name) for r in records]
+
+    # Records listed twice for one team-season under one normalised name
+    # ("Jalen Smith" and "Jalen Smith Jr.") are tried first; the union is
+    # refused if both have a row in the same table.
+    first_slot: dict[tuple[int, str, str], int] = {}
+    same_slot: list[tuple[int, int]] = []
+    for i, r in enumerate(records):
+        slot = (r.season_end_year, r.team_slug, names[i])
+        j = first_slot.setdefault(slot, i)
+        if j != i:
+            same_slot.append((j, i))
+
+    # Blocks hold record indexes in season order
+    blocks: dict[str, list[int]] = defaultdict(list)
+    for i in sorted(range(len(records)), key=lambda i: records[i].season_end_year):
+        for key in blocking_keys(names[i], records[i].team_slug):
+            blocks[key].append(i)
+
+    pairs: list[tuple[float, int, int]] = []
+    for key, members in blocks.items():
+        full_name = "|" not in key
+        for x, i in enumerate(members):
+            season = records[i].season_end_year
+            for j in members[x + 1:]:
+                if records[j].season_end_year - season > MAX_SEASON_GAP:
+                    break
+                # Same-name pairs are all scored in their full-name block
+                if not full_name and names[i] == names[j]:
+                    continue
+                score = match_score(records[i], records[j], names[i], names[j])
+                if score >= MATCH_SCORE:
+                    pairs.append((-score, min(i, j), max(i, j)))
+
+    clusters = _Clusters([(r.season_end_year, r.team_slug, names[i], r.tables)
+                          for i, r in enumerate(records)])
+    for i, j in same_slot:
+        clusters.union(i, j)
+    # Strongest evidence first; ties broken by record order for stable output
+    for _, i, j in sorted(pairs):
+        clusters.union(i, j)
+
+    return [clusters.find(i) for i in range(len(records))]
+
+
+def assign_player_ids(records: list[SeasonRecord], labels: list[int]) -> list[int | None]:
+    """
+    Pick a player_id per cluster: the id most of its records already have,
+    biggest clusters choosing first; an id can only go to one cluster.
+    Clusters left without one get None (a new players row is needed).
+    """
+    members: dict[int, list[int]] = defaultdict(list)
+    for i, label in enumerate(labels):
+        members[label].append(i)
+
+    taken: set[int] = set()
+    chosen: dict[int, int | None] = {}
+    for label in sorted(members, key=lambda c: (-len(members[c]), c)):
+        votes = Counter(records[i].player_id for i in members[label]
+                        if records[i].player_id is not None)
+        ranked = sorted(votes.items(), key=lambda item: (-item[1], item[0]))
+        chosen[label] = next((pid for pid, _ in ranked if pid not in taken), None)
+        if chosen[label] is not None:
+            taken.add(chosen[label])
+    return [chosen[label] for label in labels]
+
+
+# ---------------------------------------------------------
+# Database
+# ---------------------------------------------------------
+
+def backfill_identity(conn) -> int:
+    """
+    Give every player-season row that has no player_identity record one,
+    under its player's current name and with the rows it has as evidence.
+    Returns the number added.
+    """
+    cur = conn.execute(
+        """
+        INSERT OR IGNORE INTO player_identity
+            (player_name, team_slug, season_end_year, player_id,
+             listed_in_stats, listed_in_roster, height_cm, class_year)
+        SELECT p.player_name, s.team_slug, s.season_end_year, s.player_id,
+               st.player_id IS NOT NULL, r.player_id IS NOT NULL,
+               r.height_cm, r.class_year
+        FROM (
+            SELECT player_id, team_slug, season_end_year FROM player_season_stats
+            UNION
+            SELECT player_id, team_slug, season_end_year FROM player_roster_attrs
+        ) s
+        JOIN players p ON p.player_id = s.player_id
+        LEFT JOIN player_season_stats st
+          ON st.player_id = s.player_id
+         AND st.team_slug = s.team_slug
+         AND st.season_end_year = s.season_end_year
+        LEFT JOIN player_roster_attrs r
+          ON r.player_id = s.player_id
+         AND r.team_slug = s.team_slug
+         AND r.season_end_year = s.season_end_year
+        WHERE NOT EXISTS (
+            SELECT 1 FROM player_identity i
+            WHERE i.player_id = s.player_id
+              AND i.team_slug = s.team_slug
+              AND i.season_end_year = s.season_end_year)
+        """
+    )
+    return cur.rowcount
+
+
+def read_records(conn) -> list[SeasonRecord]:
+    rows = conn.execute(
+        """
+        SELECT player_name, team_slug, season_end_year, player_id,
+               height_cm, class_year, listed_in_stats, listed_in_roster
+        FROM player_identity
+        ORDER BY season_end_year, team_slug, player_name
+        """
+    )
+    return [SeasonRecord(*row) for row in rows]
+
+
+def apply_player_ids(conn, records: list[SeasonRecord], labels: list[int],
+                     player_ids: list[int | None]) -> tuple[int, int, list[Scope]]:
+    """
+    Persist a resolution: create players for clusters without an id, then
+    re-point player_identity and the player-season tables. Returns
+    (records moved, players created, conference-seasons whose rows moved).
+    """
+    # A new player is named by the name most of its records are listed under
+    listed: dict[int, Counter] = defaultdict(Counter)
+    for r, label, pid in zip(records, labels, player_ids):
+        if pid is None:
+            listed[label][r.player_name] += 1
+    new_ids: dict[int, int] = {}
+    for label in sorted(listed):
+        name = listed[label].most_common(1)[0][0]
+        cur = conn.execute("INSERT INTO players (player_name) VALUES (?)", (name,))
+        new_ids[label] = cur.lastrowid
+    final = [pid if pid is not None else new_ids[label]
+             for label, pid in zip(labels, player_ids)]
+
+    moves = [(r.player_name, r.team_slug, r.season_end_year, r.player_id, pid)
+             for r, pid in zip(records, final) if r.player_id != pid]
+    if not moves:
+        return 0, len(new_ids), []
+
+    conn.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS identity_moves (
+            player_name      TEXT NOT NULL,
+            team_slug        TEXT NOT NULL,
+            season_end_year  INTEGER NOT NULL,
+            old_id           INTEGER,
+            new_id           INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("DELETE FROM identity_moves")
+    conn.executemany("INSERT INTO identity_moves VALUES (?, ?, ?, ?, ?)", moves)
+    conn.execute(
+        """
+        UPDATE player_identity SET player_id = m.new_id
+        FROM identity_moves m
+        WHERE player_identity.player_name = m.player_name
+          AND player_identity.team_slug = m.team_slug
+          AND player_identity.season_end_year = m.season_end_year
+        """
+    )
+
+    # A player's rows in a team-season follow its records. If those split
+    # (records an earlier run had wrongly merged), which row was whose is
+    # lost: the rows stay with one of them (the old player if it is among
+    # them), and the next load writes each record's own.
+    goes_to: dict[tuple[int, str, int], set[int]] = defaultdict(set)
+    for r, pid in zip(records, final):
+        goes_to[(r.player_id, r.team_slug, r.season_end_year)].add(pid)
+    row_moves = [(team, season, old_id, min(targets))
+                 for (old_id, team, season), targets in goes_to.items()
+                 if old_id not in targets]
+    conn.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS identity_row_moves (
+            team_slug        TEXT NOT NULL,
+            season_end_year  INTEGER NOT NULL,
+            old_id           INTEGER NOT NULL,
+            new_id           INTEGER NOT NULL,
+            PRIMARY KEY (old_id, team_slug, season_end_year)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("DELETE FROM identity_row_moves")
+    conn.executemany("INSERT INTO identity_row_moves VALUES (?, ?, ?, ?)", row_moves)
+    # Their profiles change even when the rollup fingerprints do not (ids
+    # swapping between two rows of one conference-season)
+    scopes: set[Scope] = set()
+    for table in ("player_season_stats", "player_roster_attrs"):
+        scopes.update(conn.execute(
+            f"""
+            SELECT DISTINCT t.conference_key, t.season_end_year
+            FROM identity_row_moves m
+            JOIN {table} t
+              ON t.player_id = m.old_id
+             AND t.team_slug = m.team_slug
+             AND t.season_end_year = m.season_end_year
+            """
+        ))
+        # Two steps, through negative ids, so ids that swap between rows of
+        # one team-season never collide half way. A plain UPDATE: two rows
+        # meeting on one key would mean merging two stat lines, which
+        # resolve_identities never does, so it fails rather than drop one.
+        conn.execute(
+            f"""
+            UPDATE {table} SET player_id = -m.new_id
+            FROM identity_row_moves m
+            WHERE {table}.player_id = m.old_id
+              AND {table}.team_slug = m.team_slug
+              AND {table}.season_end_year = m.season_end_year
+            """
+        )
+        conn.execute(f"UPDATE {table} SET player_id = -player_id WHERE player_id < 0")
+    conn.execute("DROP TABLE identity_moves")
+    conn.execute("DROP TABLE identity_row_moves")
+    return len(moves), len(new_ids), sorted(scopes)
+
+
+def resolve_database(conn) -> tuple[int, int, int, int, int, list[Scope]]:
+    """
+    Backfill, resolve and re-point every record inside the caller's
+    transaction. Returns (records, records added, players, records moved,
+    players created, conference-seasons whose rows moved).
+    """
+    added = backfill_identity(conn)
+    records = read_records(conn)
+    labels = resolve_identities(records)
+    player_ids = assign_player_ids(records, labels)
+    moved, created, scopes = apply_player_ids(conn, records, labels, player_ids)
+    return len(records), added, len(set(labels)), moved, created, scopes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-resolve player identities across all loaded seasons "
+                    "and re-point player ids in the database."
+    )
+    parser.parse_args()
+
+    started = time.perf_counter()
+    with bulk_load(DB_PATH, IDENTITY_TABLES, defer_indexes=False) as conn:
+        migrate(conn)
+        n_records, added, n_players, moved, created, scopes = resolve_database(conn)
+        print(f"{n_records:,} player-season records ({added:,} new) -> "
+              f"{n_players:,} players")
+        # Re-pointed ids change the profiles of the seasons they are in
+        refreshed = refresh_rollups(conn, scopes)
+    print(f"{moved:,} records re-pointed, {created:,} players created, "
+          f"{len(refreshed)} conference-season rollups refreshed "
+          f"in {time.perf_counter() - started:.2f}s")
+    refresh_after_rollups(DB_PATH, refreshed)
+
+
+if __name__ == "__main__":
+    main()
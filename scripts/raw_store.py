@@ -0,0 +1,161 @@
+import fnmatch
+import gzip
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+from cli_args import build_conference_season_parser
+from conferences import CONFERENCES
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE_ROOT = PROJECT_ROOT / "ncaa-analytics" / "data_raw" / "_objects"
+
+
+class RawStore:
+    """
+    Content-addressed, gzip-compressed store for raw team pages.
+
+    Objects live at <root>/<sha[:2]>/<sha>.html.gz, keyed by the sha256 of the
+    UTF-8 page text, so identical pages are stored once. Team-season pages
+    point at their object through the page_cache sidecar
+    (<slug>_<year>.meta.json).
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_ROOT, level: int = 6):
+        self.root = root
+        self.level = level
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}.html.gz"
+
+    def has(self, sha256: str | None) -> bool:
+        return bool(sha256) and self.object_path(sha256).exists()
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha256)
+        if path.exists():
+            return sha256
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        # mtime=0 keeps the compressed bytes reproducible
+        tmp.write_bytes(gzip.compress(data, compresslevel=self.level, mtime=0))
+        os.replace(tmp, path)
+        return sha256
+
+    def open(self, sha256: str) -> TextIO:
+        """Streaming text reader; decompresses as the caller reads."""
+        return gzip.open(self.object_path(sha256), "rt", encoding="utf-8")
+
+    def read_text(self, sha256: str) -> str:
+        with self.open(sha256) as fh:
+            return fh.read()
+
+
+@dataclass(frozen=True)
+class RawPage:
+    """
+    One team-season page, either a legacy plain .html file or a store object.
+    """
+    stem: str                  # e.g. "troy_2025"
+    path: Path                 # plain .html file, or the gzip object
+    sha256: str | None = None  # set for store objects
+
+    @property
+    def name(self) -> str:
+        return f"{self.stem}.html"
+
+    @property
+    def compressed(self) -> bool:
+        return self.sha256 is not None
+
+    def open(self) -> TextIO:
+        if self.compressed:
+            return gzip.open(self.path, "rt", encoding="utf-8")
+        return open(self.path, encoding="utf-8")
+
+
+def as_page(page: "RawPage | Path") -> RawPage:
+    if isinstance(page, RawPage):
+        return page
+    return RawPage(stem=Path(page).stem, path=Path(page))
+
+
+def iter_pages(
+    raw_dir: Path, stem_glob: str = "*", store: RawStore | None = None
+) -> list[RawPage]:
+    """
+    All pages in a conference-season raw dir, sorted by stem. Store objects
+    (found through <stem>.meta.json) win over legacy <stem>.html files.
+    """
+    # Imported here: page_cache imports RawStore from this module.
+    from page_cache import load_entry
+
+    store = store or RawStore()
+    pages: dict[str, RawPage] = {}
+
+    for meta in raw_dir.glob("*.meta.json"):
+        stem = meta.name[: -len(".meta.json")]
+        if not fnmatch.fnmatch(stem, stem_glob):
+            continue
+        entry = load_entry(raw_dir / f"{stem}.html")
+        if entry is not None and store.has(entry.sha256):
+            pages[stem] = RawPage(stem, store.object_path(entry.sha256),
+                                  entry.sha256)
+
+    for html_path in raw_dir.glob(f"{stem_glob}.html"):
+        pages.setdefault(html_path.stem, as_page(html_path))
+
+    return [pages[stem] for stem in sorted(pages)]
+
+
+def migrate_html_dir(raw_dir: Path, store: RawStore, delete_html: bool = False) -> int:
+    """
+    Move legacy <stem>.html files into the store, writing/refreshing their
+    sidecar so the page resolves to the object. Returns pages migrated.
+    """
+    from page_cache import CacheEntry, load_entry, save_entry
+
+    migrated = 0
+    for html_path in sorted(raw_dir.glob("*.html")):
+        sha256 = store.put(html_path.read_text(encoding="utf-8"))
+        entry = load_entry(html_path)
+        if entry is None:
+            entry = CacheEntry(url="", sha256=sha256)
+        elif entry.sha256 != sha256:
+            # File was edited after the fetch: validators no longer apply.
+            entry = CacheEntry(url=entry.url, sha256=sha256)
+        save_entry(html_path, entry)
+        if delete_html:
+            html_path.unlink()
+        migrated += 1
+    return migrated
+
+
+def main() -> None:
+    parser = build_conference_season_parser(
+        "Move a conference-season's plain .html pages into the compressed raw store."
+    )
+    parser.add_argument(
+        "--delete-html",
+        action="store_true",
+        help="Remove the plain .html files once they are in the store.",
+    )
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+
+    season_label = f"{args.season - 1}-{args.season}"
+    raw_dir = PROJECT_ROOT / "ncaa-analytics" / \
+        "data_raw" / conf.data_subdir / season_label
+
+    store = RawStore()
+    n = migrate_html_dir(raw_dir, store, delete_html=args.delete_html)
+    print(f"Migrated {n} pages from {raw_dir} into {store.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+from feature_store import refresh_after_rollups
+from schema_migrations import migrate
+from sqlite_bulk import bulk_load
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+ROLLUP_TABLES = ["player_season_profile", "team_season_rollup", "rollup_freshness"]
+
+Scope = tuple[str, int]  # (conference_key, season_end_year)
+
+
+# ---------------------------------------------------------
+# Materialized rollups
+#
+# player_season_profile (stats + name + roster attributes) and
+# team_season_rollup are rebuilt one conference-season at a time, so a load
+# only pays for the seasons it touched. rollup_freshness keeps, per
+# conference-season, a fingerprint of the source rows at the last refresh;
+# a conference-season whose fingerprint has moved on (or that has appeared
+# or vanished since) is stale.
+#
+# The fingerprint is cheap aggregates (row counts, id and value totals, and
+# for text columns totals of a CRC of player id + whole value), so it
+# catches added / removed rows and edited values, not every conceivable
+# edit; --all rebuilds everything.
+# ---------------------------------------------------------
+
+FINGERPRINT_SQL = {
+    "player_season_stats": """
+        SELECT conference_key, season_end_year,
+               COUNT(*), TOTAL(player_id), TOTAL(g), TOTAL(mp),
+               TOTAL(pts), TOTAL(reb), TOTAL(ast)
+        FROM player_season_stats
+        {where}
+        GROUP BY conference_key, season_end_year
+    """,
+    "player_roster_attrs": """
+        SELECT conference_key, season_end_year,
+               COUNT(*), TOTAL(player_id), TOTAL(height_cm), TOTAL(weight_kg),
+               TOTAL(text_crc(player_id || ':' || class_year)),
+               TOTAL(text_crc(player_id || ':' || pos))
+        FROM player_roster_attrs
+        {where}
+        GROUP BY conference_key, season_end_year
+    """,
+}
+
+SCOPE_WHERE = "WHERE conference_key = ? AND season_end_year = ?"
+
+PROFILE_SQL = """
+INSERT INTO player_season_profile (
+    conference_key, season_end_year, team_slug, player_id, player_name,
+    class_year, pos, height_cm, weight_kg, g, mp, pts, reb, ast)
+SELECT s.conference_key, s.season_end_year, s.team_slug, s.player_id,
+       p.player_name, r.class_year, r.pos, r.height_cm, r.weight_kg,
+       s.g, s.mp, s.pts, s.reb, s.ast
+FROM player_season_stats s
+JOIN players p
+    ON p.player_id = s.player_id
+LEFT JOIN player_roster_attrs r
+    ON r.player_id = s.player_id
+   AND r.team_slug = s.team_slug
+   AND r.season_end_year = s.season_end_year
+WHERE s.conference_key = ? AND s.season_end_year = ?
+"""
+
+# Team per-game totals: each per-game line weighted by games played, over
+# the team's games (the most any player played)
+TEAM_SQL = """
+INSERT INTO team_season_rollup (
+    conference_key, season_end_year, team_slug, players, games,
+    pts, reb, ast, avg_height_cm, avg_weight_kg)
+SELECT conference_key, season_end_year, team_slug, COUNT(*), MAX(g),
+       SUM(pts * g) / NULLIF(MAX(g), 0),
+       SUM(reb * g) / NULLIF(MAX(g), 0),
+       SUM(ast * g) / NULLIF(MAX(g), 0),
+       AVG(height_cm), AVG(weight_kg)
+FROM player_season_profile
+WHERE conference_key = ? AND season_end_year = ?
+GROUP BY conference_key, season_end_year, team_slug
+"""
+
+
+def _text_crc(value: str | None) -> int | None:
+    return None if value is None else zlib.crc32(value.encode("utf-8"))
+
+
+def source_fingerprints(conn, scope: Scope | None = None) -> dict[Scope, str]:
+    """Fingerprint of the source rows per conference-season (or of one)."""
+    conn.create_function("text_crc", 1, _text_crc, deterministic=True)
+    parts: dict[Scope, list[str]] = {}
+    for i, (table, sql) in enumerate(FINGERPRINT_SQL.items()):
+        where, params = (SCOPE_WHERE, scope) if scope else ("", ())
+        for conf, season, *values in conn.execute(sql.format(where=where), params):
+            fields = parts.setdefault((conf, season), ["-"] * len(FINGERPRINT_SQL))
+            fields[i] = ":".join(repr(v) for v in values)
+    return {key: "|".join(fields) for key, fields in parts.items()}
+
+
+def stale_scopes(conn) -> list[Scope]:
+    """Conference-seasons whose rollups no longer match their source rows."""
+    current = source_fingerprints(conn)
+    recorded = dict(((conf, season), fingerprint) for conf, season, fingerprint in
+                    conn.execute("SELECT conference_key, season_end_year, "
+                                 "source_fingerprint FROM rollup_freshness"))
+    return sorted(key for key in current.keys() | recorded.keys()
+                  if current.get(key) != recorded.get(key))
+
+
+def refresh_scope(conn, scope: Scope) -> int:
+    """
+    Rebuild the rollups of one conference-season inside the caller's
+    transaction. Returns its player_season_profile rows.
+    """
+    for table in ("player_season_profile", "team_season_rollup", "rollup_freshness"):
+        conn.execute(f"DELETE FROM {table} {SCOPE_WHERE}", scope)
+
+    n_rows = conn.execute(PROFILE_SQL, scope).rowcount
+    conn.execute(TEAM_SQL, scope)
+
+    fingerprint = source_fingerprints(conn, scope).get(scope)
+    if fingerprint is not None:
+        conn.execute(
+            "INSERT INTO rollup_freshness (conference_key, season_end_year, "
+            "source_fingerprint, profile_rows) VALUES (?, ?, ?, ?)",
+            (*scope, fingerprint, n_rows),
+        )
+    return n_rows
+
+
+def refresh_rollups(conn, scopes: Iterable[Scope]) -> dict[Scope, int]:
+    return {scope: refresh_scope(conn, scope) for scope in sorted(set(scopes))}
+
+
+def refresh_after_load(db_path: Path, scopes: Iterable[Scope]) -> None:
+    """
+    Refresh the rollups (and then the feature store) of the
+    conference-seasons a load wrote, in a session of their own: it runs
+    after the load's indexes are back, so each conference-season is an
+    index range rather than a table scan.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    started = time.perf_counter()
+    with bulk_load(db_path, ROLLUP_TABLES, defer_indexes=False) as conn:
+        rows = refresh_rollups(conn, scopes)
+    print(f"Refreshed rollups for {len(rows)} conference-seasons "
+          f"({sum(rows.values())} profile rows) in {time.perf_counter() - started:.2f}s")
+    refresh_after_rollups(db_path, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Refresh the materialized player-season profile and "
+                    "team-season rollup tables (only stale conference-seasons "
+                    "unless --all)."
+    )
+    parser.add_argument("--all", action="store_true",
+                        help="Rebuild every conference-season.")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with bulk_load(DB_PATH, ROLLUP_TABLES, defer_indexes=False) as conn:
+        migrate(conn)
+        if args.all:
+            scopes = stale_scopes(conn) + list(source_fingerprints(conn))
+        else:
+            scopes = stale_scopes(conn)
+        rows = refresh_rollups(conn, scopes)
+
+    for (conf, season), n_rows in rows.items():
+        print(f"  {conf} {season}: {n_rows} player-seasons")
+    print(f"Refreshed {len(rows)} conference-seasons in "
+          f"{time.perf_counter() - started:.2f}s")
+    refresh_after_rollups(DB_PATH, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from sqlite_bulk import bulk_load, execute_script
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+
+# ---------------------------------------------------------
+# Schema migrations
+#
+# The core schema is built by applying MIGRATIONS in version order. Applied
+# versions are recorded in schema_migrations (and the latest one in
+# PRAGMA user_version), so running migrate() again only applies what is new.
+# A migration is a function of the connection; it runs inside the caller's
+# transaction and must not commit (see sqlite_bulk.bulk_load).
+#
+# Add a migration by appending to MIGRATIONS with the next version; never
+# edit or reorder one that has shipped.
+# ---------------------------------------------------------
+
+# Which player each player-season record (name as listed, team, season)
+# belongs to; maintained by player_identity.py
+IDENTITY_DDL = """
+CREATE TABLE IF NOT EXISTS player_identity (
+    player_name      TEXT NOT NULL,
+    team_slug        TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    player_id        INTEGER NOT NULL,
+    PRIMARY KEY (player_name, team_slug, season_end_year),
+    FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_identity_player
+    ON player_identity (player_id);
+"""
+
+DDL = """
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS conferences (
+    conference_key TEXT PRIMARY KEY,
+    name          TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    team_slug      TEXT PRIMARY KEY,
+    conference_key TEXT NOT NULL,
+    school_name    TEXT,
+    FOREIGN KEY (conference_key) REFERENCES conferences(conference_key)
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    player_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    -- not unique: two players can share a name (see player_identity)
+    player_name    TEXT NOT NULL
+    -- later: birthdate, etc.
+);
+
+CREATE INDEX IF NOT EXISTS idx_players_name ON players (player_name);
+
+CREATE TABLE IF NOT EXISTS player_season_stats (
+    player_id        INTEGER NOT NULL,
+    team_slug        TEXT NOT NULL,
+    conference_key   TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    -- raw stats as TEXT/REAL (add what you need):
+    g                REAL,
+    mp               REAL,
+    pts              REAL,
+    reb              REAL,
+    ast              REAL,
+    -- etc...
+    PRIMARY KEY(player_id, team_slug, season_end_year),
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    FOREIGN KEY (team_slug) REFERENCES teams(team_slug),
+    FOREIGN KEY (conference_key) REFERENCES conferences(conference_key)
+);
+
+CREATE TABLE IF NOT EXISTS player_roster_attrs (
+    player_id        INTEGER NOT NULL,
+    team_slug        TEXT NOT NULL,
+    conference_key   TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    class_year       TEXT,
+    pos              TEXT,
+    height_cm        REAL,
+    weight_kg        REAL,
+    PRIMARY KEY(player_id, team_slug, season_end_year),
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    FOREIGN KEY (team_slug) REFERENCES teams(team_slug),
+    FOREIGN KEY (conference_key) REFERENCES conferences(conference_key)
+);
+""" + IDENTITY_DDL
+
+
+HISTORY_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version     INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    applied_at  TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Columns the core tables must have. The v0 scripts create teams / players /
+# player_season_stats with other shapes under the same names, and
+# CREATE TABLE IF NOT EXISTS would silently keep those.
+CORE_COLUMNS = {
+    "teams": {"team_slug", "conference_key"},
+    "players": {"player_id", "player_name"},
+    "player_season_stats": {"player_id", "team_slug", "conference_key",
+                            "season_end_year"},
+}
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[..., None]
+
+
+def table_columns(conn, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+
+
+def create_core_tables(conn) -> None:
+    for table, needed in CORE_COLUMNS.items():
+        columns = table_columns(conn, table)
+        if columns and not needed <= columns:
+            raise RuntimeError(
+                f"Table {table} has the v0 shape (no {', '.join(sorted(needed - columns))}); "
+                f"the core schema needs a database without the v0 tables")
+    execute_script(conn, DDL)
+
+
+def players_name_is_unique(conn) -> bool:
+    for _, index, unique, *_ in conn.execute("PRAGMA index_list(players)"):
+        columns = [row[2] for row in conn.execute(f'PRAGMA index_info("{index}")')]
+        if unique and columns == ["player_name"]:
+            return True
+    return False
+
+
+def drop_unique_player_name(conn) -> None:
+    """
+    Databases made before player_identity have UNIQUE(player_name) on
+    players, which keeps two players from sharing a name. SQLite cannot
+    drop a constraint, so the table is rebuilt (ids kept).
+    """
+    if not players_name_is_unique(conn):
+        return
+    conn.execute(
+        """
+        CREATE TABLE players_rebuilt (
+            player_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name    TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("INSERT INTO players_rebuilt (player_id, player_name) "
+                 "SELECT player_id, player_name FROM players")
+    conn.execute("DROP TABLE players")
+    # Views over players would fail the modern rename's schema check while
+    # players is gone
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    conn.execute("ALTER TABLE players_rebuilt RENAME TO players")
+    conn.execute("PRAGMA legacy_alter_table = OFF")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players (player_name)")
+
+
+# Every app query filters player_season_stats on conference + season (and
+# maybe team); with the stat columns in the index the profile query never
+# touches the table. Delta loads delete by the same scope on both tables.
+QUERY_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_pss_conf_season_team
+    ON player_season_stats (conference_key, season_end_year, team_slug,
+                            player_id, g, mp, pts, reb, ast);
+
+CREATE INDEX IF NOT EXISTS idx_pra_conf_season_team
+    ON player_roster_attrs (conference_key, season_end_year, team_slug,
+                            player_id);
+"""
+
+
+def create_query_indexes(conn) -> None:
+    execute_script(conn, QUERY_INDEXES)
+
+
+# Flat, read-optimised copies of the core tables, one conference-season at a
+# time; built and refreshed by rollups.py. Keyed by what readers filter on,
+# so a conference-season is one contiguous range.
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS player_season_profile (
+    conference_key   TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    team_slug        TEXT NOT NULL,
+    player_id        INTEGER NOT NULL,
+    player_name      TEXT NOT NULL,
+    class_year       TEXT,
+    pos              TEXT,
+    height_cm        REAL,
+    weight_kg        REAL,
+    g                REAL,
+    mp               REAL,
+    pts              REAL,
+    reb              REAL,
+    ast              REAL,
+    PRIMARY KEY (conference_key, season_end_year, team_slug, player_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS team_season_rollup (
+    conference_key   TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    team_slug        TEXT NOT NULL,
+    players          INTEGER NOT NULL,
+    games            REAL,
+    pts              REAL,   -- team per-game totals
+    reb              REAL,
+    ast              REAL,
+    avg_height_cm    REAL,
+    avg_weight_kg    REAL,
+    PRIMARY KEY (conference_key, season_end_year, team_slug)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_freshness (
+    conference_key      TEXT NOT NULL,
+    season_end_year     INTEGER NOT NULL,
+    source_fingerprint  TEXT NOT NULL,
+    profile_rows        INTEGER NOT NULL,
+    refreshed_at        TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (conference_key, season_end_year)
+) WITHOUT ROWID;
+"""
+
+
+def create_rollup_tables(conn) -> None:
+    execute_script(conn, ROLLUP_DDL)
+
+
+# Full-text index over players.player_name for the app's name search: token
+# and prefix matches (prefix indexes make short prefixes cheap), accents
+# folded by the tokenizer. External content, so the names are not stored
+# twice; the triggers keep it in step with players.
+NAME_SEARCH_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS player_name_search USING fts5 (
+    player_name,
+    content = 'players',
+    content_rowid = 'player_id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS players_name_search_insert AFTER INSERT ON players
+BEGIN
+    INSERT INTO player_name_search (rowid, player_name)
+    VALUES (new.player_id, new.player_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS players_name_search_delete AFTER DELETE ON players
+BEGIN
+    INSERT INTO player_name_search (player_name_search, rowid, player_name)
+    VALUES ('delete', old.player_id, old.player_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS players_name_search_update
+AFTER UPDATE OF player_id, player_name ON players
+BEGIN
+    INSERT INTO player_name_search (player_name_search, rowid, player_name)
+    VALUES ('delete', old.player_id, old.player_name);
+    INSERT INTO player_name_search (rowid, player_name)
+    VALUES (new.player_id, new.player_name);
+END;
+"""
+
+
+def create_name_search(conn) -> None:
+    execute_script(conn, NAME_SEARCH_DDL)
+    conn.execute("INSERT INTO player_name_search (player_name_search) VALUES ('rebuild')")
+
+
+# Each player-season's nearest player-seasons within a named pool (the
+# player-seasons compared, e.g. one conference-season or all of D1);
+# written by similarity.py
+SIMILARITY_DDL = """
+CREATE TABLE IF NOT EXISTS player_similarity (
+    pool                  TEXT NOT NULL,
+    player_id             INTEGER NOT NULL,
+    team_slug             TEXT NOT NULL,
+    season_end_year       INTEGER NOT NULL,
+    rank                  INTEGER NOT NULL,
+    comp_player_id        INTEGER NOT NULL,
+    comp_team_slug        TEXT NOT NULL,
+    comp_season_end_year  INTEGER NOT NULL,
+    distance              REAL NOT NULL,
+    PRIMARY KEY (pool, player_id, team_slug, season_end_year, rank)
+) WITHOUT ROWID;
+"""
+
+
+def create_similarity_table(conn) -> None:
+    execute_script(conn, SIMILARITY_DDL)
+
+
+# What each similarity pool was computed from, so a later run can redo only
+# what changed: the pool's parameters and z-score normalization (bumped
+# on every full rebuild), and a hash of each player-season's input values.
+SIMILARITY_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS similarity_pools (
+    pool             TEXT PRIMARY KEY,
+    features         TEXT NOT NULL,   -- JSON list
+    k                INTEGER NOT NULL,
+    conference_keys  TEXT,            -- JSON list; NULL = all
+    seasons          TEXT,            -- JSON list; NULL = all
+    norm_version     INTEGER NOT NULL,
+    means            TEXT NOT NULL,   -- JSON list, one per feature
+    stds             TEXT NOT NULL,
+    updated_at       TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS similarity_inputs (
+    pool             TEXT NOT NULL,
+    player_id        INTEGER NOT NULL,
+    team_slug        TEXT NOT NULL,
+    season_end_year  INTEGER NOT NULL,
+    input_hash       INTEGER NOT NULL,
+    PRIMARY KEY (pool, player_id, team_slug, season_end_year)
+) WITHOUT ROWID;
+"""
+
+
+def create_similarity_state(conn) -> None:
+    execute_script(conn, SIMILARITY_STATE_DDL)
+
+
+# What each player-season record itself says about its player, as listed:
+# whether its name has a season-stats row and a roster row, and its roster
+# height and class year. Loaders write it per listed name; player_identity.py
+# resolves from it, so a resolution never depends on the player ids an
+# earlier one assigned.
+IDENTITY_EVIDENCE_COLUMNS = {
+    "listed_in_stats": "INTEGER NOT NULL DEFAULT 0",
+    "listed_in_roster": "INTEGER NOT NULL DEFAULT 0",
+    "height_cm": "REAL",
+    "class_year": "TEXT",
+}
+
+
+def add_identity_evidence(conn) -> None:
+    """
+    Add the evidence columns and fill them for existing records from the
+    rows of their player. Records that already share a player in one
+    team-season cannot be told apart any more; the rows are credited to one
+    of them (the first name), so they stay one player.
+    """
+    columns = table_columns(conn, "player_identity")
+    for name, type_ in IDENTITY_EVIDENCE_COLUMNS.items():
+        if name not in columns:
+            conn.execute(f"ALTER TABLE player_identity ADD COLUMN {name} {type_}")
+    conn.execute(
+        """
+        UPDATE player_identity SET
+            listed_in_stats = EXISTS (
+                SELECT 1 FROM player_season_stats s
+                WHERE s.player_id = player_identity.player_id
+                  AND s.team_slug = player_identity.team_slug
+                  AND s.season_end_year = player_identity.season_end_year),
+            listed_in_roster = EXISTS (
+                SELECT 1 FROM player_roster_attrs r
+                WHERE r.player_id = player_identity.player_id
+                  AND r.team_slug = player_identity.team_slug
+                  AND r.season_end_year = player_identity.season_end_year),
+            (height_cm, class_year) = (
+                SELECT r.height_cm, r.class_year FROM player_roster_attrs r
+                WHERE r.player_id = player_identity.player_id
+                  AND r.team_slug = player_identity.team_slug
+                  AND r.season_end_year = player_identity.season_end_year)
+        WHERE player_name = (
+            SELECT MIN(i.player_name) FROM player_identity i
+            WHERE i.player_id = player_identity.player_id
+              AND i.team_slug = player_identity.team_slug
+              AND i.season_end_year = player_identity.season_end_year)
+        """
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "core tables", create_core_tables),
+    Migration(2, "players.player_name not unique", drop_unique_player_name),
+    Migration(3, "query indexes", create_query_indexes),
+    Migration(4, "rollup tables", create_rollup_tables),
+    Migration(5, "player name search", create_name_search),
+    Migration(6, "player similarity", create_similarity_table),
+    Migration(7, "similarity pool state", create_similarity_state),
+    Migration(8, "player identity evidence", add_identity_evidence),
+]
+
+
+def applied_versions(conn) -> set[int]:
+    execute_script(conn, HISTORY_DDL)
+    return {version for (version,) in
+            conn.execute("SELECT version FROM schema_migrations")}
+
+
+def migrate(conn, target: int | None = None) -> list[Migration]:
+    """
+    Apply the migrations not yet recorded, up to `target` (default: all),
+    in version order. Returns the ones applied.
+    """
+    done = applied_versions(conn)
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if target is not None and migration.version > target:
+            break
+        if migration.version in done:
+            continue
+        migration.apply(conn)
+        conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                     (migration.version, migration.name))
+        conn.execute(f"PRAGMA user_version = {migration.version}")
+        applied.append(migration)
+    return applied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bring the SQLite schema up to date by applying pending migrations."
+    )
+    parser.add_argument("--target", type=int, default=None,
+                        help="Stop after this version (default: latest).")
+    parser.add_argument("--db", type=Path, default=DB_PATH,
+                        help=f"Database file (default: {DB_PATH}).")
+    args = parser.parse_args()
+
+    with bulk_load(args.db, defer_indexes=False) as conn:
+        applied = migrate(conn, args.target)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for migration in applied:
+        print(f"Applied {migration.version}: {migration.name}")
+    print(f"{args.db} is at schema version {version}")
+
+
+if __name__ == "__main__":
+    main()
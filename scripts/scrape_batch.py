@@ -0,0 +1,173 @@
+import asyncio
+from dataclasses import dataclass
+from itertools import zip_longest
+from pathlib import Path
+
+from cli_args import add_fetch_args, build_batch_parser, resolve_batch_args
+from conferences import ConferenceConfig
+from http_fetcher import AsyncFetcher
+from page_cache import CacheStats, fetch_cached, page_available
+from raw_store import RawStore
+from scrape_conference_season import HEADERS, season_raw_dir, team_url
+from scrape_manifest import ScrapeManifest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MANIFEST_PATH = PROJECT_ROOT / "ncaa-analytics" / \
+    "data_raw" / "_scrape_manifest.json"
+
+
+@dataclass(frozen=True)
+class ScrapeJob:
+    conf: ConferenceConfig
+    season_end_year: int
+    slug: str
+
+    @property
+    def key(self) -> str:
+        return ScrapeManifest.job_key(self.conf.key, self.season_end_year, self.slug)
+
+    @property
+    def html_path(self) -> Path:
+        raw_dir = season_raw_dir(PROJECT_ROOT, self.conf, self.season_end_year)
+        return raw_dir / f"{self.slug}_{self.season_end_year}.html"
+
+
+def build_jobs(
+    confs: list[ConferenceConfig],
+    seasons: list[int],
+    manifest: ScrapeManifest,
+    force: bool = False,
+    store: RawStore | None = None,
+) -> list[ScrapeJob]:
+    """
+    Expand (conference, season, slug) jobs, skipping ones the manifest marks
+    done whose page is still on disk. Conference-seasons are interleaved so a
+    slow or failing conference doesn't leave the fetcher idle.
+    """
+    store = store or RawStore()
+    groups = []
+    for season in seasons:
+        for conf in confs:
+            groups.append([ScrapeJob(conf, season, slug)
+                           for slug in conf.sportsref_team_slugs])
+
+    jobs = []
+    for batch in zip_longest(*groups):
+        for job in batch:
+            if job is None:
+                continue
+            if not force and manifest.is_done(job.key) \
+                    and page_available(job.html_path, store):
+                continue
+            jobs.append(job)
+    return jobs
+
+
+async def run_jobs(
+    fetcher: AsyncFetcher,
+    jobs: list[ScrapeJob],
+    manifest: ScrapeManifest,
+    cache_policy: str,
+    workers: int,
+    store: RawStore | None = None,
+) -> CacheStats:
+    store = store or RawStore()
+    queue: asyncio.Queue[ScrapeJob] = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    stats = CacheStats()
+    total = len(jobs)
+
+    async def worker():
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            job.html_path.parent.mkdir(parents=True, exist_ok=True)
+            url = team_url(job.slug, job.season_end_year)
+            try:
+                outcome = await fetch_cached(
+                    fetcher, url, job.html_path, job.season_end_year,
+                    cache_policy, store)
+            except Exception as exc:
+                stats.errors += 1
+                stats.failed.append(job.key)
+                manifest.mark_failed(job.key, str(exc))
+                print(f"[{_done(stats)}/{total}] {job.key}: ERROR -> {exc}")
+                continue
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+            manifest.mark_done(job.key, outcome)
+            print(f"[{_done(stats)}/{total}] {job.key}: {outcome}")
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return stats
+
+
+def _done(stats: CacheStats) -> int:
+    return stats.hit + stats.revalidated + stats.fetched + stats.errors
+
+
+def main() -> None:
+    parser = build_batch_parser(
+        "Scrape Sports-Reference team pages for many conferences & seasons, "
+        "resuming from a checkpoint manifest."
+    )
+    add_fetch_args(parser)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the manifest and schedule every page again.",
+    )
+    args = parser.parse_args()
+    confs, seasons = resolve_batch_args(args)
+
+    manifest = ScrapeManifest(MANIFEST_PATH)
+    store = RawStore()
+    jobs = build_jobs(confs, seasons, manifest, force=args.force, store=store)
+    n_all = sum(len(c.sportsref_team_slugs) for c in confs) * len(seasons)
+
+    print(f"Conferences: {', '.join(c.key for c in confs)}")
+    print(f"Seasons: {', '.join(str(s) for s in seasons)}")
+    print(f"Manifest: {MANIFEST_PATH}")
+    print(f"Jobs: {len(jobs)} to run, {n_all - len(jobs)} already done\n")
+
+    if not jobs:
+        return
+
+    fetcher = AsyncFetcher(
+        rate=args.rate,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        headers=HEADERS,
+    )
+    try:
+        stats = asyncio.run(
+            run_jobs(fetcher, jobs, manifest, args.cache_policy,
+                     workers=args.concurrency, store=store)
+        )
+    finally:
+        # Checkpoint whatever finished, even on Ctrl-C.
+        manifest.save()
+        fetcher.close()
+
+    print(
+        f"\nPages: {stats.summary()} "
+        f"({fetcher.requests_sent} requests, {fetcher.retries} retries)."
+    )
+    # Across every run that shared the manifest, not just this one
+    counts = manifest.counts()
+    print(f"Manifest: {', '.join(f'{n} {status}' for status, n in sorted(counts.items()))} "
+          f"({manifest.path})")
+    if stats.failed:
+        print("Failed jobs (rerun to retry):")
+        for key in stats.failed[:20]:
+            print(f"  - {key}")
+        if len(stats.failed) > 20:
+            print("  ...")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
-import time
+import asyncio
+import os
 from pathlib import Path
 
-import requests
+from cli_args import add_fetch_args, build_conference_season_parser
+from conferences import CONFERENCES
+from http_fetcher import AsyncFetcher
+from page_cache import CacheStats, fetch_cached
+from raw_store import RawStore
 
-from cli_args import parse_conference_season
 
-
-BASE_URL = "https://www.sports-reference.com/cbb/schools"
+# Override to point at a local stand-in (see sportsref_standin.py)
+BASE_URL = os.environ.get(
+    "SPORTSREF_BASE_URL", "https://www.sports-reference.com/cbb/schools")
 HEADERS = {
     # Use a browser-y UA string so we don't get weird stripped-down pages
     "User-Agent": (
@@ -16,58 +21,147 @@ HEADERS = {
     )
 }
 
+_default_fetcher: AsyncFetcher | None = None
 
-def fetch_team_html(slug: str, season_end_year: int) -> tuple[str, str]:
-    """
-    Fetch the HTML for a single team season page.
 
-    Example URL:
-      https://www.sports-reference.com/cbb/schools/appalachian-state/men/2025.html
+def get_default_fetcher() -> AsyncFetcher:
     """
-    url = f"{BASE_URL}/{slug}/men/{season_end_year}.html"
-    resp = requests.get(url, headers=HEADERS, timeout=15)
-
-    if resp.status_code != 200:
-        raise RuntimeError(f"HTTP {resp.status_code} for {url}")
-
-    return resp.text, url
-
-
-def main() -> None:
-    conf, season_end_year = parse_conference_season()
+    Lazily-built engine behind the single-page API, so repeated
+    fetch_team_html() calls share one connection pool and rate limit.
+    """
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = AsyncFetcher(headers=HEADERS)
+    return _default_fetcher
 
-    project_root = Path(__file__).resolve().parents[1]
 
+def season_raw_dir(project_root: Path, conf, season_end_year: int) -> Path:
     # E.g. ncaa-analytics/data_raw/sun_belt/2024-2025
     season_dir_name = f"{season_end_year - 1}-{season_end_year}"
-    raw_dir = (
+    return (
         project_root
         / "ncaa-analytics"
         / "data_raw"
         / conf.data_subdir
         / season_dir_name
     )
-    raw_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"Conference: {conf.name} ({conf.key})")
-    print(f"Season end year: {season_end_year}")
-    print(f"Saving HTML files under: {raw_dir}\n")
 
-    for slug in conf.sportsref_team_slugs:
-        print(f"Fetching {slug} ... ", end="", flush=True)
+def team_url(slug: str, season_end_year: int) -> str:
+    return f"{BASE_URL}/{slug}/men/{season_end_year}.html"
+
+
+async def fetch_team_html_async(
+    fetcher: AsyncFetcher, slug: str, season_end_year: int
+) -> tuple[str, str]:
+    url = team_url(slug, season_end_year)
+    result = await fetcher.fetch(url)
+
+    if result.status != 200:
+        raise RuntimeError(f"HTTP {result.status} for {url}")
+
+    return result.text, url
+
+
+def fetch_team_html(
+    slug: str, season_end_year: int, fetcher: AsyncFetcher | None = None
+) -> tuple[str, str]:
+    """
+    Fetch the HTML for a single team season page.
+
+    Example URL:
+      https://www.sports-reference.com/cbb/schools/appalachian-state/men/2025.html
+    """
+    fetcher = fetcher or get_default_fetcher()
+    return asyncio.run(fetch_team_html_async(fetcher, slug, season_end_year))
+
+
+async def scrape_team_pages(
+    fetcher: AsyncFetcher,
+    slugs: list[str],
+    season_end_year: int,
+    raw_dir: Path,
+    project_root: Path,
+    cache_policy: str = "auto",
+    store: RawStore | None = None,
+) -> CacheStats:
+    """
+    Bring every team page under `raw_dir` up to date, concurrently (bounded
+    by the fetcher's per-host rate and concurrency). Pages are stored as
+    soon as they arrive; unchanged pages are served from the on-disk cache.
+    """
+    stats = CacheStats()
+    store = store or RawStore()
+
+    async def one(slug: str):
+        url = team_url(slug, season_end_year)
+        out_path = raw_dir / f"{slug}_{season_end_year}.html"
         try:
-            html, url = fetch_team_html(slug, season_end_year)
+            outcome = await fetch_cached(
+                fetcher, url, out_path, season_end_year, cache_policy, store)
         except Exception as exc:
-            print(f"ERROR -> {exc}")
+            return slug, url, out_path, None, exc
+        return slug, url, out_path, outcome, None
+
+    for task in asyncio.as_completed([one(slug) for slug in slugs]):
+        slug, url, out_path, outcome, exc = await task
+        if exc is not None:
+            print(f"{slug}: ERROR -> {exc}")
+            stats.errors += 1
+            stats.failed.append(slug)
             continue
 
-        out_path = raw_dir / f"{slug}_{season_end_year}.html"
-        out_path.write_text(html, encoding="utf-8")
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
         rel_path = out_path.relative_to(project_root)
-        print(f"ok -> {url} -> {rel_path}")
+        print(f"{slug}: {outcome} -> {url} -> {rel_path.with_suffix('.meta.json')}")
+
+    return stats
 
-        # Be polite to the site: tiny delay between requests
-        time.sleep(1.0)
+
+def main() -> None:
+    parser = build_conference_season_parser()
+    add_fetch_args(parser)
+    args = parser.parse_args()
+    conf = CONFERENCES[args.conference]
+    season_end_year: int = args.season
+
+    project_root = Path(__file__).resolve().parents[1]
+
+    raw_dir = season_raw_dir(project_root, conf, season_end_year)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Conference: {conf.name} ({conf.key})")
+    print(f"Season end year: {season_end_year}")
+    print(f"Saving page metadata under: {raw_dir}")
+    print(f"Compressed page store: {RawStore().root}")
+    print(f"Rate: {args.rate} req/s per host, concurrency {args.concurrency}\n")
+
+    # Be polite to the site: the per-host token bucket replaces the old
+    # fixed sleep between requests.
+    fetcher = AsyncFetcher(
+        rate=args.rate,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        headers=HEADERS,
+    )
+    try:
+        stats = asyncio.run(
+            scrape_team_pages(
+                fetcher,
+                conf.sportsref_team_slugs,
+                season_end_year,
+                raw_dir,
+                project_root,
+                cache_policy=args.cache_policy,
+            )
+        )
+    finally:
+        fetcher.close()
+
+    print(
+        f"\nPages: {stats.summary()} "
+        f"({fetcher.requests_sent} requests, {fetcher.retries} retries)."
+    )
 
 
 if __name__ == "__main__":
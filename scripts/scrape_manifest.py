@@ -0,0 +1,68 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from page_cache import write_atomic
+
+
+class ScrapeManifest:
+    """
+    Checkpoint file for batch scrapes: one record per
+    (conference, season, slug) job, keyed "conference/season/slug".
+
+    {
+      "jobs": {
+        "sun-belt/2025/troy": {"status": "done", "outcome": "fetched",
+                               "updated_at": "..."},
+        "sec/2025/auburn":    {"status": "failed", "error": "HTTP 404 ...",
+                               "attempts": 2, "updated_at": "..."}
+      }
+    }
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.jobs: dict[str, dict] = {}
+        self._dirty = 0
+        if path.exists():
+            self.jobs = json.loads(path.read_text(encoding="utf-8")).get("jobs", {})
+
+    @staticmethod
+    def job_key(conference_key: str, season_end_year: int, slug: str) -> str:
+        return f"{conference_key}/{season_end_year}/{slug}"
+
+    def is_done(self, key: str) -> bool:
+        return self.jobs.get(key, {}).get("status") == "done"
+
+    def mark_done(self, key: str, outcome: str) -> None:
+        self.jobs[key] = {"status": "done", "outcome": outcome,
+                          "updated_at": _now()}
+        self._touch()
+
+    def mark_failed(self, key: str, error: str) -> None:
+        attempts = self.jobs.get(key, {}).get("attempts", 0) + 1
+        self.jobs[key] = {"status": "failed", "error": error,
+                          "attempts": attempts, "updated_at": _now()}
+        self._touch()
+
+    def counts(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for job in self.jobs.values():
+            out[job["status"]] = out.get(job["status"], 0) + 1
+        return out
+
+    def _touch(self, every: int = 25) -> None:
+        # Checkpoint periodically so a crash loses at most `every` results.
+        self._dirty += 1
+        if self._dirty >= every:
+            self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(
+            {"jobs": self.jobs}, indent=1, sort_keys=True))
+        self._dirty = 0
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,576 @@
+import argparse
+import json
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cli_args import parse_season_spec
+from conferences import CONFERENCES
+from schema_migrations import migrate
+from sqlite_bulk import bulk_load, insert_chunked, stage_rows, upsert_delta
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+# Player-season profile columns compared by default
+FEATURES = ["mp", "pts", "reb", "ast", "height_cm", "weight_kg"]
+
+# Rows per leaf of the search tree; a distance block is at most
+# LEAF_ROWS x LEAF_ROWS
+LEAF_ROWS = 512
+
+# A player-season is one row of player_season_profile
+SEASON_KEY = ["player_id", "team_slug", "season_end_year"]
+
+
+# ---------------------------------------------------------
+# Exact k nearest neighbours, in blocks
+#
+# The player-seasons are split into leaves of at most LEAF_ROWS spatially
+# close rows (median splits on the widest column). For the queries in one
+# leaf, the other leaves are visited nearest box first; a leaf is skipped
+# for every query whose distance to its bounding box is already beyond the
+# query's current k-th best, which after the first few leaves is nearly
+# all of them. What is left is a matrix product per (query leaf, leaf)
+# block, |q|^2 + |r|^2 - 2 q.r, and an argpartition for the k best of the
+# block merged into a running top k; only the final k are fully sorted.
+# Memory is a few blocks, whatever the number of player-seasons.
+# ---------------------------------------------------------
+
+@dataclass
+class Neighbors:
+    """Per query row, its k nearest rows, nearest first."""
+    index: np.ndarray     # (n_queries, k) int64 row numbers
+    distance: np.ndarray  # (n_queries, k) float64 Euclidean distances
+
+
+def standardize(X: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Z-score each column; a missing value becomes the column mean (0).
+    Returns (Z, means, stds) so other rows can be put on the same scale.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-missing column
+        means = np.nanmean(X, axis=0)
+        stds = np.nanstd(X, axis=0)
+    means[np.isnan(means)] = 0.0
+    stds[~(stds > 0)] = 1.0  # constant or all-missing column
+    return apply_scale(X, means, stds), means, stds
+
+
+def apply_scale(X: np.ndarray, means: np.ndarray, stds: np.ndarray) -> np.ndarray:
+    Z = (np.asarray(X, dtype=np.float64) - means) / stds
+    return np.nan_to_num(Z, nan=0.0)
+
+
+def split_leaves(Z: np.ndarray, leaf_rows: int) -> list[np.ndarray]:
+    """Row numbers of Z in groups of at most leaf_rows close rows."""
+    leaves, stack = [], [np.arange(len(Z))]
+    while stack:
+        rows = stack.pop()
+        if len(rows) <= leaf_rows:
+            leaves.append(rows)
+            continue
+        points = Z[rows]
+        widest = np.argmax(points.max(axis=0) - points.min(axis=0))
+        order = np.argsort(points[:, widest], kind="stable")
+        half = len(rows) // 2
+        stack += [rows[order[half:]], rows[order[:half]]]
+    return leaves
+
+
+def _box_gap2(points: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Squared distance from each point to the box [lo, hi] (0 inside)."""
+    gap = np.maximum(0.0, np.maximum(lo - points, points - hi))
+    return np.einsum("...j,...j->...", gap, gap)
+
+
+def merge_top_k(best_d: np.ndarray, best_i: np.ndarray, need: np.ndarray,
+                d: np.ndarray, ref: np.ndarray) -> None:
+    """
+    Fold a block of squared distances `d` (rows `need` of the running top k,
+    columns the row numbers `ref`) into best_d / best_i, in place.
+    """
+    k = best_d.shape[1]
+    if d.shape[1] > k:
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        cand_d, cand_i = np.take_along_axis(d, part, axis=1), ref[part]
+    else:
+        cand_d, cand_i = d, np.broadcast_to(ref, d.shape)
+    merged_d = np.concatenate([best_d[need], cand_d], axis=1)
+    merged_i = np.concatenate([best_i[need], cand_i], axis=1)
+    keep = np.argpartition(merged_d, k - 1, axis=1)[:, :k]
+    best_d[need] = np.take_along_axis(merged_d, keep, axis=1)
+    best_i[need] = np.take_along_axis(merged_i, keep, axis=1)
+
+
+def exact_order(Z: np.ndarray, queries: np.ndarray, picked: np.ndarray) -> Neighbors:
+    """
+    Distances from each query to its picked rows of Z, computed directly (no
+    cancellation), nearest first. A picked -1 (fewer than k found) sorts
+    last with distance inf.
+    """
+    missing = picked < 0
+    exact = np.sqrt(((Z[picked] - queries[:, None, :]) ** 2).sum(axis=2))
+    exact[missing] = np.inf
+    order = np.argsort(exact, axis=1, kind="stable")
+    return Neighbors(np.take_along_axis(picked, order, axis=1),
+                     np.take_along_axis(exact, order, axis=1))
+
+
+def nearest_neighbors(Z: np.ndarray, k: int = 5, rows: np.ndarray | None = None,
+                      leaf_rows: int = LEAF_ROWS) -> Neighbors:
+    """
+    The k nearest rows of Z (already scaled) to each row in `rows` (default:
+    every row). A row is never its own neighbour.
+    """
+    Z = np.asarray(Z, dtype=np.float64)
+    rows = np.arange(len(Z)) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = max(0, min(k, len(Z) - 1))
+    index = np.empty((len(rows), k), np.int64)
+    distance = np.empty((len(rows), k), np.float64)
+    if k == 0 or len(rows) == 0:
+        return Neighbors(index, distance)
+
+    norms = np.einsum("ij,ij->i", Z, Z)
+    leaves = split_leaves(Z, leaf_rows)
+    lo = np.array([Z[leaf].min(axis=0) for leaf in leaves])
+    hi = np.array([Z[leaf].max(axis=0) for leaf in leaves])
+    slot = np.empty(len(Z), np.int64)     # position of a row within its leaf
+    out = np.full(len(Z), -1, np.int64)   # position of a query in the result
+    for leaf in leaves:
+        slot[leaf] = np.arange(len(leaf))
+    out[rows] = np.arange(len(rows))
+
+    for a, leaf in enumerate(leaves):
+        queries = leaf[out[leaf] >= 0]
+        if not len(queries):
+            continue
+        best_d = np.full((len(queries), k), np.inf)
+        best_i = np.full((len(queries), k), -1, np.int64)
+        # Squared gap between leaf a's box and each leaf's box
+        gap = np.maximum(0.0, np.maximum(lo - hi[a], lo[a] - hi))
+        leaf_gap = np.einsum("ij,ij->i", gap, gap)
+        for b in np.argsort(leaf_gap, kind="stable"):
+            kth = best_d.max(axis=1)
+            if leaf_gap[b] >= kth.max():
+                break  # this leaf and every one after it are too far for all queries
+            need = np.flatnonzero(_box_gap2(Z[queries], lo[b], hi[b]) < kth)
+            if not len(need):
+                continue
+            ref = leaves[b]
+            q = queries[need]
+            d = Z[q] @ Z[ref].T
+            d *= -2
+            d += norms[q, None]
+            d += norms[None, ref]
+            if a == b:
+                d[np.arange(len(q)), slot[q]] = np.inf
+            better = np.flatnonzero(d.min(axis=1) < kth[need])
+            if not len(better):
+                continue
+            merge_top_k(best_d, best_i, need[better], d[better], ref)
+
+        found = exact_order(Z, Z[queries], best_i)
+        index[out[queries]] = found.index
+        distance[out[queries]] = found.distance
+    return Neighbors(index, distance)
+
+
+def neighbor_frame(keys: pd.DataFrame, neighbors: Neighbors,
+                   comp_keys: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    One row per (query, rank): the query's key columns, rank (1 = nearest),
+    the neighbour's key columns prefixed with comp_, and distance.
+    """
+    comp_keys = keys if comp_keys is None else comp_keys
+    n, k = neighbors.index.shape
+    flat = neighbors.index.ravel()
+    out = {col: np.repeat(keys[col].to_numpy(), k) for col in keys.columns}
+    out["rank"] = np.tile(np.arange(1, k + 1), n)
+    for col in comp_keys.columns:
+        out[f"comp_{col}"] = comp_keys[col].to_numpy()[flat]
+    out["distance"] = neighbors.distance.ravel()
+    return pd.DataFrame(out)
+
+
+# ---------------------------------------------------------
+# Player-season profiles
+# ---------------------------------------------------------
+
+def load_profiles(conn, features: list[str], conference_keys: list[str] | None = None,
+                  seasons: list[int] | None = None) -> pd.DataFrame:
+    """player_season_profile rows (key columns + features) in scope."""
+    where, params = [], []
+    if conference_keys:
+        where.append(f"conference_key IN ({', '.join('?' * len(conference_keys))})")
+        params += conference_keys
+    if seasons:
+        where.append(f"season_end_year IN ({', '.join('?' * len(seasons))})")
+        params += seasons
+    return pd.read_sql_query(
+        f"""
+        SELECT {", ".join(SEASON_KEY + features)}
+        FROM player_season_profile
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {", ".join(SEASON_KEY)}
+        """,
+        conn,
+        params=params,
+    )
+
+
+SIMILARITY_COLUMNS = ["pool", *SEASON_KEY, "rank", *(f"comp_{c}" for c in SEASON_KEY),
+                      "distance"]
+
+
+def insert_similarity(conn, pool: str, frame: pd.DataFrame) -> int:
+    return insert_chunked(
+        conn,
+        f"INSERT INTO player_similarity ({', '.join(SIMILARITY_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(SIMILARITY_COLUMNS))})",
+        frame.assign(pool=pool),
+        SIMILARITY_COLUMNS,
+    )
+
+
+# ---------------------------------------------------------
+# Incremental refresh
+#
+# A pool remembers its parameters, the z-score means / stds it was computed
+# with (norm_version) and a hash of every player-season's inputs. A later
+# run with --incremental keeps that normalization, so unchanged rows keep
+# their coordinates, and only touches
+#
+#   - player-seasons that are new or whose inputs changed (recomputed), and
+#   - player-seasons with a changed or removed row among their comps, or
+#     that a changed row now comes closer to than their k-th comp.
+#
+# Every other row outside a list was at least its k-th distance away and
+# still is, so a list of the second kind is repaired from its old comps
+# plus the changed rows near it: if k of those are within the old k-th
+# distance, they are the new list. Only lists that come up short (a comp
+# moved away or was removed) are recomputed with a search. Every other list
+# is provably unchanged. If the pool's parameters differ, or the data has
+# drifted so that today's means / stds are more than NORM_TOLERANCE (in
+# stds) away from the stored ones, it is a full rebuild with a new
+# norm_version instead.
+# ---------------------------------------------------------
+
+NORM_TOLERANCE = 0.05
+
+# Slack on "closer than the k-th comp" for the matrix-product distances;
+# an extra candidate costs nothing, a missed one would be a wrong list
+_REACH_SLACK = 1e-9
+
+
+@dataclass
+class PoolState:
+    features: list[str]
+    k: int
+    conference_keys: list[str] | None
+    seasons: list[int] | None
+    norm_version: int
+    means: np.ndarray
+    stds: np.ndarray
+
+    def same_parameters(self, other: "PoolState") -> bool:
+        return (self.features, self.k, self.conference_keys, self.seasons) == \
+            (other.features, other.k, other.conference_keys, other.seasons)
+
+
+def read_pool(conn, pool: str) -> PoolState | None:
+    row = conn.execute(
+        "SELECT features, k, conference_keys, seasons, norm_version, means, stds "
+        "FROM similarity_pools WHERE pool = ?", (pool,)).fetchone()
+    if row is None:
+        return None
+    features, k, conference_keys, seasons, norm_version, means, stds = row
+    return PoolState(json.loads(features), k, json.loads(conference_keys or "null"),
+                     json.loads(seasons or "null"), norm_version,
+                     np.array(json.loads(means)), np.array(json.loads(stds)))
+
+
+def write_pool(conn, pool: str, state: PoolState) -> None:
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO similarity_pools
+            (pool, features, k, conference_keys, seasons, norm_version, means, stds)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (pool, json.dumps(state.features), state.k,
+         None if state.conference_keys is None else json.dumps(state.conference_keys),
+         None if state.seasons is None else json.dumps(state.seasons),
+         state.norm_version, json.dumps(state.means.tolist()),
+         json.dumps(state.stds.tolist())),
+    )
+
+
+def normalization_drift(state: PoolState, means: np.ndarray, stds: np.ndarray) -> float:
+    """How far today's means / stds are from the stored ones, in stored stds."""
+    return float(max(np.max(np.abs(means - state.means) / state.stds),
+                     np.max(np.abs(stds / state.stds - 1))))
+
+
+def input_hashes(profiles: pd.DataFrame, features: list[str]) -> np.ndarray:
+    hashed = pd.util.hash_pandas_object(profiles[features], index=False)
+    return hashed.to_numpy().view(np.int64)  # SQLite integers are signed
+
+
+def with_row_numbers(profiles: pd.DataFrame, keys: pd.DataFrame) -> pd.DataFrame:
+    """`keys` rows that are in `profiles`, with their row number there as `row`."""
+    rows = profiles[SEASON_KEY].reset_index(drop=True).rename_axis("row").reset_index()
+    return keys.merge(rows, on=SEASON_KEY)
+
+
+def delete_keys(conn, table: str, keys: pd.DataFrame) -> None:
+    """Delete the rows of `table` matching `keys` (pool + SEASON_KEY)."""
+    columns = ["pool", *SEASON_KEY]
+    staging = stage_rows(conn, table, columns, keys, columns)
+    conn.execute(
+        f"""
+        DELETE FROM {table}
+        WHERE EXISTS (SELECT 1 FROM temp."{staging}" s
+                      WHERE {" AND ".join(f"s.{c} = {table}.{c}" for c in columns)})
+        """
+    )
+    conn.execute(f'DROP TABLE temp."{staging}"')
+
+
+def displaced_pairs(Z: np.ndarray, changed: np.ndarray, kth: np.ndarray,
+                    leaf_rows: int = LEAF_ROWS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (row, changed row) pairs where the changed row is now closer to the row
+    than its k-th comp. Same leaves as nearest_neighbors: a leaf is only
+    compared with the changed rows that could be within its largest k-th
+    distance of its box.
+    """
+    points = Z[changed]
+    norms = np.einsum("ij,ij->i", Z, Z)
+    reach2 = kth ** 2 * (1 + _REACH_SLACK) + _REACH_SLACK
+    rows, comps = [], []
+    for leaf in split_leaves(Z, leaf_rows):
+        near = np.flatnonzero(_box_gap2(points, Z[leaf].min(axis=0),
+                                        Z[leaf].max(axis=0)) < reach2[leaf].max())
+        if not len(near):
+            continue
+        d = points[near] @ Z[leaf].T
+        d *= -2
+        d += norms[changed[near], None]
+        d += norms[None, leaf]
+        c, r = np.nonzero(d < reach2[leaf])
+        rows.append(leaf[r])
+        comps.append(changed[near[c]])
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(rows), np.concatenate(comps)
+
+
+def repair_lists(Z: np.ndarray, rows: np.ndarray, comps: np.ndarray,
+                 kth: np.ndarray, k: int) -> tuple[np.ndarray, Neighbors]:
+    """
+    From candidate (row, comp) pairs, the rows with at least k candidates
+    within their old k-th distance and their new lists.
+    """
+    pairs = pd.DataFrame({"row": rows, "comp": comps})
+    pairs = pairs[pairs["row"] != pairs["comp"]].drop_duplicates()
+    row, comp = pairs["row"].to_numpy(), pairs["comp"].to_numpy()
+    dist = np.sqrt(((Z[row] - Z[comp]) ** 2).sum(axis=1))
+    within = dist <= kth[row]
+    row, comp, dist = row[within], comp[within], dist[within]
+
+    order = np.lexsort((dist, row))
+    row, comp = row[order], comp[order]
+    starts = np.flatnonzero(np.r_[True, row[1:] != row[:-1]])
+    counts = np.diff(np.r_[starts, len(row)])
+    full = starts[counts >= k]
+    repaired = row[full]
+    picked = comp[full[:, None] + np.arange(k)]
+    return repaired, exact_order(Z, Z[repaired], picked)
+
+
+def refresh_incremental(conn, pool: str, profiles: pd.DataFrame, Z: np.ndarray,
+                        hashes: np.ndarray, k: int) -> tuple[int, int, int]:
+    """
+    Update the comps that the changes since the last run can affect, and
+    the stored input hashes. Returns (changed or removed player-seasons,
+    lists repaired, lists recomputed).
+    """
+    stored = pd.read_sql_query(
+        "SELECT player_id, team_slug, season_end_year, input_hash "
+        "FROM similarity_inputs WHERE pool = ?", conn, params=(pool,))
+    now = profiles[SEASON_KEY].assign(input_hash=hashes)
+    both = now.merge(stored, on=SEASON_KEY, how="outer", suffixes=("", "_old"),
+                     indicator=True)
+    gone = both.loc[both["_merge"] == "right_only", SEASON_KEY]
+    changed_keys = both.loc[(both["_merge"] == "left_only") |
+                            ((both["_merge"] == "both") &
+                             (both["input_hash"] != both["input_hash_old"])), SEASON_KEY]
+    changed = with_row_numbers(profiles, changed_keys)["row"].to_numpy()
+    if not len(changed) and gone.empty:
+        return 0, 0, 0
+
+    # Distance to the current k-th comp (inf if the list is short)
+    kth = np.full(len(profiles), np.inf)
+    last = with_row_numbers(profiles, pd.read_sql_query(
+        "SELECT player_id, team_slug, season_end_year, distance "
+        "FROM player_similarity WHERE pool = ? AND rank = ?", conn, params=(pool, k)))
+    kth[last["row"].to_numpy()] = last["distance"].to_numpy()
+
+    # Rows with a changed or removed comp
+    comp_columns = [f"comp_{c}" for c in SEASON_KEY]
+    moved = pd.concat([changed_keys, gone]).set_axis(comp_columns, axis=1)
+    staging = stage_rows(conn, "player_similarity", comp_columns, moved, comp_columns)
+    lost_a_comp = pd.read_sql_query(
+        f"""
+        SELECT DISTINCT p.player_id, p.team_slug, p.season_end_year
+        FROM player_similarity p
+        JOIN temp."{staging}" s USING ({", ".join(comp_columns)})
+        WHERE p.pool = ?
+        """, conn, params=(pool,))
+    conn.execute(f'DROP TABLE temp."{staging}"')
+
+    near_rows, near_changed = displaced_pairs(Z, changed, kth)
+    affected = np.setdiff1d(
+        np.concatenate([with_row_numbers(profiles, lost_a_comp)["row"].to_numpy(),
+                        near_rows]), changed)
+
+    # Their old comps that are still in the pool are candidates too
+    affected_keys = profiles[SEASON_KEY].iloc[affected].assign(pool=pool)
+    staging = stage_rows(conn, "player_similarity", ["pool", *SEASON_KEY],
+                         affected_keys, ["pool", *SEASON_KEY])
+    old = pd.read_sql_query(
+        f"""
+        SELECT p.player_id, p.team_slug, p.season_end_year,
+               p.comp_player_id, p.comp_team_slug, p.comp_season_end_year
+        FROM temp."{staging}" s
+        JOIN player_similarity p USING (pool, {", ".join(SEASON_KEY)})
+        """, conn)
+    conn.execute(f'DROP TABLE temp."{staging}"')
+    old = with_row_numbers(profiles, old).rename(columns={"row": "query"})
+    old = with_row_numbers(profiles, old[["query", *comp_columns]].set_axis(
+        ["query", *SEASON_KEY], axis=1))
+
+    in_affected = np.isin(near_rows, affected)
+    repaired, fixed = repair_lists(
+        Z, np.concatenate([old["query"].to_numpy(), near_rows[in_affected]]),
+        np.concatenate([old["row"].to_numpy(), near_changed[in_affected]]), kth, k)
+    redo = np.union1d(changed, np.setdiff1d(affected, repaired))
+
+    # Replace the comps of the touched and removed player-seasons
+    delete_keys(conn, "player_similarity",
+                pd.concat([profiles[SEASON_KEY].iloc[np.union1d(redo, repaired)],
+                           gone]).assign(pool=pool))
+    insert_similarity(conn, pool, neighbor_frame(
+        profiles[SEASON_KEY].iloc[repaired], fixed, profiles[SEASON_KEY]))
+    insert_similarity(conn, pool, neighbor_frame(
+        profiles[SEASON_KEY].iloc[redo], nearest_neighbors(Z, k=k, rows=redo),
+        profiles[SEASON_KEY]))
+
+    # Only the changed input hashes are rewritten
+    upsert_delta(conn, "similarity_inputs", ["pool", *SEASON_KEY],
+                 now.iloc[changed].assign(pool=pool),
+                 ["pool", *SEASON_KEY, "input_hash"])
+    if not gone.empty:
+        delete_keys(conn, "similarity_inputs", gone.assign(pool=pool))
+    return len(changed) + len(gone), len(repaired), len(redo)
+
+
+def refresh_pool(conn, pool: str, profiles: pd.DataFrame, wanted: PoolState,
+                 incremental: bool) -> str:
+    """
+    Bring the pool's comps up to date with `profiles`, incrementally when
+    asked and possible. Returns a one-line summary.
+    """
+    X = profiles[wanted.features].to_numpy()
+    _, means, stds = standardize(X)
+    state = read_pool(conn, pool)
+    hashes = input_hashes(profiles, wanted.features)
+
+    reason = None
+    if not incremental:
+        reason = "full rebuild requested"
+    elif state is None:
+        reason = "no previous run"
+    elif not state.same_parameters(wanted):
+        reason = "pool parameters changed"
+    elif normalization_drift(state, means, stds) > NORM_TOLERANCE:
+        reason = (f"normalization v{state.norm_version} is stale (drift "
+                  f"{normalization_drift(state, means, stds):.3f} stds)")
+
+    if reason is None:
+        changes, repaired, redone = refresh_incremental(
+            conn, pool, profiles, apply_scale(X, state.means, state.stds), hashes,
+            state.k)
+        write_pool(conn, pool, state)
+        return (f"incremental (normalization v{state.norm_version}): "
+                f"{changes:,} player-seasons changed, {repaired:,} comp lists "
+                f"repaired, {redone:,} recomputed")
+
+    wanted.norm_version = (state.norm_version + 1) if state else 1
+    wanted.means, wanted.stds = means, stds
+    Z = apply_scale(X, means, stds)
+    conn.execute("DELETE FROM player_similarity WHERE pool = ?", (pool,))
+    insert_similarity(conn, pool, neighbor_frame(
+        profiles[SEASON_KEY], nearest_neighbors(Z, k=wanted.k)))
+    write_pool(conn, pool, wanted)
+    upsert_delta(conn, "similarity_inputs", ["pool", *SEASON_KEY],
+                 profiles[SEASON_KEY].assign(pool=pool, input_hash=hashes),
+                 ["pool", *SEASON_KEY, "input_hash"], delete_scope={"pool": pool})
+    return (f"full rebuild, normalization v{wanted.norm_version} ({reason}): "
+            f"{len(profiles):,} comp lists")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compute each player-season's nearest player-seasons "
+                    "(z-scored profile stats) and store them in player_similarity."
+    )
+    parser.add_argument("--conference", nargs="+", default=["all"],
+                        choices=["all"] + sorted(CONFERENCES.keys()),
+                        help="Conferences in the pool (default: all).")
+    parser.add_argument("--season", nargs="+", type=parse_season_spec, default=None,
+                        help="Season end years and/or ranges (default: all).")
+    parser.add_argument("--features", nargs="+", default=FEATURES,
+                        help=f"Profile columns to compare (default: {' '.join(FEATURES)}).")
+    parser.add_argument("--k", type=int, default=5,
+                        help="Comps per player-season (default: 5).")
+    parser.add_argument("--pool", default="default",
+                        help="Name the results are stored under (default: 'default').")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only recompute the comps that changed since the "
+                             "pool's last run (falls back to a full rebuild if "
+                             "its parameters or normalization no longer fit).")
+    args = parser.parse_args()
+
+    wanted = PoolState(
+        features=args.features,
+        k=args.k,
+        conference_keys=None if "all" in args.conference else sorted(set(args.conference)),
+        seasons=sorted({y for spec in args.season for y in spec}) if args.season else None,
+        norm_version=0,
+        means=np.empty(0),
+        stds=np.empty(0),
+    )
+
+    started = time.perf_counter()
+    with bulk_load(DB_PATH, ["player_similarity", "similarity_inputs"],
+                   defer_indexes=False) as conn:
+        migrate(conn)
+        profiles = load_profiles(conn, wanted.features, wanted.conference_keys,
+                                 wanted.seasons)
+        if profiles.empty:
+            raise SystemExit("No player-season profiles in scope; run rollups.py first?")
+        summary = refresh_pool(conn, args.pool, profiles, wanted, args.incremental)
+
+    print(f"Pool '{args.pool}', {len(profiles):,} player-seasons: {summary} "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
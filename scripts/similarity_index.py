@@ -0,0 +1,266 @@
+import argparse
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import parse_season_spec
+from conferences import CONFERENCES
+from similarity import FEATURES, SEASON_KEY, DB_PATH, Neighbors, exact_order, \
+    load_profiles, merge_top_k, standardize
+from versioned_dir import publish, read_current
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+INDEX_DIR = PROJECT_ROOT / "ncaa-analytics" / "index" / "player_comps"
+
+# Knobs. More lists = smaller lists to scan but coarser centroids; more
+# probes = higher recall, proportionally slower queries.
+DEFAULT_PROBES = 8
+TRAIN_ROWS_PER_LIST = 64
+KMEANS_ITERATIONS = 12
+
+# Rows per block when assigning rows to centroids
+ASSIGN_BLOCK_ROWS = 4096
+
+
+# ---------------------------------------------------------
+# IVF index for approximate comps
+#
+# The standardized player-seasons are clustered with k-means into n_lists
+# coarse cells (an inverted file). A query only looks at the rows of the
+# n_probe cells whose centroids are nearest to it, so its cost is about
+# n_probe / n_lists of an exact scan; a comp that sits in a cell not probed
+# is missed, which is what the recall benchmark measures. Rows are stored
+# grouped by cell (points[offsets[c]:offsets[c + 1]] is cell c), and
+# `row_ids` maps them back to row numbers of the matrix the index was built
+# from.
+#
+# On disk an index is a versioned directory (see versioned_dir) of .npy
+# arrays, opened memory-mapped, and meta.json; a rebuild publishes a new
+# version, so a lookup never finds the index missing or mixes two builds.
+# ---------------------------------------------------------
+
+@dataclass
+class IvfIndex:
+    centroids: np.ndarray   # (n_lists, d)
+    offsets: np.ndarray     # (n_lists + 1,) start of each cell in points
+    points: np.ndarray      # (n, d) standardized rows, grouped by cell
+    row_ids: np.ndarray     # (n,) row number of each stored point
+    means: np.ndarray       # (d,) standardization of the features
+    stds: np.ndarray
+    features: list[str]
+    keys: dict[str, np.ndarray]  # SEASON_KEY columns, by row number
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+
+def _sq_distances(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    d = A @ B.T
+    d *= -2
+    d += np.einsum("ij,ij->i", A, A)[:, None]
+    d += np.einsum("ij,ij->i", B, B)[None, :]
+    return d
+
+
+def nearest_centroids(Z: np.ndarray, centroids: np.ndarray, n: int = 1) -> np.ndarray:
+    """The n nearest centroids of each row (unordered), in row blocks."""
+    n = min(n, len(centroids))
+    out = np.empty((len(Z), n), np.int64)
+    for start in range(0, len(Z), ASSIGN_BLOCK_ROWS):
+        d = _sq_distances(Z[start:start + ASSIGN_BLOCK_ROWS], centroids)
+        out[start:start + len(d)] = (np.argpartition(d, n - 1, axis=1)[:, :n]
+                                     if n < d.shape[1] else np.argsort(d, axis=1))
+    return out
+
+
+def kmeans(Z: np.ndarray, n_lists: int, iterations: int = KMEANS_ITERATIONS,
+           seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means on a sample of TRAIN_ROWS_PER_LIST rows per list."""
+    rng = np.random.default_rng(seed)
+    n_train = min(len(Z), n_lists * TRAIN_ROWS_PER_LIST)
+    train = Z[rng.choice(len(Z), n_train, replace=False)]
+    centroids = train[rng.choice(n_train, n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        cell = nearest_centroids(train, centroids)[:, 0]
+        counts = np.bincount(cell, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, cell, train)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # An empty cell restarts on a random training row
+        empty = np.flatnonzero(~filled)
+        centroids[empty] = train[rng.choice(n_train, len(empty), replace=False)]
+    return centroids
+
+
+def default_lists(n_rows: int) -> int:
+    return max(1, int(2 * np.sqrt(n_rows)))
+
+
+def build_index(Z: np.ndarray, means: np.ndarray, stds: np.ndarray,
+                features: list[str], keys: dict[str, np.ndarray],
+                n_lists: int | None = None, seed: int = 0) -> IvfIndex:
+    Z = np.asarray(Z, dtype=np.float64)
+    n_lists = min(n_lists or default_lists(len(Z)), len(Z))
+    centroids = kmeans(Z, n_lists, seed=seed)
+    cell = nearest_centroids(Z, centroids)[:, 0]
+    row_ids = np.argsort(cell, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(cell, minlength=n_lists))])
+    return IvfIndex(centroids, offsets, Z[row_ids], row_ids, means, stds,
+                    list(features), {col: np.asarray(v) for col, v in keys.items()})
+
+
+def search(index: IvfIndex, queries: np.ndarray, k: int = 5,
+           n_probe: int = DEFAULT_PROBES, exclude: np.ndarray | None = None) -> Neighbors:
+    """
+    Approximate k nearest indexed rows (as row numbers) to each standardized
+    query. `exclude` gives, per query, a row number to leave out (the
+    query's own row, when it is in the index) or -1.
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+    probes = nearest_centroids(queries, index.centroids, n_probe)
+    best_d = np.full((len(queries), k), np.inf)
+    best_i = np.full((len(queries), k), -1, np.int64)
+
+    # Visit each probed cell once, with all the queries probing it
+    cells = probes.ravel()
+    asking = np.repeat(np.arange(len(queries)), probes.shape[1])
+    by_cell = np.argsort(cells, kind="stable")
+    starts = np.searchsorted(cells[by_cell], np.arange(index.n_lists + 1))
+    for c in np.unique(cells):
+        lo, hi = index.offsets[c], index.offsets[c + 1]
+        if lo == hi:
+            continue
+        need = asking[by_cell[starts[c]:starts[c + 1]]]
+        ref = np.arange(lo, hi)
+        d = _sq_distances(queries[need], np.asarray(index.points[lo:hi]))
+        if exclude is not None:
+            d[index.row_ids[ref][None, :] == exclude[need][:, None]] = np.inf
+        merge_top_k(best_d, best_i, need, d, ref)
+
+    found = exact_order(np.asarray(index.points), queries, best_i)
+    found.index = np.where(found.index >= 0,
+                           index.row_ids[np.maximum(found.index, 0)], -1)
+    return found
+
+
+# ---------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------
+
+ARRAYS = ["centroids", "offsets", "points", "row_ids", "means", "stds"]
+
+
+def save_index(index: IvfIndex, path: Path = INDEX_DIR) -> None:
+    def write(version: Path) -> None:
+        for name in ARRAYS:
+            np.save(version / f"{name}.npy", getattr(index, name))
+        for col, values in index.keys.items():
+            np.save(version / f"key_{col}.npy",
+                    values.astype(str) if values.dtype == object else values)
+        (version / "meta.json").write_text(json.dumps(
+            {"features": index.features, "keys": list(index.keys),
+             "rows": len(index.row_ids), "n_lists": index.n_lists}, indent=2),
+            encoding="utf-8")
+
+    publish(path, write)
+
+
+def _load_version(version: Path) -> IvfIndex:
+    meta = json.loads((version / "meta.json").read_text(encoding="utf-8"))
+    arrays = {name: np.load(version / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+    keys = {col: np.load(version / f"key_{col}.npy", mmap_mode="r")
+            for col in meta["keys"]}
+    return IvfIndex(**arrays, features=meta["features"], keys=keys)
+
+
+def load_index(path: Path = INDEX_DIR) -> IvfIndex:
+    index = read_current(path, _load_version)
+    if index is None:
+        raise FileNotFoundError(f"no index saved in {path}")
+    return index
+
+
+def comps_for_player(index: IvfIndex, player_id: int, k: int = 5,
+                     n_probe: int = DEFAULT_PROBES) -> list[tuple]:
+    """
+    (season_end_year, team_slug, rank, comp player_id, comp team_slug,
+    comp season_end_year, distance) for each indexed season of a player.
+    """
+    rows = np.flatnonzero(np.asarray(index.keys["player_id"]) == player_id)
+    if not len(rows):
+        return []
+    # Stored points are grouped by cell; find each row's copy
+    stored = np.empty(len(index.row_ids), np.int64)
+    stored[np.asarray(index.row_ids)] = np.arange(len(index.row_ids))
+    found = search(index, np.asarray(index.points)[stored[rows]], k, n_probe, exclude=rows)
+    keys = index.keys
+    return [(int(keys["season_end_year"][row]), str(keys["team_slug"][row]), rank + 1,
+             int(keys["player_id"][comp]), str(keys["team_slug"][comp]),
+             int(keys["season_end_year"][comp]), float(dist))
+            for row, comps, dists in zip(rows, found.index, found.distance)
+            for rank, (comp, dist) in enumerate(zip(comps, dists)) if comp >= 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the approximate-comps index over player-season "
+                    "profiles, or look up a player's comps in it."
+    )
+    parser.add_argument("--conference", nargs="+", default=["all"],
+                        choices=["all"] + sorted(CONFERENCES.keys()),
+                        help="Conferences to index (default: all).")
+    parser.add_argument("--season", nargs="+", type=parse_season_spec, default=None,
+                        help="Season end years and/or ranges to index (default: all).")
+    parser.add_argument("--features", nargs="+", default=FEATURES,
+                        help=f"Profile columns to compare (default: {' '.join(FEATURES)}).")
+    parser.add_argument("--lists", type=int, default=None,
+                        help="Coarse cells (default: 2 * sqrt(rows)).")
+    parser.add_argument("--out", type=Path, default=INDEX_DIR,
+                        help=f"Index directory (default: {INDEX_DIR}).")
+    parser.add_argument("--player-id", type=int, default=None,
+                        help="Print this player's comps from the saved index "
+                             "instead of building it.")
+    parser.add_argument("--k", type=int, default=5,
+                        help="Comps per player-season with --player-id (default: 5).")
+    parser.add_argument("--probes", type=int, default=DEFAULT_PROBES,
+                        help=f"Cells searched per query with --player-id "
+                             f"(default: {DEFAULT_PROBES}).")
+    args = parser.parse_args()
+
+    if args.player_id is not None:
+        index = load_index(args.out)
+        started = time.perf_counter()
+        comps = comps_for_player(index, args.player_id, args.k, args.probes)
+        elapsed = time.perf_counter() - started
+        for season, team, rank, comp_id, comp_team, comp_season, dist in comps:
+            print(f"{season} {team:24} #{rank}: player {comp_id} "
+                  f"({comp_team} {comp_season})  {dist:.3f}")
+        print(f"{len(comps)} comps in {elapsed * 1000:.1f}ms")
+        return
+
+    conference_keys = None if "all" in args.conference else args.conference
+    seasons = sorted({y for spec in args.season for y in spec}) if args.season else None
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        profiles = load_profiles(conn, args.features, conference_keys, seasons)
+    if profiles.empty:
+        raise SystemExit("No player-season profiles in scope; run rollups.py first?")
+
+    started = time.perf_counter()
+    Z, means, stds = standardize(profiles[args.features].to_numpy())
+    index = build_index(Z, means, stds, args.features,
+                        {col: profiles[col].to_numpy() for col in SEASON_KEY},
+                        n_lists=args.lists)
+    save_index(index, args.out)
+    print(f"Indexed {len(Z):,} player-seasons in {index.n_lists} cells in "
+          f"{time.perf_counter() - started:.2f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import random
+import zlib
+from html import escape
+
+
+# Synthetic Sports-Reference team pages for benchmarks and the local
+# stand-in server. Layout mirrors the real cbb team season page: a roster
+# table, the per-game table, and secondary tables wrapped in HTML comments.
+
+FIRST_NAMES = [
+    "Jalen", "Marcus", "Tyrese", "Devin", "Jordan", "Isaiah", "Caleb", "Malik",
+    "Andre", "Xavier", "Cameron", "Trey", "Darius", "Elijah", "Josh", "Noah",
+    "José", "Andrés", "Luka", "Zion",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis",
+    "Wilson", "Moore", "Taylor", "Thomas", "Jackson", "White", "Harris",
+    "Martin", "Thompson", "García", "Núñez", "Walker", "Young",
+]
+SUFFIXES = ["", "", "", "", "", "", " Jr.", " II", " III"]
+CLASSES = ["FR", "SO", "JR", "SR", "GR"]
+POSITIONS = ["G", "G", "F", "F", "C"]
+
+ROSTER_COLS = [
+    ("player", "Player"), ("number", "#"), ("class", "Class"), ("pos", "Pos"),
+    ("height", "Height"), ("weight", "Weight"), ("hometown", "Hometown"),
+    ("high_school", "High School"), ("rsci", "RSCI Top 100"),
+    ("summary", "Summary"),
+]
+PER_GAME_COLS = [
+    ("ranker", "Rk"), ("name_display", "Player"), ("pos", "Pos"), ("games", "G"),
+    ("games_started", "GS"), ("mp_per_g", "MP"), ("fg_per_g", "FG"),
+    ("fga_per_g", "FGA"), ("fg_pct", "FG%"), ("fg3_per_g", "3P"),
+    ("fg3a_per_g", "3PA"), ("fg3_pct", "3P%"), ("fg2_per_g", "2P"),
+    ("fg2a_per_g", "2PA"), ("fg2_pct", "2P%"), ("efg_pct", "eFG%"),
+    ("ft_per_g", "FT"), ("fta_per_g", "FTA"), ("ft_pct", "FT%"),
+    ("orb_per_g", "ORB"), ("drb_per_g", "DRB"), ("trb_per_g", "TRB"),
+    ("ast_per_g", "AST"), ("stl_per_g", "STL"), ("blk_per_g", "BLK"),
+    ("tov_per_g", "TOV"), ("pf_per_g", "PF"), ("pts_per_g", "PTS"),
+    ("awards", "Awards"),
+]
+COMMENTED_TABLES = ["players_totals", "players_per_min", "players_advanced"]
+
+
+def make_players(rng: random.Random, n: int) -> list[dict]:
+    players = []
+    for i in range(n):
+        name = (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                f"{rng.choice(SUFFIXES)}")
+        g = rng.randint(5, 34)
+        fga = round(rng.uniform(0.5, 16.0), 1)
+        fg = round(fga * rng.uniform(0.3, 0.6), 1)
+        fg3a = round(fga * rng.uniform(0.0, 0.6), 1)
+        fg3 = round(fg3a * rng.uniform(0.2, 0.45), 1)
+        fta = round(rng.uniform(0.0, 7.0), 1)
+        ft = round(fta * rng.uniform(0.5, 0.9), 1)
+        orb = round(rng.uniform(0.0, 3.0), 1)
+        drb = round(rng.uniform(0.2, 7.0), 1)
+        height_in = rng.randint(70, 86)
+        players.append({
+            "name": name,
+            "number": str(rng.randint(0, 55)),
+            "class": rng.choice(CLASSES),
+            "pos": rng.choice(POSITIONS),
+            "height": f"{height_in // 12}-{height_in % 12}",
+            "weight": str(rng.randint(165, 265)),
+            "hometown": "Somewhere, ST",
+            "high_school": "Central HS (ST)",
+            "games": g,
+            "games_started": rng.randint(0, g),
+            "mp": round(rng.uniform(2.0, 36.0), 1),
+            "fg": fg, "fga": fga, "fg3": fg3, "fg3a": fg3a,
+            "ft": ft, "fta": fta, "orb": orb, "drb": drb,
+            "ast": round(rng.uniform(0.0, 6.0), 1),
+            "stl": round(rng.uniform(0.0, 2.5), 1),
+            "blk": round(rng.uniform(0.0, 2.5), 1),
+            "tov": round(rng.uniform(0.0, 3.5), 1),
+            "pf": round(rng.uniform(0.5, 3.5), 1),
+        })
+        players[-1]["idx"] = i
+    return players
+
+
+def _pct(made: float, att: float) -> str:
+    return f"{made / att:.3f}".lstrip("0") if att else ""
+
+
+def per_game_values(p: dict) -> dict:
+    fg2 = round(p["fg"] - p["fg3"], 1)
+    fg2a = round(p["fga"] - p["fg3a"], 1)
+    pts = round(2 * fg2 + 3 * p["fg3"] + p["ft"], 1)
+    return {
+        "ranker": str(p["idx"] + 1), "name_display": p["name"], "pos": p["pos"],
+        "games": str(p["games"]), "games_started": str(p["games_started"]),
+        "mp_per_g": str(p["mp"]), "fg_per_g": str(p["fg"]),
+        "fga_per_g": str(p["fga"]), "fg_pct": _pct(p["fg"], p["fga"]),
+        "fg3_per_g": str(p["fg3"]), "fg3a_per_g": str(p["fg3a"]),
+        "fg3_pct": _pct(p["fg3"], p["fg3a"]), "fg2_per_g": str(fg2),
+        "fg2a_per_g": str(fg2a), "fg2_pct": _pct(fg2, fg2a),
+        "efg_pct": _pct(p["fg"] + 0.5 * p["fg3"], p["fga"]),
+        "ft_per_g": str(p["ft"]), "fta_per_g": str(p["fta"]),
+        "ft_pct": _pct(p["ft"], p["fta"]), "orb_per_g": str(p["orb"]),
+        "drb_per_g": str(p["drb"]),
+        "trb_per_g": str(round(p["orb"] + p["drb"], 1)),
+        "ast_per_g": str(p["ast"]), "stl_per_g": str(p["stl"]),
+        "blk_per_g": str(p["blk"]), "tov_per_g": str(p["tov"]),
+        "pf_per_g": str(p["pf"]), "pts_per_g": str(pts), "awards": "",
+    }
+
+
+def _row(cells: list[tuple[str, str]], slug: str) -> str:
+    out = []
+    for i, (stat, value) in enumerate(cells):
+        text = escape(value)
+        if stat in ("player", "name_display") and value:
+            href = f"/cbb/players/{slug}-{zlib.crc32(value.encode()) % 10000}.html"
+            text = f'<a href="{href}">{text}</a>'
+        tag = "th" if i == 0 else "td"
+        scope = ' scope="row"' if i == 0 else ""
+        out.append(f'<{tag}{scope} data-stat="{stat}">{text}</{tag}>')
+    return "<tr>" + "".join(out) + "</tr>"
+
+
+def _table(table_id: str, caption: str, cols, rows_html: list[str],
+           foot_html: str = "") -> str:
+    head = "".join(
+        f'<th aria-label="{escape(label)}" data-stat="{stat}" scope="col">'
+        f"{escape(label)}</th>"
+        for stat, label in cols
+    )
+    foot = f"<tfoot>{foot_html}</tfoot>" if foot_html else ""
+    return (
+        f'<div class="table_container" id="div_{table_id}">'
+        f'<table class="sortable stats_table" id="{table_id}" '
+        f'data-cols-to-freeze=",2"><caption>{escape(caption)}</caption>'
+        f"<thead><tr>{head}</tr></thead><tbody>"
+        + "\n".join(rows_html)
+        + f"</tbody>{foot}</table></div>"
+    )
+
+
+def render_team_page(slug: str, season_end_year: int, n_players: int = 15,
+                     seed: int | None = None) -> str:
+    """
+    Return a synthetic team season page (~100 KB, about the size of a real one).
+    Deterministic for a given (slug, season_end_year, seed).
+    """
+    rng = random.Random(seed if seed is not None else f"{slug}-{season_end_year}")
+    players = make_players(rng, n_players)
+    school = slug.replace("-", " ").title()
+
+    roster_rows = [
+        _row([("player", p["name"]), ("number", p["number"]),
+              ("class", p["class"]), ("pos", p["pos"]),
+              ("height", p["height"]), ("weight", p["weight"]),
+              ("hometown", p["hometown"]), ("high_school", p["high_school"]),
+              ("rsci", ""), ("summary", "")], slug)
+        for p in players
+    ]
+    per_game = [per_game_values(p) for p in players]
+    per_game_rows = [_row([(stat, v[stat]) for stat, _ in PER_GAME_COLS], slug)
+                     for v in per_game]
+    totals = {stat: "" for stat, _ in PER_GAME_COLS}
+    totals["name_display"] = "Team Totals"
+    totals["games"] = str(max(p["games"] for p in players))
+    foot = _row([(stat, totals[stat]) for stat, _ in PER_GAME_COLS], slug)
+
+    sections = [
+        _table("roster", f"{season_end_year - 1}-{str(season_end_year)[2:]} "
+               f"{school} Roster", ROSTER_COLS, roster_rows),
+        _table("players_per_game", "Per Game Table", PER_GAME_COLS,
+               per_game_rows, foot),
+    ]
+    for table_id in COMMENTED_TABLES:
+        # Sports-Reference ships secondary tables inside HTML comments
+        # and un-comments them client-side.
+        sections.append(
+            '<div class="placeholder"></div>\n<!--\n'
+            + _table(table_id, table_id.replace("_", " ").title(),
+                     PER_GAME_COLS, per_game_rows, foot)
+            + "\n-->"
+        )
+
+    nav = "".join(
+        f'<li><a href="/cbb/schools/{slug}/men/{y}.html">{y - 1}-{str(y)[2:]}</a></li>'
+        for y in range(season_end_year - 40, season_end_year + 1)
+    )
+    filler = "\n".join(
+        f'<div class="ad" id="ad_{i}"><script>window.__cfg_{i} = '
+        f'{{"slot": "{slug}-{i}", "sizes": [[300,250],[728,90]]}};</script></div>'
+        for i in range(60)
+    )
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{season_end_year - 1}-{str(season_end_year)[2:]} {school} "
+        "Men's Roster and Stats | College Basketball at Sports-Reference.com"
+        "</title></head><body><div id=\"wrap\">"
+        f"<nav><ul>{nav}</ul></nav>{filler}<div id=\"content\">"
+        + "\n".join(sections)
+        + "</div></div></body></html>\n"
+    )
@@ -0,0 +1,209 @@
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from raw_store import iter_pages
+from sportsref_fixtures import render_team_page
+
+
+PATH_RE = re.compile(r"^/cbb/schools/(?P<slug>[a-z0-9-]+)/men/(?P<year>\d{4})\.html$")
+
+
+@dataclass
+class FaultConfig:
+    """
+    Per-request fault probabilities and latency for the stand-in server.
+    Faults are drawn independently per request from a seeded RNG.
+    """
+    latency_ms: float = 0.0         # base latency added to every response
+    jitter_ms: float = 0.0          # + uniform(0, jitter_ms)
+    p_429: float = 0.0              # 429 with Retry-After
+    retry_after: int = 1            # seconds, sent with 429s
+    p_5xx: float = 0.0              # 500/502/503
+    p_truncate: float = 0.0         # body cut short (Content-Length kept)
+    seed: int = 0
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Local Sports-Reference stand-in serving team pages at the real
+    /cbb/schools/<slug>/men/<year>.html layout, with fault injection.
+
+    Pages come from `fixtures_dir` (raw-store pages or <slug>_<year>.html
+    files) when given, otherwise from sportsref_fixtures.render_team_page.
+    Responses carry an ETag and honor If-None-Match, like the real site's CDN.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, faults: FaultConfig | None = None,
+                 fixtures_dir: Path | None = None):
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.faults = faults or FaultConfig()
+        self.fixtures = {}
+        if fixtures_dir is not None:
+            for page in iter_pages(fixtures_dir):
+                with page.open() as fh:
+                    self.fixtures[page.stem] = fh.read().encode("utf-8")
+        self._rendered: dict[str, bytes] = {}
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self.status_counts: Counter = Counter()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Drop-in value for scrape_conference_season.BASE_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}/cbb/schools"
+
+    def page_body(self, slug: str, year: int) -> bytes | None:
+        stem = f"{slug}_{year}"
+        if self.fixtures:
+            return self.fixtures.get(stem)
+        with self._lock:
+            if stem not in self._rendered:
+                self._rendered[stem] = render_team_page(
+                    slug, year).encode("utf-8")
+            return self._rendered[stem]
+
+    def draw(self) -> tuple[str | None, float]:
+        """Pick this request's fault (or None) and its latency in seconds."""
+        f = self.faults
+        with self._lock:
+            latency = (f.latency_ms + self._rng.uniform(0, f.jitter_ms)) / 1000
+            roll = self._rng.random()
+        for fault, p in (("429", f.p_429), ("5xx", f.p_5xx),
+                         ("truncate", f.p_truncate)):
+            if roll < p:
+                return fault, latency
+            roll -= p
+        return None, latency
+
+    def count(self, status: int | str) -> None:
+        with self._lock:
+            self.status_counts[status] += 1
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server: StandinServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep benchmarks quiet
+        pass
+
+    def _empty(self, status: int, headers: dict | None = None) -> None:
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.server.count(status)
+
+    def do_GET(self):
+        m = PATH_RE.match(self.path)
+        body = m and self.server.page_body(m["slug"], int(m["year"]))
+        if not body:
+            self._empty(404)
+            return
+
+        fault, latency = self.server.draw()
+        if latency:
+            time.sleep(latency)
+
+        if fault == "429":
+            self._empty(429, {"Retry-After": str(self.server.faults.retry_after)})
+            return
+        if fault == "5xx":
+            self._empty(random.choice((500, 502, 503)))
+            return
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._empty(304, {"ETag": etag})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+        if fault == "truncate":
+            # Promise the full length, send half, drop the connection.
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.server.count("truncated")
+            return
+
+        self.wfile.write(body)
+        self.server.count(200)
+
+
+def add_fault_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--p-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--p-5xx", type=float, default=0.0)
+    parser.add_argument("--p-truncate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def faults_from_args(args: argparse.Namespace) -> FaultConfig:
+    return FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        p_429=args.p_429,
+        retry_after=args.retry_after,
+        p_5xx=args.p_5xx,
+        p_truncate=args.p_truncate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve Sports-Reference-shaped team pages locally, with fault injection."
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures-dir", type=Path,
+                        help="Serve pages from this raw dir instead of synthetic ones.")
+    add_fault_args(parser)
+    args = parser.parse_args()
+
+    server = StandinServer(args.port, faults_from_args(args), args.fixtures_dir)
+    print(f"Serving on {server.base_url}")
+    print(f"Point the scrapers at it with SPORTSREF_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
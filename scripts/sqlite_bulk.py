@@ -0,0 +1,313 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+# Connection settings for bulk loads. WAL + synchronous=NORMAL is crash-safe
+# for the database file (a power cut can lose the last commit, not corrupt
+# it) and avoids an fsync per transaction.
+BULK_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -256 * 1024,  # KiB -> 256 MiB page cache
+    "temp_store": "MEMORY",
+}
+
+# Rows per executemany batch; bounds the Python-side copy of a large load.
+CHUNK_ROWS = 10_000
+
+
+# ---------------------------------------------------------
+# Row streaming
+# ---------------------------------------------------------
+
+def sql_rows(df: pd.DataFrame, columns: list[str], chunk_rows: int = CHUNK_ROWS):
+    """
+    Yield lists of row tuples for executemany, `chunk_rows` at a time, with
+    NaN / NA turned into None (NULL) column-wise and numpy scalars turned
+    into plain Python values. Columns missing from `df` come out as NULL.
+    """
+    df = df.reindex(columns=columns)
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield list(chunk.itertuples(index=False, name=None))
+
+
+def insert_chunked(conn, sql: str, df: pd.DataFrame, columns: list[str]) -> int:
+    n_rows = 0
+    for rows in sql_rows(df, columns):
+        conn.executemany(sql, rows)
+        n_rows += len(rows)
+    return n_rows
+
+
+# ---------------------------------------------------------
+# Delta upsert
+# ---------------------------------------------------------
+
+@dataclass
+class RowCounts:
+    """What a load did to one table. `replaced` counts INSERT OR REPLACE rows."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    replaced: int = 0
+
+    @property
+    def rows(self) -> int:
+        """Incoming rows."""
+        return self.inserted + self.updated + self.unchanged + self.replaced
+
+    @property
+    def written(self) -> int:
+        """Rows actually inserted, changed or deleted."""
+        return self.inserted + self.updated + self.deleted + self.replaced
+
+    def __add__(self, other: "RowCounts") -> "RowCounts":
+        return RowCounts(*(a + b for a, b in zip(vars(self).values(),
+                                                 vars(other).values())))
+
+    def __str__(self) -> str:
+        if self.replaced:
+            return f"{self.replaced} replaced"
+        text = (f"{self.inserted} inserted, {self.updated} updated, "
+                f"{self.unchanged} unchanged")
+        return text + (f", {self.deleted} deleted" if self.deleted else "")
+
+
+def stage_rows(conn, table: str, key_columns: list[str], df: pd.DataFrame,
+               columns: list[str]) -> str:
+    """
+    Copy `columns` of `df` into a temp table shaped like `table` (same
+    declared types, so values get the same affinity and compare equal to
+    what is stored) keyed by `key_columns`. A key that appears twice keeps
+    its last row, as INSERT OR REPLACE would. Returns the temp table name.
+    """
+    types = {name: type_ for _, name, type_, *_ in
+             conn.execute(f'PRAGMA main.table_info("{table}")')}
+    staging = f"delta_{table}"
+    column_defs = ", ".join(f'"{c}" {types.get(c, "")}' for c in columns)
+    keys = ", ".join(f'"{c}"' for c in key_columns)
+    conn.execute(f'DROP TABLE IF EXISTS temp."{staging}"')
+    conn.execute(f'CREATE TEMP TABLE "{staging}" '
+                 f'({column_defs}, PRIMARY KEY ({keys})) WITHOUT ROWID')
+    names = ", ".join(f'"{c}"' for c in columns)
+    marks = ", ".join("?" * len(columns))
+    insert_chunked(
+        conn,
+        f'INSERT OR REPLACE INTO temp."{staging}" ({names}) VALUES ({marks})',
+        df, columns)
+    return staging
+
+
+def upsert_delta(
+    conn,
+    table: str,
+    key_columns: list[str],
+    df: pd.DataFrame,
+    columns: list[str],
+    delete_scope: dict[str, object] | None = None,
+) -> RowCounts:
+    """
+    Write `df` into `table` touching only what changed, instead of
+    INSERT OR REPLACE (a delete plus an insert per row, so every index entry
+    churns even when the row is identical):
+
+    - rows whose key is new are inserted
+    - rows whose key exists are updated only if some value differs
+      (compared with IS, so NULL = NULL counts as unchanged)
+    - with `delete_scope` (column -> value, e.g. the conference-season being
+      loaded), existing rows inside that scope whose key is not in `df` are
+      deleted
+
+    Rows are compared column by column in SQL against a staged copy of
+    `df`, so no hash needs to be stored next to the data.
+    """
+    staging = stage_rows(conn, table, key_columns, df, columns)
+    values = [c for c in columns if c not in key_columns]
+
+    def q(c: str) -> str:
+        return f'"{c}"'
+
+    on_key = " AND ".join(f"t.{q(c)} = s.{q(c)}" for c in key_columns)
+    changed = " OR ".join(f"t.{q(c)} IS NOT s.{q(c)}" for c in values) or "0"
+
+    new, updated, unchanged = conn.execute(
+        f"""
+        SELECT
+            COALESCE(SUM(t.{q(key_columns[0])} IS NULL), 0),
+            COALESCE(SUM(t.{q(key_columns[0])} IS NOT NULL AND ({changed})), 0),
+            COALESCE(SUM(t.{q(key_columns[0])} IS NOT NULL AND NOT ({changed})), 0)
+        FROM temp.{q(staging)} s
+        LEFT JOIN main.{q(table)} t ON {on_key}
+        """
+    ).fetchone()
+
+    names = ", ".join(q(c) for c in columns)
+    keys = ", ".join(q(c) for c in key_columns)
+    if values:
+        assignments = ", ".join(f"{q(c)} = excluded.{q(c)}" for c in values)
+        differs = " OR ".join(f"main.{q(table)}.{q(c)} IS NOT excluded.{q(c)}"
+                              for c in values)
+        on_conflict = f"DO UPDATE SET {assignments} WHERE {differs}"
+    else:
+        on_conflict = "DO NOTHING"
+    # "WHERE true" keeps the parser from reading ON CONFLICT as a join clause
+    conn.execute(
+        f"""
+        INSERT INTO main.{q(table)} ({names})
+        SELECT {names} FROM temp.{q(staging)} WHERE true
+        ON CONFLICT ({keys}) {on_conflict}
+        """
+    )
+
+    deleted = 0
+    if delete_scope is not None:
+        in_scope = " AND ".join(f"{q(c)} = ?" for c in delete_scope) or "1"
+        on_key = " AND ".join(f"s.{q(c)} = main.{q(table)}.{q(c)}"
+                              for c in key_columns)
+        deleted = conn.execute(
+            f"""
+            DELETE FROM main.{q(table)}
+            WHERE {in_scope}
+              AND NOT EXISTS (SELECT 1 FROM temp.{q(staging)} s WHERE {on_key})
+            """,
+            list(delete_scope.values()),
+        ).rowcount
+
+    conn.execute(f"DROP TABLE temp.{q(staging)}")
+    return RowCounts(inserted=new, updated=updated, unchanged=unchanged,
+                     deleted=deleted)
+
+
+def execute_script(conn, script: str) -> None:
+    """
+    Run a multi-statement script one statement at a time. Unlike
+    Connection.executescript this does not COMMIT first, so it stays inside
+    the bulk-load transaction.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            if statement.strip().rstrip(";").strip():
+                conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+# ---------------------------------------------------------
+# Session
+# ---------------------------------------------------------
+
+def drop_secondary_indexes(conn, tables: list[str],
+                           keep: list[str] | None = None) -> list[tuple[str, str]]:
+    """
+    Drop the explicitly created indexes on `tables`, except those named in
+    `keep`, and return their (name, CREATE statement) pairs. Indexes backing
+    PRIMARY KEY / UNIQUE constraints (sql IS NULL in sqlite_master) cannot be
+    dropped and are left alone.
+    """
+    if not tables:
+        return []
+    marks = ", ".join("?" * len(tables))
+    indexes = conn.execute(
+        f"SELECT name, sql FROM sqlite_master "
+        f"WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({marks})",
+        tables,
+    ).fetchall()
+    indexes = [(name, sql) for name, sql in indexes if name not in (keep or [])]
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX "{name}"')
+    return indexes
+
+
+def foreign_key_violations(conn, tables: list[str] | None) -> list[tuple]:
+    if not tables:
+        return conn.execute("PRAGMA foreign_key_check").fetchall()
+    rows = []
+    for table in tables:
+        rows += conn.execute(f'PRAGMA foreign_key_check("{table}")').fetchall()
+    return rows
+
+
+@contextmanager
+def bulk_load(
+    db_path: Path,
+    tables: list[str] | None = None,
+    defer_indexes: bool = True,
+    keep_indexes: list[str] | None = None,
+    analyze: bool = True,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Connection for one bulk load, run as a single transaction:
+
+      with bulk_load(DB_PATH, ["player_season_stats"]) as conn:
+          conn.executemany(...)
+
+    - BULK_PRAGMAS are applied (WAL, synchronous=NORMAL, big cache, temp
+      tables in memory).
+    - Foreign keys are not enforced per row; `PRAGMA foreign_key_check` runs
+      once at the end and any violation rolls the whole load back
+      (sqlite3.IntegrityError).
+    - With defer_indexes, secondary indexes on `tables` are dropped up front
+      and rebuilt once after the data is in; `keep_indexes` names ones the
+      load itself looks rows up through, which stay.
+    - After the commit, `tables` (or the whole database) are ANALYZEd.
+
+    The body must not commit: avoid `with conn:`, conn.commit(),
+    executescript() (use execute_script) and DataFrame.to_sql().
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        for name, value in BULK_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        # Must be set outside a transaction
+        conn.execute("PRAGMA foreign_keys = OFF")
+
+        conn.execute("BEGIN")
+        try:
+            deferred = drop_secondary_indexes(conn, tables, keep_indexes) if defer_indexes else []
+            yield conn
+
+            started = time.perf_counter()
+            for name, sql in deferred:
+                # The body may have dropped the table or made the index itself
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                    (name,)).fetchone()
+                if not exists:
+                    conn.execute(sql)
+            if deferred:
+                print(f"Rebuilt {len(deferred)} indexes in "
+                      f"{time.perf_counter() - started:.2f}s")
+
+            violations = foreign_key_violations(conn, tables)
+            if violations:
+                sample = ", ".join(f"{t} rowid {r} -> {p}"
+                                   for t, r, p, _ in violations[:5])
+                raise sqlite3.IntegrityError(
+                    f"{len(violations)} foreign key violations ({sample}); "
+                    f"load rolled back")
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+        if analyze:
+            if tables:
+                for table in tables:
+                    conn.execute(f'ANALYZE "{table}"')
+            else:
+                conn.execute("ANALYZE")
+    finally:
+        conn.close()
@@ -0,0 +1,195 @@
+import io
+import re
+from pathlib import Path
+from typing import Callable, Iterable
+
+import lxml.html
+import numpy as np
+import pandas as pd
+
+from raw_store import RawPage, as_page
+
+
+# ---------------------------------------------------------
+# Table ids: Sports-Reference tables carry stable ids; secondary tables are
+# shipped inside HTML comments. Older pages used "per_game".
+# ---------------------------------------------------------
+
+TABLE_IDS: dict[str, tuple[str, ...]] = {
+    "per_game": ("players_per_game", "per_game"),
+    "roster": ("roster",),
+    "totals": ("players_totals", "totals"),
+    "per_min": ("players_per_min", "per_min"),
+    "advanced": ("players_advanced", "advanced"),
+}
+
+
+# ---------------------------------------------------------
+# Table matchers: column heuristics, first matching table wins.
+# Only used when none of a table's ids is on the page.
+# ---------------------------------------------------------
+
+def is_per_game_table(df: pd.DataFrame) -> bool:
+    # Per-game table has 'Player' and 'G' columns
+    cols = [str(c) for c in df.columns]
+    return "Player" in cols and "G" in cols
+
+
+def is_roster_table(df: pd.DataFrame) -> bool:
+    # Roster table needs 'Player' and ('Class' or 'Pos')
+    cols = [str(c).strip().lower() for c in df.columns]
+    return "player" in cols and ("class" in cols or "pos" in cols)
+
+
+TABLE_MATCHERS: dict[str, Callable[[pd.DataFrame], bool]] = {
+    "per_game": is_per_game_table,
+    "roster": is_roster_table,
+}
+
+
+# ---------------------------------------------------------
+# lxml fast path
+# ---------------------------------------------------------
+
+def find_table_element(doc, table_ids: Iterable[str], comments: list | None = None):
+    """
+    Return the first <table> with one of `table_ids`, looking in the live DOM
+    first and then inside HTML comments (pass `comments` to reuse an earlier
+    //comment() scan). None if no id is present.
+    """
+    for table_id in table_ids:
+        found = doc.xpath("//table[@id=$id]", id=table_id)
+        if found:
+            return found[0]
+
+    if comments is None:
+        comments = doc.xpath("//comment()")
+    for table_id in table_ids:
+        marker = f'id="{table_id}"'
+        for comment in comments:
+            if comment.text and marker in comment.text:
+                fragment = lxml.html.fromstring(comment.text)
+                found = fragment.xpath("descendant-or-self::table[@id=$id]",
+                                       id=table_id)
+                if found:
+                    return found[0]
+    return None
+
+
+def _cell_text(cell) -> str | None:
+    text = cell.text_content().strip()
+    return text or None
+
+
+def table_element_to_frame(table) -> pd.DataFrame:
+    """
+    Build a DataFrame from a Sports-Reference <table>: column names from the
+    last header row, body + footer rows (repeated in-body header rows skipped),
+    numeric columns typed the way read_html would type them.
+    """
+    header_rows = table.xpath("./thead/tr")
+    if not header_rows:
+        header_rows = table.xpath("./tr[1] | ./tbody/tr[1]")
+    columns = [_cell_text(c) or "" for c in header_rows[-1].xpath("./th|./td")]
+
+    rows = []
+    for tr in table.xpath("./tbody/tr | ./tfoot/tr"):
+        classes = (tr.get("class") or "").split()
+        if "thead" in classes or "over_header" in classes:
+            continue
+        cells = [_cell_text(c) for c in tr.xpath("./th|./td")]
+        if len(cells) < len(columns):
+            cells += [None] * (len(columns) - len(cells))
+        rows.append(cells[: len(columns)])
+
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame({i: _typed_column(list(values))
+                       for i, values in enumerate(zip(*rows))})
+    df.columns = columns
+    return df
+
+
+INT_RE = re.compile(r"^[+-]?\d+$")
+
+
+def _typed_column(values: list) -> np.ndarray:
+    """
+    Type a column of cell strings directly: int64 when every cell is an
+    integer, float64 when every non-empty cell is numeric (empty -> NaN),
+    object otherwise (empty -> NaN) -- the same dtypes read_html infers,
+    including its thousands="," handling.
+    """
+    numeric = [np.nan if v is None else v.replace(",", "") for v in values]
+    try:
+        as_float = np.array(numeric, dtype="float64")
+    except ValueError:
+        return np.array([np.nan if v is None else v for v in values], dtype=object)
+    if all(isinstance(v, str) and INT_RE.match(v) for v in numeric):
+        return as_float.astype("int64")
+    return as_float
+
+
+def _read_html_tables(text: str) -> list[pd.DataFrame]:
+    try:
+        return pd.read_html(io.StringIO(text), flavor="bs4")
+    except ValueError:
+        return []
+
+
+def extract_team_tables(
+    page: RawPage | Path,
+    tables: Iterable[str] = ("per_game", "roster"),
+    engine: str = "lxml",
+) -> dict[str, pd.DataFrame | None]:
+    """
+    Parse a team page once and return {table name -> DataFrame or None} for
+    each requested table.
+
+    engine="lxml" goes straight to the table ids in TABLE_IDS (including
+    commented-out tables) and only falls back to read_html + TABLE_MATCHERS
+    for tables whose ids are missing. engine="read_html" is the original
+    path: every table through pd.read_html(flavor="bs4"), then heuristics.
+
+    Raises ValueError if the page has no tables at all.
+    """
+    page = as_page(page)
+    wanted = list(tables)
+    unknown = [name for name in wanted
+               if name not in TABLE_IDS and name not in TABLE_MATCHERS]
+    if unknown:
+        raise KeyError(f"Unknown table(s): {', '.join(unknown)}")
+    if engine not in ("lxml", "read_html"):
+        raise ValueError(f"Unknown engine '{engine}'")
+
+    with page.open() as fh:
+        text = fh.read()
+
+    found: dict[str, pd.DataFrame | None] = {}
+    missing = list(wanted)
+
+    if engine == "lxml":
+        if "<table" not in text:
+            raise ValueError("No tables found")
+        doc = lxml.html.document_fromstring(text)
+        comments = doc.xpath("//comment()")
+        missing = []
+        for name in wanted:
+            table = None
+            if name in TABLE_IDS:
+                table = find_table_element(doc, TABLE_IDS[name], comments)
+            if table is None:
+                missing.append(name)
+            else:
+                found[name] = table_element_to_frame(table)
+
+    if missing:
+        all_tables = _read_html_tables(text)
+        if not all_tables and not found:
+            raise ValueError("No tables found")
+        for name in missing:
+            matcher = TABLE_MATCHERS.get(name)
+            found[name] = None if matcher is None else next(
+                (df for df in all_tables if matcher(df)), None)
+
+    return {name: found[name] for name in wanted}
@@ -1,84 +1,102 @@
 from pathlib import Path
-import sqlite3
+
 import pandas as pd
 
+from cli_args import parse_conference_season
+from intermediate_dataset import read_dataset, season_dir
+from sqlite_bulk import bulk_load, insert_chunked
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
-ROSTER_CSV = PROJECT_ROOT / "ncaa-analytics" / "data_intermediate" / \
-    "sun_belt" / "2024-25" / "sun_belt_2024_25_roster_all_teams.csv"
 
+ROSTER_COLUMNS = ["player", "class_year", "height_cm", "weight_kg"]
 
-def ensure_class_year_column(conn: sqlite3.Connection):
+
+def ensure_class_year_column(conn):
     cur = conn.cursor()
     cur.execute("PRAGMA table_info(players);")
     cols = [row[1] for row in cur.fetchall()]
     if "class_year" not in cols:
         print("Adding players.class_year column ...")
         cur.execute("ALTER TABLE players ADD COLUMN class_year TEXT;")
-        conn.commit()
 
 
-def main():
-    if not ROSTER_CSV.exists():
-        raise FileNotFoundError(f"Roster CSV not found: {ROSTER_CSV}")
+def load_roster(conf, season_end_year: int) -> pd.DataFrame:
+    roster_df = read_dataset("roster", conf.key, season_end_year, ROSTER_COLUMNS)
+    if roster_df.empty:
+        raise FileNotFoundError(
+            f"No roster data for {conf.key} {season_end_year} in "
+            f"{season_dir('roster', conf.key, season_end_year)}")
 
-    roster_df = pd.read_csv(ROSTER_CSV)
     # Normalize
     roster_df["player"] = roster_df["player"].astype(str).str.strip()
     roster_df["team_slug"] = roster_df["team_slug"].astype(str).str.strip()
+    return roster_df
+
+
+def stage_roster(conn, roster_df: pd.DataFrame) -> None:
+    conn.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS roster_stage (
+            full_name   TEXT NOT NULL,
+            team_slug   TEXT NOT NULL,
+            season      INTEGER NOT NULL,
+            height_cm   INTEGER,
+            weight_kg   INTEGER,
+            class_year  TEXT
+        )
+        """
+    )
+    conn.execute("DELETE FROM roster_stage")
+    insert_chunked(
+        conn,
+        "INSERT INTO roster_stage VALUES (?, ?, ?, ?, ?, ?)",
+        roster_df,
+        ["player", "team_slug", "season_end_year",
+         "height_cm", "weight_kg", "class_year"],
+    )
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    ensure_class_year_column(conn)
-    cur = conn.cursor()
-
-    updated = 0
-    missing = []
-
-    for row in roster_df.itertuples(index=False):
-        team_slug = row.team_slug
-        season = int(row.season)
-        player_name = row.player.strip()
-
-        height_cm = None if pd.isna(row.height_cm) else int(row.height_cm)
-        weight_kg = None if pd.isna(row.weight_kg) else int(row.weight_kg)
-        class_year = None if pd.isna(
-            row.class_year) else str(row.class_year).strip()
 
-        # Find matching player_id
-        cur.execute(
-            """
-            SELECT p.player_id
-            FROM players p
-            JOIN teams t ON t.team_id = p.team_id
-            WHERE p.season = ?
-              AND t.team_slug = ?
-              AND p.full_name = ?
-            """,
-            (season, team_slug, player_name),
-        )
-        res = cur.fetchone()
-        if not res:
-            missing.append((player_name, team_slug))
-            continue
+def main():
+    conf, season_end_year = parse_conference_season()
+    roster_df = load_roster(conf, season_end_year)
 
-        player_id = res[0]
+    with bulk_load(DB_PATH, ["players"]) as conn:
+        ensure_class_year_column(conn)
+        stage_roster(conn, roster_df)
 
-        cur.execute(
+        # Every matched player in one statement; roster values only fill in,
+        # a missing one keeps what players already has
+        updated = conn.execute(
             """
             UPDATE players
             SET
-                height_cm = COALESCE(?, height_cm),
-                weight_kg = COALESCE(?, weight_kg),
-                class_year = COALESCE(?, class_year)
-            WHERE player_id = ?;
-            """,
-            (height_cm, weight_kg, class_year, player_id),
-        )
-        updated += 1
+                height_cm = COALESCE(r.height_cm, players.height_cm),
+                weight_kg = COALESCE(r.weight_kg, players.weight_kg),
+                class_year = COALESCE(r.class_year, players.class_year)
+            FROM roster_stage r
+            JOIN teams t ON t.team_slug = r.team_slug
+            WHERE players.team_id = t.team_id
+              AND players.season = r.season
+              AND players.full_name = r.full_name;
+            """
+        ).rowcount
 
-    conn.commit()
-    conn.close()
+        missing = conn.execute(
+            """
+            SELECT r.full_name, r.team_slug
+            FROM roster_stage r
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM players p
+                JOIN teams t ON t.team_id = p.team_id
+                WHERE p.season = r.season
+                  AND t.team_slug = r.team_slug
+                  AND p.full_name = r.full_name)
+            ORDER BY r.team_slug, r.full_name;
+            """
+        ).fetchall()
+        conn.execute("DROP TABLE roster_stage")
 
     print(f"Updated {updated} player rows.")
     if missing:
@@ -0,0 +1,82 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+# ---------------------------------------------------------
+# Versioned output directories
+#
+# A directory of files that is rebuilt as a whole (a feature matrix, an
+# index) and read, memory-mapped, by other processes meanwhile. Each build
+# goes to a new version subdirectory and CURRENT names the live one:
+#
+#   <path>/CURRENT       "v7"
+#   <path>/v6/...        previous build, kept until the next one
+#   <path>/v7/...
+#
+# The new version is complete before CURRENT is replaced (one os.replace),
+# so a reader sees the old files or the new ones, never a missing or half-
+# written directory, and never files of two builds mixed. The previous
+# version is kept so a reader that has just read CURRENT still finds its
+# files; read_current re-reads CURRENT if a version disappears under it all
+# the same.
+# ---------------------------------------------------------
+
+POINTER = "CURRENT"
+
+# Attempts at reading CURRENT and the version it names
+OPEN_ATTEMPTS = 3
+
+
+def current_version(path: Path) -> Path | None:
+    """The live version directory under `path`, if one has been published."""
+    try:
+        return path / (path / POINTER).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def _version_number(path: Path) -> int | None:
+    name = path.name
+    return int(name[1:]) if name.startswith("v") and name[1:].isdigit() else None
+
+
+def publish(path: Path, write: Callable[[Path], None]) -> Path:
+    """
+    Build a new version with write(version_dir) and make it the live one.
+    Versions older than the previous one are removed. Returns the new version.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    versions = sorted(n for n in map(_version_number, path.iterdir()) if n is not None)
+    version = f"v{(versions[-1] if versions else 0) + 1}"
+
+    tmp = path / f"{version}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    write(tmp)
+    os.replace(tmp, path / version)
+
+    pointer = path / f"{POINTER}.tmp"
+    pointer.write_text(version, encoding="utf-8")
+    os.replace(pointer, path / POINTER)
+
+    # Keep the version readers may still be opening; drop older ones
+    for n in versions[:-1]:
+        shutil.rmtree(path / f"v{n}", ignore_errors=True)
+    return path / version
+
+
+def read_current(path: Path, read: Callable[[Path], T]) -> T | None:
+    """read(version_dir) of the live version; None if none was published."""
+    for _ in range(OPEN_ATTEMPTS):
+        version = current_version(path)
+        if version is None:
+            return None
+        try:
+            return read(version)
+        except FileNotFoundError:
+            continue  # swapped and pruned since CURRENT was read
+    raise FileNotFoundError(f"no readable version in {path}")